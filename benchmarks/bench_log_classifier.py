@@ -0,0 +1,117 @@
+"""
+Benchmark de la classification des lignes de log ZymoCubeCtrl.
+
+Compare, sur un log synthétique (5 millions de lignes par défaut), le débit en lignes/s :
+  - de l'ancienne cascade de re.search sur des motifs texte (un appel par motif et par ligne),
+  - de classifyLogLine (filtre par sous-chaînes + une seule expression régulière combinée),
+  - de l'analyse complète analyzeLogFile.
+
+Usage :
+    python benchmarks/bench_log_classifier.py [--lines 5000000] [--keep LOG_PATH]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zymosoft_assistant.scripts.processAcquisitionLog import analyzeLogFile, classifyLogLine  # noqa: E402
+
+# Motifs tels qu'ils étaient testés successivement sur chaque ligne avant classifyLogLine
+LEGACY_PATTERNS = [
+    r'Going to well\s+"([^"]+)"',
+    r'Starting auto-position of wells:',
+    r'Reference wells\s+.*\s+re-aligned',
+    r'\[AUTOFOCUS\]\[FOCUS\]\s+Done after\s+(\d+)\s+loop\(s\)',
+    r'\[AUTOFOCUS\]\[FOCUS\]\s+Time out after\s+(\d+)\s+loop\(s\)',
+    r'\[AUTOFOCUS\]\[OFF\]\s+Done',
+    r'\[AUTOFOCUS\]\[FOCUS\]\s+Still not',
+    r'\[AUTOFOCUS\]\[FOCUS\]\s+Focus not reached after\s+(\d+)\s+moves\.\s+Trying alternate commands',
+    r'\[AUTOFOCUS\]\[FOCUS\]\s+Adjusting.*move:\s+(\d+)',
+]
+
+
+def legacy_classify(line):
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, line)
+        if match:
+            return pattern, match
+    return None, None
+
+
+def write_synthetic_log(path, line_count, seed=0):
+    rng = random.Random(seed)
+    wells = [f"{row}{col}" for row in "ABCDEFGH" for col in range(1, 13)]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[12/03/2025 10:00:00] Starting acquisition\n")
+        f.write("[12/03/2025 10:00:01] Starting auto-position of wells: A1 A12 H12\n")
+        f.write("[12/03/2025 10:00:02] Reference wells A1 A12 H12 re-aligned.\n")
+        f.write('[12/03/2025 10:00:03] Going to well "A1"\n')
+        written = 4
+        well_index = 1
+        while written < line_count - 1:
+            roll = rng.random()
+            if roll < 0.70:
+                f.write(f"[12/03/2025 10:05:00] [SERIAL][IN] 0x{rng.randrange(1 << 32):08X}\n")
+            elif roll < 0.80:
+                f.write(f"[12/03/2025 10:05:00] MOTOR Z STEP {rng.randrange(5000)} TO POINT\n")
+            elif roll < 0.84:
+                f.write(f'[12/03/2025 10:05:00] Going to well "{wells[well_index % len(wells)]}"\n')
+                well_index += 1
+            elif roll < 0.92:
+                f.write(f"[12/03/2025 10:05:00] [AUTOFOCUS][FOCUS] Adjusting focus, move: {rng.randrange(10)}\n")
+            elif roll < 0.97:
+                f.write(f"[12/03/2025 10:05:00] [AUTOFOCUS][FOCUS] Done after {rng.randrange(1, 6)} loop(s)\n")
+            else:
+                f.write("[12/03/2025 10:05:00] [AUTOFOCUS][OFF] Done\n")
+            written += 1
+        f.write("[12/03/2025 12:00:00] Stopping\n")
+
+
+def measure(label, function, path, line_count):
+    start = time.perf_counter()
+    function(path)
+    elapsed = time.perf_counter() - start
+    rate = line_count / elapsed
+    print(f"{label:<45} {elapsed:8.2f} s  {rate:14,.0f} lignes/s")
+    return rate
+
+
+def run_legacy(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            legacy_classify(line)
+
+
+def run_classifier(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            classifyLogLine(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5_000_000, help="Nombre de lignes du log synthétique")
+    parser.add_argument("--keep", help="Conserver le log synthétique à ce chemin")
+    args = parser.parse_args()
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(), "synthetic.log")
+    print(f"Génération d'un log synthétique de {args.lines:,} lignes: {path}")
+    write_synthetic_log(path, args.lines)
+
+    try:
+        legacy_rate = measure("Cascade de re.search (ancienne version)", run_legacy, path, args.lines)
+        classifier_rate = measure("classifyLogLine", run_classifier, path, args.lines)
+        measure("analyzeLogFile (analyse complète)", analyzeLogFile, path, args.lines)
+        print(f"\nGain de la classification: x{classifier_rate / legacy_rate:.1f}")
+    finally:
+        if not args.keep:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest.mock import patch
+
+import numpy as np
+import pandas
+from openpyxl import Workbook
+
+from zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025 import (
+    comparaison_ZC_to_ref_kernel,
+    compare_enzymo_2_ref,
+    compare_enzymo_2_ref_areas,
+    fit_parameters_from_entete,
+    inverse_fit_activities,
+    nearest_dilutions,
+    plot_repeta_sans_ref,
+    render_plot_specs,
+    repeta_sans_ref_batch,
+    repeta_sans_ref_v1,
+    replicate_cv,
+    repeta_statistics,
+    write_repeta_data_raw_csv,
+)
+from zymosoft_assistant.scripts.getDatasFromWellResults import clearWellResultsCache
+from zymosoft_assistant.scripts.home_made_tools_v3 import SYNTHESE_ZYMINTERN_COLUMNS, clear_synthese_cache
+
+WELLS_96 = [f"{letter}{col}" for letter in "ABCDEFGH" for col in range(1, 13)]
+
+
+def write_repeta_iteration(path, volume):
+    """synthese_interferometric_data.csv d'une itération, même volume dans tous les puits."""
+    columns = [column for _, column in SYNTHESE_ZYMINTERN_COLUMNS]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";".join(["Position_plaque", "Name"] + columns + ["Comment"]) + ";\n")
+        for well in WELLS_96:
+            values = [volume, 1.0, 50.0, 0.5, 200.0, 150.0, 3.0]
+            f.write(";".join([well, "plate"] + [str(v) for v in values] + [""]) + ";\n")
+
+
+def enzymo_sheet_rows(beta, gamme, samples, blanks=(1.0, 2.0, 3.0, 2.0), alpha=20.0):
+    """
+    Onglet WellResults (hors premier onglet) : en-tête avec un fit linéaire puis sections blancs, gamme
+    et échantillons séparées par des lignes vides. gamme : (activité, % de dégradation) par puits.
+    """
+    empty = [None] * 10
+    rows = [["Plate", "P1"] + [None] * 8, ["Fit", "Linear"] + [None] * 8,
+            ["a", alpha] + [None] * 8, ["b", beta] + [None] * 8, empty,
+            ["WellBlankResult"] + [None] * 9, ["Well", "Trouble", "Zymunit", "Exclusion"] + [None] * 6]
+    rows += [[f"A{k + 1}", 0, value, "False"] + [None] * 6 for k, value in enumerate(blanks)]
+    rows += [empty, ["WellOtherResult"] + [None] * 9, empty, ["WellCalibrationResult"] + [None] * 9,
+             ["Well", "Trouble", "Deg", "Activity", "Exclusion"] + [None] * 5]
+    rows += [[f"B{k + 1}", 0, deg, activity, "False"] + [None] * 5 for k, (activity, deg) in enumerate(gamme)]
+    rows += [empty, ["WellSampleResult"] + [None] * 9, ["Sample", "x", "Activity", "y", "RSD"] + [None] * 5]
+    rows += [[name, 0, activity, 0, rsd] + [None] * 5 for name, activity, rsd in samples]
+    # toutes les colonnes contiennent du texte : les cellules vides sont lues comme np.nan (lignes vides reconnues)
+    rows += [empty, ["WellOtherResult"] + [None] * 9, empty, ["WellSampleDetailResult"] + [None] * 9,
+             ["Well"] + ["Detail"] * 9, ["C1", 0, 1.0] + [None] * 7, ["C2", 0, 1.0] + [None] * 7]
+    return rows
+
+
+def write_enzymo_well_results(path, sheets):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, rows in sheets.items():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append([f"col{k}" for k in range(10)])
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+
+
+GAMME = [(0.5, 10.0), (0.5, 12.0), (1.0, 30.0), (1.0, 32.0), (2.0, 50.0), (2.0, 54.0),
+         (3.0, 70.0), (3.0, 66.0), (4.0, 90.0), (4.0, 91.0)]
+
+
+class TestRepetaStatistics(unittest.TestCase):
+    def test_matches_per_well_reductions(self):
+        rng = np.random.default_rng(0)
+        data = rng.random((31, 8, 8, 12)) * 500
+        data[rng.random(data.shape) < 0.1] = np.nan
+        data[:, :, 2, 3] = np.nan
+
+        mean, std, CV = repeta_statistics(data)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for metric, j_letter, j_col in [(0, 0, 0), (3, 5, 7), (7, 7, 11), (1, 2, 3)]:
+                values = data[:, metric, j_letter, j_col]
+                np.testing.assert_array_equal(np.nanmean(values), mean[metric, j_letter, j_col])
+                np.testing.assert_array_equal(np.nanstd(values), std[metric, j_letter, j_col])
+                np.testing.assert_array_equal(np.nanstd(values) / np.nanmean(values) * 100,
+                                              CV[metric, j_letter, j_col])
+        self.assertEqual((8, 8, 12), CV.shape)
+
+    def test_data_raw_csv_layout(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        path = os.path.join(folder, "data_raw.csv")
+        data = np.arange(2 * 3 * 8 * 12, dtype=float).reshape(2, 3, 8, 12)
+        data[1, 2, 0, 1] = np.nan
+
+        write_repeta_data_raw_csv(path, "well;a;b;c;d;e;f;", data)
+
+        with open(path) as f:
+            lines = f.read().split("\n")
+        self.assertEqual("well;a;b;c;d;e;f;", lines[0])
+        self.assertEqual("A1;0.0;96.0;192.0;288.0;384.0;480.0;", lines[1])
+        self.assertEqual("A2;1.0;97.0;193.0;289.0;385.0;nan;", lines[2])
+        self.assertEqual("H12;95.0;191.0;287.0;383.0;479.0;575.0;", lines[96])
+        self.assertEqual([""], lines[97:])
+
+
+class TestRepetaSansRef(unittest.TestCase):
+    def setUp(self):
+        clear_synthese_cache()
+        self.addCleanup(clear_synthese_cache)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.source = os.path.join(self.folder, "source")
+        self.output = os.path.join(self.folder, "output")
+        os.makedirs(self.source)
+        os.makedirs(self.output)
+        for iteration, volume in enumerate([100.0, 110.0, 90.0]):
+            # chemins construits avec '\\' par la routine (écrite pour Windows)
+            folder = f"PLQ1_run{iteration}"
+            os.makedirs(os.path.join(self.source, folder))
+            write_repeta_iteration(self.source + "\\" + folder + "\\rec\\synthese_interferometric_data.csv", volume)
+
+    def test_statistics_and_data_raw(self):
+        result = repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5)
+
+        nb_iteration, nb_well_over_threshold = result[:2]
+        volume_mean, volume_CV = result[8:10]
+        self.assertEqual(3, nb_iteration)
+        self.assertEqual(96, nb_well_over_threshold)
+        np.testing.assert_allclose(100.0, volume_mean)
+        np.testing.assert_allclose(np.std([100.0, 110.0, 90.0]) / 100 * 100, volume_CV)
+
+        with open(self.output + "\\PLQ1\\data_raw.csv") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(97, len(lines))
+        self.assertTrue(lines[0].startswith("well;Volume_PLQ1_run"))
+        self.assertEqual(24, lines[5].count(";") - 1)
+        self.assertEqual(2, len(self._figures()))
+
+    def _figures(self):
+        # sous Linux les chemins '\\' de la routine donnent des fichiers à plat dans self.folder
+        return sorted(name for name in os.listdir(self.folder) if name.endswith(".jpg"))
+
+    def test_render_none_saves_no_figure(self):
+        eager = repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5)
+        for name in self._figures():
+            os.remove(os.path.join(self.folder, name))
+
+        with patch("zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025.plt.figure") as figure:
+            result = repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5, render="none")
+
+        figure.assert_not_called()
+        self.assertEqual([], self._figures())
+        self.assertEqual(len(eager), len(result))
+        np.testing.assert_array_equal(eager[9], result[9])
+
+    def test_render_deferred_returns_plot_specs(self):
+        *result, plot_specs = repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5, render="deferred")
+
+        self.assertEqual(12, len(result))
+        self.assertEqual([], self._figures())
+        self.assertEqual([plot_repeta_sans_ref], [plot_spec.function for plot_spec in plot_specs])
+
+        render_plot_specs(pickle.loads(pickle.dumps(plot_specs)))
+        self.assertEqual(["PLQ1_CV_on_D_vs_D_mean.jpg", "PLQ1_CV_on_V_vs_V_mean.jpg"],
+                         [name.split("\\")[-1] for name in self._figures()])
+
+    def test_deferred_plot_specs_rendered_with_profile(self):
+        *_, plot_specs = repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5, render="deferred")
+
+        paths = render_plot_specs(plot_specs, profile="vector")
+
+        self.assertEqual(["PLQ1_CV_on_V_vs_V_mean.svg", "PLQ1_CV_on_D_vs_D_mean.svg"],
+                         [path.split("\\")[-1] for path in paths])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertEqual([], self._figures())
+
+    def test_unknown_render_policy(self):
+        with self.assertRaises(ValueError):
+            repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5, render="lazy")
+
+
+class TestRepetaSansRefBatch(unittest.TestCase):
+    def setUp(self):
+        clear_synthese_cache()
+        self.addCleanup(clear_synthese_cache)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.source = os.path.join(self.folder, "source")
+        self.output = os.path.join(self.folder, "output")
+        for plate, volumes in [("PLQ1", [100.0, 110.0, 90.0]), ("PLQ2", [100.0, 101.0])]:
+            for iteration, volume in enumerate(volumes):
+                os.makedirs(os.path.join(self.source, f"{plate}_run{iteration}", "rec"))
+                write_repeta_iteration(os.path.join(self.source, f"{plate}_run{iteration}", "rec",
+                                                    "synthese_interferometric_data.csv"), volume)
+        # un fichier qui contient un nom de plaque n'est pas une itération
+        open(os.path.join(self.source, "PLQ1_notes.txt"), "w").close()
+
+    def test_kpi_table_for_the_campaign(self):
+        kpi = repeta_sans_ref_batch(self.source, ["PLQ1", "PLQ2", "PLQ3"], "rec", self.output, 5, workers=2)
+
+        self.assertEqual(["PLQ1", "PLQ2", "PLQ3"], list(kpi["nom_plaque"]))
+        self.assertEqual([3, 2, 0], list(kpi["nb_lecture"]))
+        self.assertEqual([96, 0], list(kpi["nb_puits_au_dessus_du_seuil"][:2]))
+        self.assertAlmostEqual(np.std([100.0, 101.0]) / 100.5 * 100, kpi["CV_mean_V"][1])
+        self.assertTrue(np.isnan(kpi["CV_max_D"][2]))
+
+        for plate in ["PLQ1", "PLQ2"]:
+            self.assertEqual([f"{plate}_CV_on_D_vs_D_mean.jpg", f"{plate}_CV_on_V_vs_V_mean.jpg", "data_raw.csv"],
+                             sorted(os.listdir(os.path.join(self.output, plate))))
+        with open(os.path.join(self.output, "data_repeta_micro_depot.csv")) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(";".join(kpi.columns), lines[0])
+        self.assertEqual(4, len(lines))
+
+    def test_same_kpi_as_single_plate_routine(self):
+        os.remove(os.path.join(self.source, "PLQ1_notes.txt"))  # repeta_sans_ref_v1 le prendrait pour une itération
+        for iteration, volume in enumerate([100.0, 110.0, 90.0]):
+            # mêmes itérations aux chemins '\\' de la routine historique
+            write_repeta_iteration(f"{self.source}\\PLQ1_run{iteration}\\rec\\synthese_interferometric_data.csv", volume)
+        kpi = repeta_sans_ref_batch(self.source, ["PLQ1"], "rec", self.output, 5, workers=1, render="none")
+        result = repeta_sans_ref_v1(self.source, "PLQ1", "rec", self.output, 5, render="none")
+
+        self.assertEqual(list(result[:8]), [kpi["nb_lecture"][0]] + list(kpi.iloc[0, 3:]))
+
+
+class TestCompareEnzymoAreas(unittest.TestCase):
+    def setUp(self):
+        clearWellResultsCache()
+        self.addCleanup(clearWellResultsCache)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.output = os.path.join(self.folder, "comparaison")
+        gamme_validation = [(activity, deg * 1.05) for activity, deg in GAMME]
+        for machine, sheets in [("ref", {"Area 1": enzymo_sheet_rows(10.0, GAMME, [("E1", 2.0, 5.0)]),
+                                         "Area 2": enzymo_sheet_rows(12.0, GAMME, [("E1", 2.5, 4.0)])}),
+                                ("valid", {"Area 1": enzymo_sheet_rows(11.0, gamme_validation, [("E1", 2.2, 6.0)]),
+                                           "Area 2": enzymo_sheet_rows(12.0, gamme_validation, [("E1", 2.4, 4.5)])})]:
+            os.makedirs(os.path.join(self.folder, machine, "acq"))
+            write_enzymo_well_results(os.path.join(self.folder, machine, "acq", "WellResults.xlsx"), sheets)
+        self.reference = os.path.join(self.folder, "ref", "acq", "WellResults.xlsx")
+        self.validation = os.path.join(self.folder, "valid", "acq", "WellResults.xlsx")
+
+    def _compare_areas(self, **kwargs):
+        return compare_enzymo_2_ref_areas(self.reference, "ZC1", "acq", self.validation, "ZC2", "acq",
+                                          self.output, render="none", **kwargs)
+
+    def test_each_workbook_is_read_once(self):
+        with patch("zymosoft_assistant.scripts.getDatasFromWellResults.pd.read_excel",
+                   wraps=pandas.read_excel) as read_excel:
+            comparisons = self._compare_areas()
+
+        # une lecture par feuille et par classeur, pour toutes les areas
+        self.assertEqual(4, read_excel.call_count)
+        self.assertEqual(["Area 1", "Area 2"], [comparison.onglet for comparison in comparisons])
+        self.assertTrue(all(comparison.ok for comparison in comparisons))
+
+    def test_structured_result_matches_legacy_lists(self):
+        comparison = self._compare_areas()[0]
+        data_R, data_V = compare_enzymo_2_ref(os.path.join(self.folder, "ref"), "ZC1", "acq", "Area 1",
+                                              os.path.join(self.folder, "valid"), "ZC2", "acq", self.output,
+                                              render="none")
+
+        self.assertEqual(data_R, comparison.data_R)
+        self.assertEqual(data_V, comparison.data_V)
+        self.assertEqual("ZC2", comparison.validation["machine"])
+        self.assertEqual(2.0, comparison.reference["sensibilite"])
+        self.assertEqual(1.95, comparison.validation["sensibilite"])
+        self.assertAlmostEqual(-2.5, comparison.differences["sensibilite"])
+        self.assertEqual([(2.0, 5.0)], comparison.reference["echantillons"])
+        self.assertEqual([(2.2, 6.0)], comparison.validation["echantillons"])
+        self.assertEqual(1, len(comparison.differences["echantillons"]))
+
+    def test_process_pool_keeps_area_order(self):
+        serial = self._compare_areas(onglets=["Area 2", "Missing", "Area 1"])
+        parallel = self._compare_areas(onglets=["Area 2", "Missing", "Area 1"], workers=2)
+
+        self.assertEqual(["Area 2", "Missing", "Area 1"], [comparison.onglet for comparison in parallel])
+        self.assertEqual([True, False, True], [comparison.ok for comparison in parallel])
+        self.assertEqual([comparison.data_V for comparison in serial], [comparison.data_V for comparison in parallel])
+
+    def test_failing_area_does_not_stop_the_others(self):
+        comparisons = self._compare_areas(onglets=["Area 3", "Area 2"])
+
+        self.assertFalse(comparisons[0].ok)
+        self.assertIn("Area 3", comparisons[0].error)
+        self.assertIsNone(comparisons[0].data_V)
+        self.assertTrue(comparisons[1].ok)
+
+    def test_deferred_render_keeps_plot_specs_per_area(self):
+        comparisons = compare_enzymo_2_ref_areas(self.reference, "ZC1", "acq", self.validation, "ZC2", "acq",
+                                                 self.output, render="deferred")
+
+        self.assertEqual([1, 1], [len(comparison.plot_specs) for comparison in comparisons])
+
+
+class TestEnzymoStatistics(unittest.TestCase):
+    def test_inverse_fit_activities(self):
+        np.testing.assert_array_equal([1.0, 2.0, 3.0], inverse_fit_activities("Linear", [20.0, 10.0], (30, 50, 70)))
+        np.testing.assert_allclose([-np.log(1 - 50 / 80) / 0.5],
+                                   inverse_fit_activities("Exponential plateau 1", [80.0, 0.5], [50]))
+        np.testing.assert_allclose([50 * 2.0 / (100 - 50)], inverse_fit_activities("Logistic 1", [100.0, 2.0], [50]))
+        np.testing.assert_allclose([((50 - 5) * 2.0 ** 1.5 / (100 - 50)) ** (1 / 1.5)],
+                                   inverse_fit_activities("Logistic 3", [100.0, 2.0, 5.0, 1.5], [50]))
+
+        # pas d'inverse : pente nulle, log d'un nombre négatif, asymptote, puissance non réelle
+        self.assertTrue(np.isnan(inverse_fit_activities("Linear", [0.0, 10.0], [50])).all())
+        self.assertTrue(np.isnan(inverse_fit_activities("Exponential plateau 1", [40.0, 0.5], [50])).all())
+        self.assertTrue(np.isnan(inverse_fit_activities("Logistic 2", [50.0, 2.0, 1.0], [50])).all())
+        self.assertTrue(np.isnan(inverse_fit_activities("Logistic 3", [40.0, 2.0, 5.0, 1.5], [50])).all())
+
+    def test_fit_parameters_from_entete(self):
+        entete = [["Plate", "P1"], ["Fit", "Exponential plateau 2"], ["a", "80"], ["b", 0.5], ["c", 2], ["d", None]]
+
+        self.assertEqual(("Exponential plateau 2", [80.0, 0.5, 2.0]), fit_parameters_from_entete(entete))
+        with self.assertRaises(ValueError):
+            fit_parameters_from_entete([["Plate", "P1"], ["Fit", "Spline"]])
+
+    def test_nearest_dilutions(self):
+        gamme = [0.5, 0.5, 1.0, np.nan, 2.0, 3.0]
+
+        # égalité -> premier puits, cible nan ou trop loin -> premier puits de la gamme
+        np.testing.assert_array_equal([1.0, 1.0, 0.5, 0.5],
+                                      nearest_dilutions(gamme, [1.2, 1.5, np.nan, 5000.0]))
+
+    def test_replicate_cv(self):
+        deg = np.array([10.0, 12.0, np.nan, 30.0, 33.0, 31.0])
+        masks = np.array([[True, True, True, False, False, False],
+                          [False, False, False, True, True, True],
+                          [False, False, True, False, False, False]])
+
+        cv = replicate_cv(deg, masks)
+
+        self.assertAlmostEqual(np.std([10.0, 12.0]) * 100 / 11.0, cv[0])
+        self.assertAlmostEqual(np.std([30.0, 33.0, 31.0]) * 100 / np.mean([30.0, 33.0, 31.0]), cv[1])
+        self.assertTrue(np.isnan(cv[2]))
+        self.assertIsInstance(cv[0], float)
+
+
+class TestComparaisonKernel(unittest.TestCase):
+    def setUp(self):
+        self.volume_reference = np.linspace(50.0, 250.0, 96).reshape(8, 12)
+        self.volume = self.volume_reference * 1.02
+        self.volume[0, 0] = 75.0  # outlier exclu du fit et loin du fit
+        self.volume_reference[1, 1] = 0.0  # référence nulle -> différence relative nan
+        self.diametre = np.full((8, 12), 30.0)
+        self.porcent = np.full((8, 12), 80.0)
+
+    def _compare(self):
+        return comparaison_ZC_to_ref_kernel(self.volume, self.diametre, self.porcent,
+                                            self.volume_reference, self.diametre * 0.5, self.porcent - 5,
+                                            tolerance_relative_fit=10)
+
+    def test_differences_and_masks(self):
+        with patch("zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025.plt.figure") as figure:
+            comparaison = self._compare()
+        figure.assert_not_called()
+
+        self.assertEqual(50.0, comparaison["Matrix_volume_difference_relative"][0, 0])
+        self.assertTrue(np.isnan(comparaison["Matrix_volume_difference_relative"][1, 1]))
+        self.assertTrue(np.isnan(comparaison["Matrix_volume_ratio"][1, 1]))
+        np.testing.assert_allclose(100.0, comparaison["Matrix_diametre_difference_relative"])
+        np.testing.assert_allclose(5.0, comparaison["Matrix_nb_dot_utile_pourcent_difference"])
+        self.assertEqual([0, 13], np.flatnonzero(comparaison["mask_volumes_eloignes"]).tolist())
+        self.assertEqual([13], np.flatnonzero(comparaison["mask_nan"]).tolist())
+        self.assertEqual(1, comparaison["nb_puits_trop_loins"])
+
+    def test_fit_on_close_wells(self):
+        comparaison = self._compare()
+
+        self.assertAlmostEqual(1.02, comparaison["slope_fit_inverse"])
+        self.assertAlmostEqual(0.0, comparaison["intercept_fit_inverse"], places=9)
+        # le puits à référence nulle est lui aussi loin du fit
+        self.assertEqual([0, 13], np.flatnonzero(comparaison["mask_volumes_eloignes_fit"]).tolist())
+        self.assertEqual(2, comparaison["nb_puits_loin_fit"])
+        self.assertEqual((96,), comparaison["vecteur_volume_instrument_1"].shape)
+        self.assertEqual(75.0, comparaison["vecteur_volume_instrument_1"][0])
+
+    def test_all_wells_are_outliers(self):
+        self.volume = self.volume_reference * 2
+        comparaison = self._compare()
+
+        self.assertFalse(comparaison["mask_volumes_proches"].any())
+        self.assertAlmostEqual(2.0, comparaison["slope_fit_inverse"])
+        self.assertEqual(95, comparaison["nb_puits_trop_loins"])
+
+
+if __name__ == "__main__":
+    unittest.main()
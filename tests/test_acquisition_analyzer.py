@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";".join(header) + "\n")
+        for row in rows:
+            f.write(";".join(row) + "\n")
+
+
+class TestAcquisitionDataLoading(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.analyzer = AcquisitionAnalyzer(os.path.join(self.folder, "graphs"), render_workers=1)
+
+    def test_data_file_is_found_by_header(self):
+        write_csv(os.path.join(self.folder, "a_dots_detail.csv"), ["Well", "Dot", "Intensity"],
+                  [["A1", str(dot), "1,5"] for dot in range(50)])
+        write_csv(os.path.join(self.folder, "b_results.csv"), ["Well", "Volume", "Comment", "Epaisseur"],
+                  [["A1", "12,5", "ok", "3,25"], ["A2", "", "vide", "4"]])
+
+        with patch("zymosoft_assistant.core.acquisition_analyzer.pd.read_csv",
+                   wraps=pd.read_csv) as read_csv:
+            data = self.analyzer._load_acquisition_data(self.folder)
+
+        # Deux lectures d'en-tête (nrows=0), une seule lecture complète, limitée aux colonnes utiles
+        self.assertEqual([0, 0], [call.kwargs.get("nrows") for call in read_csv.call_args_list[:2]])
+        self.assertEqual(3, read_csv.call_count)
+        self.assertEqual(["Volume", "Epaisseur"], list(data.columns))
+        self.assertEqual("float64", str(data["Volume"].dtype))
+        self.assertEqual([12.5, 3.25], [data["Volume"][0], data["Epaisseur"][0]])
+        self.assertTrue(pd.isna(data["Volume"][1]))
+
+    def test_per_area_files_are_concatenated(self):
+        for area in (2, 1):
+            write_csv(os.path.join(self.folder, f"results_area{area}.csv"), ["Epaisseur", "Volume"],
+                      [[str(area), str(10 * area + well)] for well in range(3)])
+
+        data = self.analyzer._load_acquisition_data(self.folder)
+
+        self.assertEqual([10.0, 11.0, 12.0, 20.0, 21.0, 22.0], list(data["Volume"]))
+        self.assertEqual(list(range(6)), list(data.index))
+
+    def test_missing_columns(self):
+        write_csv(os.path.join(self.folder, "results.csv"), ["Well", "Volume"], [["A1", "1"]])
+
+        self.assertIsNone(self.analyzer._load_acquisition_data(self.folder))
+        self.assertIsNone(self.analyzer._load_acquisition_data(os.path.join(self.folder, "graphs")))
+
+    def test_analyze_results(self):
+        write_csv(os.path.join(self.folder, "results.csv"), ["Epaisseur", "Volume"],
+                  [[str(well), str(2 * well + 1)] for well in range(1, 11)])
+
+        results = self.analyzer.analyze_results(self.folder)
+
+        self.assertTrue(results["valid"])
+        self.assertAlmostEqual(2.0, results["statistics"]["slope"])
+        self.assertEqual(3, len(results["graphs"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zymosoft_assistant.scripts.cleanLog import (
+    clean_log_file,
+    find_last_acquisition_offset,
+    split_line_ranges,
+)
+
+LOG = (
+    "[12/03/2025 09:00:00] Starting acquisition\r\n"
+    "[12/03/2025 09:00:01] [SERIAL][OUT] G0 X10\r\n"
+    "[12/03/2025 09:00:02] First run\r\n"
+    "[12/03/2025 10:00:00] Starting acquisition\r\n"
+    "[12/03/2025 10:00:01] [SERIAL][IN] OK\r\n"
+    "[12/03/2025 10:00:02] MOTOR Z STEP 120 TO POINT\r\n"
+    "[12/03/2025 10:00:03] Going to well \"A1\" é\r\n"
+    "[12/03/2025 10:00:04] Seeking home\r\n"
+    "[12/03/2025 10:30:00] Stopping"
+)
+
+
+class TestCleanLogFile(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.log_path = os.path.join(self.folder, "ZymoCubeCtrl.log")
+        with open(self.log_path, "wb") as handle:
+            handle.write(LOG.encode("utf-8"))
+
+    def _clean(self, output_name, **kwargs):
+        output_path = os.path.join(self.folder, output_name)
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            clean_log_file(self.log_path, output_path, **kwargs)
+        return output_path, stdout.getvalue()
+
+    def test_serial_lines_are_removed(self):
+        output_path, report = self._clean("cleaned.log", chunk_size=16)
+
+        with open(output_path, "rb") as handle:
+            cleaned = handle.read().decode("utf-8")
+        self.assertEqual(
+            "[12/03/2025 09:00:00] Starting acquisition\r\n"
+            "[12/03/2025 09:00:02] First run\r\n"
+            "[12/03/2025 10:00:00] Starting acquisition\r\n"
+            "[12/03/2025 10:00:03] Going to well \"A1\" é\r\n"
+            "[12/03/2025 10:30:00] Stopping",
+            cleaned
+        )
+        self.assertIn("Lines kept: 5", report)
+        self.assertIn("Lines removed: 4", report)
+
+    def test_last_acquisition_only(self):
+        output_path, report = self._clean("cleaned_last.log", keep_last_acquisition_only=True, chunk_size=16)
+
+        with open(output_path, "rb") as handle:
+            self.assertTrue(handle.read().startswith(b"[12/03/2025 10:00:00] Starting acquisition\r\n"))
+        self.assertIn("Found 2 acquisition(s), keeping only the last one starting at line 4", report)
+        self.assertIn("Lines kept: 3", report)
+        self.assertIn("Lines removed: 6", report)
+
+    def test_gzip_output_from_extension(self):
+        plain_path, _ = self._clean("cleaned.log", keep_last_acquisition_only=True)
+        gzip_path, _ = self._clean("cleaned.log.gz", keep_last_acquisition_only=True)
+
+        with open(plain_path, "rb") as plain, gzip.open(gzip_path, "rb") as compressed:
+            self.assertEqual(plain.read(), compressed.read())
+
+    def test_unknown_compression_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._clean("cleaned.log", compression="bz2")
+
+    @patch("zymosoft_assistant.scripts.cleanLog.PARALLEL_MIN_SIZE", 0)
+    def test_parallel_output_matches_sequential(self):
+        for keep_last in (False, True):
+            with self.subTest(keep_last_acquisition_only=keep_last):
+                sequential_path, sequential_report = self._clean("sequential.log.gz",
+                                                                 keep_last_acquisition_only=keep_last)
+                parallel_path, parallel_report = self._clean("parallel.log.gz", keep_last_acquisition_only=keep_last,
+                                                             workers=3, chunk_size=16)
+
+                with gzip.open(sequential_path, "rb") as sequential, gzip.open(parallel_path, "rb") as parallel:
+                    self.assertEqual(sequential.read(), parallel.read())
+                self.assertEqual(sequential_report.replace(sequential_path, ""),
+                                 parallel_report.replace(parallel_path, ""))
+        self.assertEqual(["parallel.log.gz", "sequential.log.gz", "ZymoCubeCtrl.log"],
+                         sorted(os.listdir(self.folder), key=str.lower))
+
+    def test_split_line_ranges(self):
+        data = LOG.encode("utf-8")
+        with open(self.log_path, "rb") as handle:
+            ranges = split_line_ranges(handle, 0, len(data), 4)
+
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(len(data), ranges[-1][1])
+        for (_, previous_end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(previous_end, start)
+            self.assertEqual(b"\n", data[start - 1:start])
+
+    def test_find_last_acquisition_offset(self):
+        with open(self.log_path, "rb") as handle:
+            offset = find_last_acquisition_offset(handle, chunk_size=8)
+            handle.seek(offset)
+            self.assertTrue(handle.readline().endswith(b"Starting acquisition\r\n"))
+            self.assertEqual(LOG.encode("utf-8").rindex(b"[12/03/2025 10:00:00]"), offset)
+
+
+if __name__ == "__main__":
+    unittest.main()
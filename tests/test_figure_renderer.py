@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer
+from PIL import Image
+
+from zymosoft_assistant.core.figure_renderer import (PlotSpec, get_render_profile, new_figure, render_figures,
+                                                     save_figure, with_render_profile)
+
+
+def plot_line(values, path, profile=None):
+    """Fonction de tracé au niveau module, donc picklable pour la pool de rendu."""
+    fig = new_figure(figsize=(4, 3))
+    ax = fig.add_subplot()
+    ax.plot(values)
+    return save_figure(fig, path, profile)
+
+
+class TestRenderFigures(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.plot_specs = [PlotSpec(plot_line, values=np.arange(index + 2),
+                                    path=os.path.join(self.folder, f"figure_{index}.png"))
+                           for index in range(3)]
+
+    def test_process_pool_keeps_order(self):
+        paths = render_figures(self.plot_specs, workers=2)
+
+        self.assertEqual([spec.kwargs["path"] for spec in self.plot_specs], paths)
+        self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+
+    def test_single_worker_renders_in_process(self):
+        self.assertEqual(3, len(render_figures(self.plot_specs, workers=1)))
+        self.assertEqual([], render_figures([]))
+
+
+class TestRenderProfiles(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = os.path.join(self.folder, "figure.jpg")
+
+    def _size(self, path):
+        with Image.open(path) as image:
+            return image.size
+
+    def test_raster_profiles(self):
+        self.assertEqual(self.path, plot_line([1, 2], self.path))
+        self.assertEqual((400, 300), self._size(self.path))
+
+        screen = plot_line([1, 2], self.path, "screen")
+        self.assertEqual(os.path.join(self.folder, "figure.png"), screen)
+        self.assertEqual((400, 300), self._size(screen))
+
+        # taille imposée par le profil rapport (7 x 4,2 pouces à 200 dpi)
+        self.assertEqual((1400, 840), self._size(plot_line([1, 2], self.path, "report")))
+
+    def test_vector_profile_and_plot_specs(self):
+        plot_specs = with_render_profile([PlotSpec(plot_line, values=[1, 2], path=self.path)], "vector")
+
+        paths = render_figures(plot_specs, workers=1)
+
+        self.assertEqual([os.path.join(self.folder, "figure.svg")], paths)
+        with open(paths[0], encoding="utf-8") as f:
+            self.assertIn("<svg", f.read())
+        with self.assertRaises(ValueError):
+            get_render_profile("print")
+
+
+class TestAcquisitionAnalyzerGraphs(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def test_generate_graphs(self):
+        thickness = np.linspace(1.0, 5.0, 40)
+        data = pd.DataFrame({"Epaisseur": thickness, "Volume": 2.0 * thickness + np.sin(thickness)})
+        analyzer = AcquisitionAnalyzer(self.folder, render_workers=2)
+
+        paths = analyzer.generate_graphs(data)
+
+        self.assertEqual(["volume_vs_thickness.png", "thickness_vs_volume.png", "residuals_distribution.png"],
+                         [os.path.basename(path) for path in paths])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    def test_empty_data(self):
+        self.assertEqual([], AcquisitionAnalyzer(self.folder).generate_graphs(pd.DataFrame()))
+
+    def test_report_profile(self):
+        thickness = np.linspace(1.0, 5.0, 40)
+        data = pd.DataFrame({"Epaisseur": thickness, "Volume": 2.0 * thickness + np.sin(thickness)})
+        analyzer = AcquisitionAnalyzer(self.folder, render_workers=1)
+        results = {"valid": True, "data": data, "graphs": []}
+
+        screen_paths = analyzer.get_graphs(results)
+        report_paths = analyzer.get_graphs(results, profile="report")
+        vector_paths = analyzer.get_graphs(results, profile="vector")
+
+        self.assertEqual(screen_paths, results["graphs"])
+        self.assertTrue(set(screen_paths).isdisjoint(report_paths))
+        self.assertEqual(["volume_vs_thickness.svg", "thickness_vs_volume.svg", "residuals_distribution.svg"],
+                         [os.path.basename(path) for path in vector_paths])
+        # figures recadrées (bbox_inches='tight') : au plus la taille du profil
+        with Image.open(screen_paths[0]) as screen_image, Image.open(report_paths[0]) as report_image:
+            screen_width = screen_image.size[0]
+            report_width = report_image.size[0]
+        self.assertLessEqual(screen_width, 1000)
+        self.assertGreater(report_width, screen_width)
+        self.assertLessEqual(report_width, 1400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from openpyxl import Workbook
+
+from zymosoft_assistant.scripts.getDatasFromWellResults import (
+    calculateLODLOQComparison,
+    clearWellResultsCache,
+    findSectionRows,
+    getBlankDataForAreaInWellResultFile,
+    getDataForAreaInWellResultFile,
+    getWellResultsSidecarPath,
+    getWellResultsWorkbook,
+    loadWellResultsSidecar,
+    parseCalibrationSection,
+    processWellResults,
+)
+
+
+def build_area_rows(activities, values, blanks):
+    """
+    Lignes d'une feuille WellResults : calibration (Activity, ..., écart type) puis blancs.
+    Les nombres sont écrits avec une virgule décimale, comme dans les exports ZymoSoft.
+    """
+    rows = [
+        ["Plate", "GPAm241204-25", None, None, None],
+        [None, None, None, None, None],
+        ["WellCalibrationResult", None, None, None, None],
+        ["Activity", "Mean", "CV", "Std", None],
+    ]
+    for activity, value in zip(activities, values):
+        rows.append([str(activity).replace(".", ","), 1.5, 2.5, str(value).replace(".", ","), None])
+    rows.append([None, None, None, None, None])
+    rows.append(["WellBlankResult", None, None, None, None])
+    rows.append(["Well", "Trouble", "Zymunit", "Exclusion", "Exclusion comment"])
+    for well, zymunit, excluded in blanks:
+        rows.append([well, 0, str(zymunit).replace(".", ","), excluded, None])
+    return rows
+
+
+def write_well_results(path, areas):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for area_index, rows in enumerate(areas):
+        sheet = workbook.create_sheet(f"Area {area_index + 1}")
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+
+
+REFERENCE_AREAS = [
+    build_area_rows([0.5, 1.0, 2.0], [1.2, 2.4, 6.0],
+                    [("A1", 0.2, False), ("A2", 0.4, False), ("A3", 9.0, True)]),
+    build_area_rows([0.5, 1.0, 2.0], [0.8, 3.0, 12.0],
+                    [("B1", 0.1, False), ("B2", 0.3, False)]),
+]
+ACQUISITION_AREAS = [
+    build_area_rows([0.5, 1.0, 2.0], [1.0, 7.0, 7.5],
+                    [("A1", 0.3, False), ("A2", 0.5, False)]),
+    build_area_rows([0.5, 1.0, 2.0], [0.9, 2.0, 15.0],
+                    [("B1", 0.2, False), ("B2", 0.2, False), ("B3", 0.6, "False")]),
+]
+
+
+class WellResultsTestCase(unittest.TestCase):
+    def setUp(self):
+        clearWellResultsCache()
+        self.addCleanup(clearWellResultsCache)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.acquisition_folder = os.path.join(self.folder, "acquisition")
+        self.reference_folder = os.path.join(self.folder, "reference")
+        os.makedirs(self.acquisition_folder)
+        os.makedirs(self.reference_folder)
+        self.acquisition_file = os.path.join(self.acquisition_folder, "WellResults.xlsx")
+        self.reference_file = os.path.join(self.reference_folder, "WellResults.xlsx")
+        write_well_results(self.acquisition_file, ACQUISITION_AREAS)
+        write_well_results(self.reference_file, REFERENCE_AREAS)
+
+
+class TestWellResultsSections(WellResultsTestCase):
+    def test_calibration_section(self):
+        data = getDataForAreaInWellResultFile(self.reference_file, 1)
+
+        self.assertEqual([0.5, 1.0, 2.0], data["activity"])
+        self.assertEqual([0.8, 3.0, 12.0], data["values"])
+
+    def test_blank_section_skips_excluded_wells(self):
+        self.assertEqual([0.2, 0.4], getBlankDataForAreaInWellResultFile(self.reference_file, 0))
+        self.assertEqual([0.2, 0.2, 0.6], getBlankDataForAreaInWellResultFile(self.acquisition_file, 1))
+
+    def test_area_out_of_range(self):
+        with self.assertRaises(ValueError):
+            getDataForAreaInWellResultFile(self.reference_file, 2)
+
+
+class TestFindSectionRows(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(build_area_rows([0.5, 1.0], [1.2, 2.4], [("A1", 0.2, False)])[1:])
+
+    def test_section_and_data_block(self):
+        self.assertEqual((1, 2, 3, 5), findSectionRows(self.df, "WellCalibrationResult", "Activity"))
+        self.assertEqual((6, 7, 8, 9), findSectionRows(self.df, "WellBlankResult", "Well"))
+
+    def test_missing_section(self):
+        self.assertEqual((None, None, None, None), findSectionRows(self.df, "WellSampleResult", "Well"))
+
+    def test_non_numeric_rows_are_skipped(self):
+        df = self.df.copy()
+        df.iloc[3, 3] = "n/a"
+        df.iloc[4, 0] = 2
+
+        self.assertEqual({"activity": [2.0], "values": [2.4]}, parseCalibrationSection(df, "Area 1"))
+
+
+class TestWellResultsWorkbookCache(WellResultsTestCase):
+    def test_each_workbook_is_read_once(self):
+        with patch("zymosoft_assistant.scripts.getDatasFromWellResults.pd.read_excel",
+                   wraps=pd.read_excel) as read_excel:
+            results = processWellResults(self.acquisition_folder, self.reference_folder)
+            calculateLODLOQComparison(self.acquisition_folder, self.reference_folder)
+
+        # Une lecture par feuille et par classeur, quel que soit le nombre d'areas et d'appels
+        self.assertEqual(4, read_excel.call_count)
+        self.assertEqual([1, 1, 1, 2, 2, 2], list(results["area"]))
+        self.assertEqual([True, False, True, True, True, False], list(results["valid"]))
+
+    def test_modified_workbook_is_read_again(self):
+        workbook = getWellResultsWorkbook(self.reference_file)
+        self.assertIs(workbook, getWellResultsWorkbook(self.reference_file))
+
+        write_well_results(self.reference_file, ACQUISITION_AREAS)
+        stat = os.stat(self.reference_file)
+        os.utime(self.reference_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        reloaded = getWellResultsWorkbook(self.reference_file)
+        self.assertIsNot(workbook, reloaded)
+        self.assertEqual([1.0, 7.0, 7.5], reloaded.get_calibration(0)["values"])
+
+    def test_returned_sections_are_copies(self):
+        workbook = getWellResultsWorkbook(self.reference_file)
+        workbook.get_calibration(0)["values"].append(99.0)
+        workbook.get_blanks(0).append(99.0)
+
+        self.assertEqual([1.2, 2.4, 6.0], workbook.get_calibration(0)["values"])
+        self.assertEqual([0.2, 0.4], workbook.get_blanks(0))
+
+
+class TestWellResultsSidecar(WellResultsTestCase):
+    def _read_excel_calls(self, function, *args):
+        clearWellResultsCache()
+        with patch("zymosoft_assistant.scripts.getDatasFromWellResults.pd.read_excel",
+                   wraps=pd.read_excel) as read_excel:
+            result = function(*args)
+        return result, read_excel.call_count
+
+    def test_sidecar_replaces_excel_parsing(self):
+        first, first_calls = self._read_excel_calls(processWellResults, self.acquisition_folder,
+                                                    self.reference_folder)
+        second, second_calls = self._read_excel_calls(processWellResults, self.acquisition_folder,
+                                                      self.reference_folder)
+
+        self.assertTrue(os.path.exists(getWellResultsSidecarPath(self.reference_file)))
+        self.assertEqual(4, first_calls)
+        self.assertEqual(0, second_calls)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_copied_workbook_is_validated_by_hash(self):
+        getWellResultsWorkbook(self.reference_file)
+        copy_path = os.path.join(self.folder, "WellResults.xlsx")
+        shutil.copy(self.reference_file, copy_path)
+        shutil.copy(getWellResultsSidecarPath(self.reference_file), getWellResultsSidecarPath(copy_path))
+        stat = os.stat(copy_path)
+        os.utime(copy_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        workbook = loadWellResultsSidecar(copy_path)
+
+        self.assertIsNotNone(workbook)
+        self.assertEqual([0.2, 0.4], workbook.get_blanks(0))
+
+    def test_modified_workbook_invalidates_sidecar(self):
+        getWellResultsWorkbook(self.reference_file)
+        write_well_results(self.reference_file, ACQUISITION_AREAS + ACQUISITION_AREAS)
+
+        self.assertIsNone(loadWellResultsSidecar(self.reference_file))
+        self.assertEqual(4, getWellResultsWorkbook(self.reference_file).number_of_areas)
+
+    def test_sidecar_workbook_reads_sheets_on_demand(self):
+        getWellResultsWorkbook(self.reference_file)
+        clearWellResultsCache()
+        workbook = getWellResultsWorkbook(self.reference_file)
+        self.assertEqual({}, workbook.sheets)
+
+        sheet = workbook.get_sheet("Area 2")
+
+        pd.testing.assert_frame_equal(pd.read_excel(self.reference_file, sheet_name="Area 2"), sheet)
+        self.assertEqual(["Area 1", "Area 2"], list(workbook.sheets))
+        with self.assertRaises(ValueError):
+            workbook.get_sheet("Area 3")
+
+    def test_missing_section_error_is_kept(self):
+        write_well_results(self.reference_file, [REFERENCE_AREAS[0][:8]])
+        getWellResultsWorkbook(self.reference_file)
+        clearWellResultsCache()
+
+        workbook = getWellResultsWorkbook(self.reference_file)
+
+        self.assertEqual({}, workbook.sheets)
+        self.assertEqual([1.2, 2.4, 6.0], workbook.get_calibration(0)["values"])
+        with self.assertRaisesRegex(ValueError, "Section WellBlankResult non trouvée dans Area 1"):
+            workbook.get_blanks(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
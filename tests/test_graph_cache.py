@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from zymosoft_assistant.core import graph_cache
+from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer
+from zymosoft_assistant.core.graph_cache import GraphCache, GraphRequest, graph_cache_key, hash_arrays
+
+
+def write_bytes(path, size):
+    """Fonction de « tracé » au niveau module : écrit size octets dans path."""
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+def plate_data(offset=0.0):
+    thickness = np.linspace(1.0, 5.0, 30)
+    return pd.DataFrame({"Epaisseur": thickness, "Volume": 2.0 * thickness + np.cos(thickness) + offset})
+
+
+class TestGraphCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.cache = GraphCache(os.path.join(self.folder, "cache"), max_bytes=250)
+
+    def request(self, name, size=100):
+        return GraphRequest(graph_cache_key(name, "hash", {"dpi": 100}), f"{name}.png", write_bytes, size=size)
+
+    def test_rendered_once(self):
+        with patch.object(graph_cache, "render_figures", wraps=graph_cache.render_figures) as render:
+            first = self.cache.get_or_render([self.request("a")], workers=1)
+            second = self.cache.get_or_render([self.request("a")], workers=1)
+
+        self.assertEqual(1, render.call_count)
+        self.assertEqual(first, second)
+        self.assertEqual("a.png", os.path.basename(first[0]))
+        self.assertEqual([self.request("a").key], os.listdir(self.cache.cache_dir))
+
+    def test_keys_depend_on_data_and_params(self):
+        self.assertNotEqual(graph_cache_key("a", "hash", {"dpi": 100}), graph_cache_key("a", "hash", {"dpi": 300}))
+        self.assertEqual(hash_arrays(np.arange(3.0)), hash_arrays([0, 1, 2]))
+        self.assertNotEqual(hash_arrays(np.arange(3.0)), hash_arrays(np.arange(3.0).reshape(3, 1)))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        a = self.cache.get_or_render([self.request("a")], workers=1)[0]
+        b = self.cache.get_or_render([self.request("b")], workers=1)[0]
+        old = time.time() - 100
+        os.utime(os.path.dirname(b), (old, old))
+        os.utime(os.path.dirname(a), (old + 10, old + 10))
+
+        c = self.cache.get_or_render([self.request("c")], workers=1)[0]
+
+        self.assertTrue(os.path.exists(a))
+        self.assertFalse(os.path.exists(b))
+        self.assertTrue(os.path.exists(c))
+
+
+class TestLazyAcquisitionGraphs(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.analyzer = AcquisitionAnalyzer(self.folder, render_workers=1)
+
+    def test_same_data_reuses_images(self):
+        first = self.analyzer.generate_graphs(plate_data())
+        other = self.analyzer.generate_graphs(plate_data(offset=1.0))
+        with patch.object(graph_cache, "render_figures") as render:
+            second = AcquisitionAnalyzer(self.folder).generate_graphs(plate_data())
+
+        render.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertTrue(set(first).isdisjoint(other))
+        self.assertEqual(["volume_vs_thickness.png", "thickness_vs_volume.png", "residuals_distribution.png"],
+                         [os.path.basename(path) for path in other])
+
+    def test_graphs_generated_on_demand(self):
+        data = plate_data()
+        results_folder = os.path.join(self.folder, "results")
+        os.makedirs(results_folder)
+        data.to_csv(os.path.join(results_folder, "results.csv"), sep=';', decimal=',', index=False)
+
+        results = self.analyzer.analyze_results(results_folder, lazy_graphs=True)
+        self.assertEqual([], results["graphs"])
+
+        paths = self.analyzer.get_graphs(results)
+        self.assertEqual(paths, results["graphs"])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+        # Session sauvegardée puis rechargée : données sous forme d'enregistrements, images supprimées
+        shutil.rmtree(os.path.dirname(paths[0]))
+        reloaded = {"valid": True, "data": results["data"].to_dict(orient="records"), "graphs": paths}
+        self.assertEqual(paths, self.analyzer.get_graphs(reloaded))
+        self.assertTrue(os.path.exists(paths[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
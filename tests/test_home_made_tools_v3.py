@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas
+
+from zymosoft_assistant.scripts.home_made_tools_v3 import (
+    SYNTHESE_NANOFILM_COLUMNS,
+    SYNTHESE_ZYMINTERN_COLUMNS,
+    clear_synthese_cache,
+    import_data_from_csv_synthese_zymintern,
+    import_plate_synthese_zymintern,
+    plate_position_to_indices,
+    read_plate_synthese_cached,
+    synthese_cache_info,
+)
+
+WELLS_96 = [f"{letter}{col}" for letter in "ABCDEFGH" for col in range(1, 13)]
+
+
+def write_synthese_csv(path, wells, columns, value=lambda row, col, metric: row * 100 + col + metric / 10):
+    """Fichier synthese_interferometric_data.csv minimal (séparateur ';', colonne finale sans nom)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";".join(["Position_plaque", "Name"] + list(columns) + ["Comment"]) + ";\n")
+        for well in wells:
+            row, col = ord(well[0]) - ord("A"), int(well[1:]) - 1
+            values = [str(value(row, col, metric)) for metric in range(len(columns))]
+            f.write(";".join([well, "plate"] + values + [""]) + ";\n")
+
+
+class TestPlateSyntheseLoader(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.file = os.path.join(self.folder, "synthese_interferometric_data.csv")
+        self.columns = [column for _, column in SYNTHESE_ZYMINTERN_COLUMNS]
+
+    def test_96_wells_named_access_and_legacy_tuple(self):
+        wells = [f"{letter}{col}" for col in range(12, 0, -1) for letter in "HGFEDCBA"]
+        write_synthese_csv(self.file, wells, self.columns)
+
+        plate = import_plate_synthese_zymintern(self.file)
+        legacy = import_data_from_csv_synthese_zymintern(self.file)
+
+        self.assertEqual((8, 8, 12), plate.values.shape)
+        self.assertEqual(702.1, plate["volume_std"][7, 2])
+        self.assertAlmostEqual(plate["N_dot_keep"][3, 4] / plate["N_dot_detected"][3, 4] * 100,
+                               plate["porcent_dot_keep"][3, 4])
+        self.assertEqual(8, len(legacy))
+        np.testing.assert_array_equal(plate["N_cycle"], legacy[6])
+
+    def test_384_wells(self):
+        wells = [f"{letter}{col}" for letter in "ABCDEFGHIJKLMNOP" for col in range(1, 25)]
+        write_synthese_csv(self.file, wells, self.columns)
+
+        plate = import_plate_synthese_zymintern(self.file, plate_format=384)
+
+        self.assertEqual((8, 16, 24), plate.values.shape)
+        self.assertEqual(1523.0, plate["volume"][15, 23])
+
+    def test_position_outside_plate(self):
+        with self.assertRaises(ValueError):
+            plate_position_to_indices(["A1", "I1"], plate_format=96)
+        with self.assertRaises(ValueError):
+            plate_position_to_indices(["A13"], plate_format=96)
+
+        rows, cols = plate_position_to_indices(["a1", "P24"], plate_format=384)
+        self.assertEqual([0, 15], rows.tolist())
+        self.assertEqual([0, 23], cols.tolist())
+
+
+class TestSyntheseCache(unittest.TestCase):
+    def setUp(self):
+        clear_synthese_cache()
+        self.addCleanup(clear_synthese_cache)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.columns = [column for _, column in SYNTHESE_ZYMINTERN_COLUMNS]
+        self.file = os.path.join(self.folder, "synthese_interferometric_data.csv")
+        write_synthese_csv(self.file, WELLS_96, self.columns)
+
+    def test_repeated_reads_do_not_parse_again(self):
+        with patch("zymosoft_assistant.scripts.home_made_tools_v3.pandas.read_csv",
+                   wraps=pandas.read_csv) as read_csv:
+            first = import_data_from_csv_synthese_zymintern(self.file)
+            second = import_data_from_csv_synthese_zymintern(self.file)
+
+        self.assertEqual(1, read_csv.call_count)
+        self.assertIs(first[0].base, second[0].base)
+        self.assertEqual({"hits": 1, "misses": 1, "entries": 1}, {key: synthese_cache_info()[key]
+                                                                for key in ("hits", "misses", "entries")})
+
+    def test_cached_arrays_are_read_only(self):
+        volume = read_plate_synthese_cached(self.file)["volume"]
+
+        with self.assertRaises(ValueError):
+            volume[0, 0] = 1.0
+        self.assertTrue(import_data_from_csv_synthese_zymintern(self.file, use_cache=False)[0].flags.writeable)
+
+    def test_rewritten_file_is_read_again(self):
+        read_plate_synthese_cached(self.file)
+        write_synthese_csv(self.file, WELLS_96, self.columns, value=lambda row, col, metric: 1.0)
+        stat = os.stat(self.file)
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(1.0, read_plate_synthese_cached(self.file)["volume"][4, 4])
+        self.assertEqual(1, synthese_cache_info()["entries"])
+
+    def test_least_recently_used_entry_is_evicted(self):
+        nanofilm_file = os.path.join(self.folder, "synthese_nanofilm.csv")
+        write_synthese_csv(nanofilm_file, WELLS_96, [column for _, column in SYNTHESE_NANOFILM_COLUMNS])
+        plate_bytes = read_plate_synthese_cached(self.file).values.nbytes
+
+        with patch("zymosoft_assistant.scripts.home_made_tools_v3.SYNTHESE_CACHE_MAX_BYTES", plate_bytes):
+            read_plate_synthese_cached(nanofilm_file, kind="nanofilm")
+
+        info = synthese_cache_info()
+        self.assertEqual(1, info["entries"])
+        self.assertLessEqual(info["bytes"], plate_bytes)
+        read_plate_synthese_cached(nanofilm_file, kind="nanofilm")
+        self.assertEqual(1, synthese_cache_info()["hits"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer
+from zymosoft_assistant.core.linear_fit import fit_linear
+
+
+def noisy_plate(n=96, seed=0):
+    """Épaisseurs / volumes sur une droite y = 2x + 1 bruitée, avec quelques puits aberrants."""
+    rng = np.random.default_rng(seed)
+    thickness = rng.uniform(1.0, 5.0, n)
+    volume = 2.0 * thickness + 1.0 + rng.normal(0.0, 0.1, n)
+    volume[::12] += 6.0
+    return thickness, volume
+
+
+class TestFitLinear(unittest.TestCase):
+    def test_matches_least_squares(self):
+        x, y = noisy_plate()
+        x[5] = np.nan
+
+        fit = fit_linear(x, y)
+
+        mask = ~np.isnan(x)
+        slope, intercept = np.polyfit(x[mask], y[mask], 1)
+        residuals = y[mask] - (slope * x[mask] + intercept)
+        self.assertEqual(95, fit.n_points)
+        self.assertAlmostEqual(slope, fit.slope, places=12)
+        self.assertAlmostEqual(intercept, fit.intercept, places=12)
+        self.assertAlmostEqual(1 - np.sum(residuals ** 2) / np.sum((y[mask] - y[mask].mean()) ** 2), fit.r2)
+        np.testing.assert_array_equal(np.abs(residuals) > 2 * np.std(residuals), fit.outliers_mask)
+        self.assertEqual({}, fit.robust)
+
+    def test_inverse_reuses_sums(self):
+        x, y = noisy_plate()
+
+        inverse = fit_linear(x, y).inverse()
+
+        slope_inv, intercept_inv = np.polyfit(y, x, 1)
+        self.assertAlmostEqual(slope_inv, inverse.slope, places=12)
+        self.assertAlmostEqual(intercept_inv, inverse.intercept, places=12)
+        np.testing.assert_array_equal(y, inverse.x)
+
+    def test_robust_variants_ignore_outliers(self):
+        x, y = noisy_plate()
+
+        fit = fit_linear(x, y, robust=("huber", "theil_sen"))
+
+        for method in ("huber", "theil_sen"):
+            robust_fit = fit.robust[method]
+            self.assertEqual(method, robust_fit.method)
+            self.assertAlmostEqual(2.0, robust_fit.slope, delta=0.05)
+            self.assertAlmostEqual(1.0, robust_fit.intercept, delta=0.15)
+            self.assertTrue(robust_fit.outliers_mask[::12].all())
+        self.assertGreater(abs(fit.intercept - 1.0), 0.15)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            fit_linear([1.0, np.nan], [2.0, 3.0])
+        with self.assertRaises(ValueError):
+            fit_linear([1.0, 1.0, 1.0], [2.0, 3.0, 4.0])
+        with self.assertRaises(ValueError):
+            fit_linear([1.0, 2.0], [2.0, 3.0], robust=("ransac",))
+
+
+class TestAcquisitionAnalyzerStatistics(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        thickness, volume = noisy_plate()
+        self.data = pd.DataFrame({"Epaisseur": thickness, "Volume": volume})
+
+    def test_statistics_with_robust_fits(self):
+        analyzer = AcquisitionAnalyzer(self.folder, robust_methods=("huber",))
+
+        statistics = analyzer.calculate_statistics(self.data)
+
+        fit = fit_linear(self.data["Epaisseur"], self.data["Volume"])
+        self.assertEqual(fit.slope, statistics["slope"])
+        self.assertEqual(fit.outliers_count, statistics["outliers_count"])
+        self.assertAlmostEqual(2.0, statistics["huber_slope"], delta=0.05)
+        self.assertNotIn("theil_sen_slope", statistics)
+
+    def test_fit_is_shared_by_statistics_and_graphs(self):
+        analyzer = AcquisitionAnalyzer(self.folder, render_workers=1)
+        fit = analyzer.fit_data(self.data)
+        fit.slope = 3.0
+
+        self.assertEqual(3.0, analyzer.calculate_statistics(self.data, fit)["slope"])
+        self.assertEqual(3, len(analyzer.generate_graphs(self.data, fit)))
+
+    def test_not_enough_points(self):
+        analyzer = AcquisitionAnalyzer(self.folder)
+        data = pd.DataFrame({"Epaisseur": [1.0, np.nan], "Volume": [2.0, 3.0]})
+
+        self.assertIsNone(analyzer.fit_data(data))
+        self.assertEqual(0.0, analyzer.calculate_statistics(data)["r2"])
+        self.assertEqual([], analyzer.generate_graphs(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,27 @@
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 
-from zymosoft_assistant.scripts.processAcquisitionLog import findLastAcquisition
+import pandas as pd
+
+from zymosoft_assistant.scripts.processAcquisitionLog import (
+    analyzeLogFile,
+    analyzeLogFilesBatch,
+    calculateAcquisitionDuration,
+    calculateAverageLoopsPrior,
+    classifyLogLine,
+    countNumberOfDriftFix,
+    findLastAcquisition,
+    findLogFiles,
+    getLogFile,
+    getLogIndexPath,
+    LogFollower,
+    locateLastAcquisition,
+    locateLastAcquisitionFromIndex,
+    updateLogIndex,
+)
 
 
 class TestFindLastAcquisition(unittest.TestCase):
@@ -57,3 +77,289 @@ class TestFindLastAcquisition(unittest.TestCase):
             line, line_number = findLastAcquisition("dummy_path.log")
         self.assertIsNone(line)
         self.assertIsNone(line_number)
+
+
+PRIOR_LOG = (
+    "[12/03/2025 09:00:00] Starting acquisition\n"
+    '[12/03/2025 09:00:05] Going to well "A1"\n'
+    "[AUTOFOCUS][FOCUS] Done after 9 loop(s)\n"
+    "[12/03/2025 09:00:10] Stopping\n"
+    "[12/03/2025 10:00:00] Starting acquisition\n"
+    "[12/03/2025 10:00:01] Starting auto-position of wells: A1 A12 H12\n"
+    '[12/03/2025 10:00:02] Going to well "A1"\n'
+    "[AUTOFOCUS][FOCUS] Done after 7 loop(s)\n"
+    "Reference wells A1 A12 H12 re-aligned.\n"
+    '[12/03/2025 10:00:10] Going to well "B1"\n'
+    "[SERIAL][IN] 0x01\n"
+    "[AUTOFOCUS][FOCUS] Done after 2 loop(s)\n"
+    "DRIFT FIX: applied\n"
+    '[12/03/2025 10:00:20] Going to well "B2"\n'
+    "[AUTOFOCUS][FOCUS] Time out after 5 loop(s)\n"
+    '[12/03/2025 10:00:30] Going to well "B1"\n'
+    "[AUTOFOCUS][FOCUS] Done after 4 loop(s)\n"
+    "[12/03/2025 10:30:00] Stopping\n"
+)
+
+CUSTOM_FOCUS_LOG = (
+    "[12/03/2025 10:00:00] Starting acquisition\n"
+    "[12/03/2025 10:00:01] Starting auto-position of wells: A1 A12 H12\n"
+    '[12/03/2025 10:00:02] Going to well "A1"\n'
+    "[AUTOFOCUS][FOCUS] Adjusting focus, move: 8\n"
+    "[AUTOFOCUS][OFF] Done\n"
+    "Reference wells A1 A12 H12 re-aligned.\n"
+    '[12/03/2025 10:00:10] Going to well "B1"\n'
+    "[AUTOFOCUS][FOCUS] Adjusting focus, move: 1\n"
+    "[AUTOFOCUS][FOCUS] Adjusting focus, move: 3\n"
+    "[AUTOFOCUS][OFF] Done\n"
+    '[12/03/2025 10:00:20] Going to well "B2"\n'
+    "[AUTOFOCUS][FOCUS] Adjusting focus, move: 6\n"
+    "[AUTOFOCUS][FOCUS] Still not in focus\n"
+    "DRIFT FIX: applied\n"
+    "[12/03/2025 10:15:00] Stopping\n"
+)
+
+
+class TestAnalyzeLogFile(unittest.TestCase):
+    def _write_log(self, content):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".log", delete=False, encoding="utf-8")
+        handle.write(content)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_analyze_prior_log_uses_last_acquisition_only(self):
+        result = analyzeLogFile(self._write_log(PRIOR_LOG))
+
+        self.assertEqual("prior", result["acquisition_type"])
+        self.assertEqual([2, 4], result["values"])
+        self.assertEqual(3.0, result["average_value"])
+        self.assertEqual(3, result["total_measurements"])
+        self.assertEqual(1, result["timeout_measurements"])
+        self.assertEqual(2, result["total_wells"])
+        self.assertEqual(1, result["cycles_detected"])
+        self.assertEqual(1, result["drift_fix_count"])
+        self.assertEqual(30.0, result["acquisition_duration"]["duration_minutes"])
+
+    def test_analyze_custom_focus_log_skips_alignment_phase(self):
+        result = analyzeLogFile(self._write_log(CUSTOM_FOCUS_LOG))
+
+        self.assertEqual("custom_focus", result["acquisition_type"])
+        self.assertEqual([3, 6], result["values"])
+        self.assertEqual(1, result["timeout_measurements"])
+        self.assertEqual({"B1", "B2"}, set(result["wells_data"]))
+        self.assertEqual(1, result["drift_fix_count"])
+        self.assertEqual(15.0, result["acquisition_duration"]["duration_minutes"])
+
+    def test_analyze_matches_per_metric_functions(self):
+        path = self._write_log(PRIOR_LOG)
+        _, line_number = findLastAcquisition(path)
+        stats = calculateAverageLoopsPrior(path, line_number)
+
+        result = analyzeLogFile(path)
+
+        self.assertEqual(stats["loops_values"], result["values"])
+        self.assertEqual(stats["wells_data"], result["wells_data"])
+        self.assertEqual(countNumberOfDriftFix(path, line_number), result["drift_fix_count"])
+        self.assertEqual(calculateAcquisitionDuration(path), result["acquisition_duration"])
+
+
+class TestLocateLastAcquisition(unittest.TestCase):
+    def _write_log(self, content):
+        handle = tempfile.NamedTemporaryFile("wb", suffix=".log", delete=False)
+        handle.write(content.encode("utf-8"))
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_locate_returns_offsets_and_line_numbers(self):
+        path = self._write_log(PRIOR_LOG)
+        expected_offset = PRIOR_LOG.encode("utf-8").index(b"[12/03/2025 10:00:00] Starting acquisition")
+
+        location = locateLastAcquisition(path, block_size=16)
+
+        self.assertEqual("[12/03/2025 10:00:00] Starting acquisition", location["last_acquisition"])
+        self.assertEqual(expected_offset, location["last_acquisition_offset"])
+        self.assertEqual(4, location["last_acquisition_line_number"])
+        self.assertEqual(4, location["start_line"])
+        self.assertEqual(17, location["end_line"])
+        self.assertEqual(expected_offset, location["read_offset"])
+
+    def test_locate_matches_forward_scan_with_crlf_line_endings(self):
+        path = self._write_log(PRIOR_LOG.replace("\n", "\r\n"))
+
+        location = locateLastAcquisition(path, block_size=7)
+
+        self.assertEqual(findLastAcquisition(path), (location["last_acquisition"],
+                                                     location["last_acquisition_line_number"]))
+        self.assertEqual(countNumberOfDriftFix(path, location["last_acquisition_line_number"]),
+                         countNumberOfDriftFix(path, last_acquisition_offset=location["last_acquisition_offset"]))
+
+    def test_locate_without_acquisition_reads_whole_file(self):
+        path = self._write_log("System ready.\nStopping\n")
+
+        location = locateLastAcquisition(path)
+
+        self.assertIsNone(location["last_acquisition_offset"])
+        self.assertIsNone(location["end_offset"])
+        self.assertEqual(0, location["read_offset"])
+
+
+class TestLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.log_path = os.path.join(self.folder, "ZymoCubeCtrl.log")
+
+    def _append(self, content):
+        with open(self.log_path, "ab") as handle:
+            handle.write(content.encode("utf-8"))
+
+    def test_index_is_written_next_to_log(self):
+        self._append(PRIOR_LOG)
+
+        updateLogIndex(self.log_path)
+
+        self.assertTrue(os.path.exists(getLogIndexPath(self.log_path)))
+        self.assertEqual(self.log_path, getLogFile(self.folder))
+
+    def test_incremental_update_matches_reverse_locator(self):
+        first_part, second_part = PRIOR_LOG[:150], PRIOR_LOG[150:]
+        self._append(first_part)
+        partial = updateLogIndex(self.log_path)
+        self.assertEqual(len(first_part[:first_part.rindex("\n") + 1]), partial["indexed_size"])
+
+        self._append(second_part)
+        index = updateLogIndex(self.log_path)
+
+        self.assertEqual(2, len(index["acquisitions"]))
+        self.assertEqual(["A1", "B1", "B2", "B1"], [well[0] for well in index["acquisitions"][-1]["wells"]])
+        self.assertEqual(locateLastAcquisition(self.log_path), locateLastAcquisitionFromIndex(index))
+
+    def test_only_new_bytes_are_read_after_indexing(self):
+        self._append(PRIOR_LOG)
+        updateLogIndex(self.log_path)
+        self._append("[12/03/2025 11:00:00] Starting acquisition\n")
+
+        with patch("zymosoft_assistant.scripts.processAcquisitionLog._emptyLogIndex") as empty_index:
+            index = updateLogIndex(self.log_path)
+
+        empty_index.assert_not_called()
+        self.assertEqual(3, len(index["acquisitions"]))
+        self.assertEqual(18, index["acquisitions"][-1]["line_number"])
+
+    def test_rewritten_log_rebuilds_index(self):
+        self._append(PRIOR_LOG)
+        updateLogIndex(self.log_path)
+        with open(self.log_path, "wb") as handle:
+            handle.write(b"[12/03/2025 12:00:00] Starting acquisition\n")
+
+        index = updateLogIndex(self.log_path)
+
+        self.assertEqual(1, len(index["acquisitions"]))
+        self.assertEqual(0, index["acquisitions"][0]["offset"])
+
+    def test_analyze_with_index_matches_analysis_without_index(self):
+        self._append(PRIOR_LOG)
+
+        self.assertEqual(analyzeLogFile(self.log_path), analyzeLogFile(self.log_path, use_index=True))
+
+
+class TestLogFollower(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.log_path = os.path.join(self.folder, "ZymoCubeCtrl.log")
+        open(self.log_path, "w").close()
+
+    def _append(self, content):
+        with open(self.log_path, "a", encoding="utf-8") as handle:
+            handle.write(content)
+
+    def test_incremental_polls_match_full_analysis(self):
+        received = []
+        follower = LogFollower(self.log_path, on_event=received.append)
+
+        for start in range(0, len(PRIOR_LOG), 37):
+            self._append(PRIOR_LOG[start:start + 37])
+            follower.poll()
+
+        events = [event["event"] for event in received if event["event"] != "metrics"]
+        self.assertEqual(["acquisition_started", "acquisition_stopped", "acquisition_started",
+                          "drift_fix", "acquisition_stopped"], events)
+        self.assertEqual(analyzeLogFile(self.log_path), received[-1]["analysis"])
+
+    def test_truncated_log_restarts_analysis(self):
+        self._append(PRIOR_LOG)
+        follower = LogFollower(self.log_path)
+        follower.poll()
+
+        with open(self.log_path, "w", encoding="utf-8") as handle:
+            handle.write(CUSTOM_FOCUS_LOG[:40] + "\n")
+        events = follower.poll()
+
+        self.assertEqual("log_reset", events[0]["event"])
+        self.assertEqual(0, events[-1]["analysis"]["total_measurements"])
+
+    def test_background_follow_stops_at_acquisition_end(self):
+        self._append(CUSTOM_FOCUS_LOG)
+        follower = LogFollower(self.log_path, poll_interval=0.01)
+
+        follower.start(stop_on_acquisition_end=True)
+        follower.stop(timeout=5)
+
+        self.assertEqual([3, 6], follower.analyzer.result()["values"])
+
+
+class TestClassifyLogLine(unittest.TestCase):
+    def test_classify_autofocus_events(self):
+        cases = {
+            '[12/03/2025 10:00:10] Going to well "B1"': ("well", "B1"),
+            "[AUTOFOCUS][FOCUS] Done after 4 loop(s)": ("done", "4"),
+            "[AUTOFOCUS][FOCUS] Time out after 5 loop(s)": ("timeout", "5"),
+            "[AUTOFOCUS][FOCUS] Adjusting focus, move: 6": ("move", "6"),
+            "[AUTOFOCUS][FOCUS] Still not in focus": ("still_not", "Still not"),
+            "[AUTOFOCUS][FOCUS] Focus not reached after 5 moves. Trying alternate commands": ("max_retry", "5"),
+            "[AUTOFOCUS][OFF] Done": ("autofocus_done", "Done"),
+            "Reference wells A1 A12 H12 re-aligned.": ("reference_aligned", "Reference wells A1 A12 H12 re-aligned"),
+        }
+        for line, expected in cases.items():
+            with self.subTest(line=line):
+                self.assertEqual(expected, classifyLogLine(line))
+
+    def test_classify_ignores_serial_chatter(self):
+        self.assertEqual((None, None), classifyLogLine("[SERIAL][IN] Done after 3 loop(s)"))
+        self.assertEqual((None, None), classifyLogLine("[AUTOFOCUS][FOCUS] Computing contrast"))
+
+
+class TestAnalyzeLogFilesBatch(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        os.makedirs(os.path.join(self.folder, "instrument_2"))
+        self.paths = [
+            os.path.join(self.folder, "a_prior.log"),
+            os.path.join(self.folder, "b_invalid.log"),
+            os.path.join(self.folder, "instrument_2", "c_custom.log"),
+        ]
+        with open(self.paths[0], "w", encoding="utf-8") as handle:
+            handle.write(PRIOR_LOG)
+        with open(self.paths[1], "wb") as handle:
+            handle.write(b"\xff\xfe Starting acquisition\n")
+        with open(self.paths[2], "w", encoding="utf-8") as handle:
+            handle.write(CUSTOM_FOCUS_LOG)
+
+    def test_find_log_files_walks_sub_folders(self):
+        self.assertEqual(self.paths, findLogFiles([self.folder]))
+        self.assertEqual(self.paths[:2], findLogFiles([self.folder], recursive=False))
+
+    def test_batch_reports_failures_without_stopping(self):
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers):
+                report = analyzeLogFilesBatch(self.paths, max_workers=max_workers)
+
+                self.assertEqual(self.paths, list(report["Fichier"]))
+                self.assertEqual([True, False, True], list(report["Succès"]))
+                self.assertIn("utf-8", report["Erreur"][1])
+                self.assertEqual(["prior", None, "custom_focus"],
+                                 [None if pd.isna(value) else value for value in report["Type d'acquisition"]])
+                self.assertTrue((report["Temps d'analyse (s)"] >= 0).all())
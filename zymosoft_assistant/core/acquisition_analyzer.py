@@ -11,36 +11,80 @@ import json
 import csv
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional, Union
 from pathlib import Path
 
+from zymosoft_assistant.core.figure_renderer import (RenderProfile, get_render_profile, new_figure, save_figure,
+                                                     style_context)
+from zymosoft_assistant.core.graph_cache import (GRAPH_CACHE_MAX_BYTES, GraphCache, GraphRequest, graph_cache_key,
+                                                 hash_arrays)
+from zymosoft_assistant.core.linear_fit import FitResult, fit_linear
+
 logger = logging.getLogger(__name__)
 
+# Style et profil de rendu par défaut des graphiques d'analyse (affichés dans la visionneuse de l'étape 3)
+GRAPH_STYLE = 'seaborn-v0_8-whitegrid'
+DEFAULT_GRAPH_PROFILE = 'screen'
+
+# Version des fonctions de tracé, dans la clé du cache de graphiques : à incrémenter quand un tracé change
+GRAPH_CACHE_VERSION = 2
+
+# Graphiques d'analyse, dans l'ordre de results["graphs"]
+GRAPH_NAMES = ('volume_vs_thickness', 'thickness_vs_volume', 'residuals_distribution')
+
+# Couleurs des droites de régression robustes sur le graphique Volume / Épaisseur
+ROBUST_FIT_COLORS = {'huber': '#dc3545', 'theil_sen': '#6f42c1'}
+
+# Colonnes lues dans les fichiers CSV de données d'acquisition (les autres colonnes ne sont pas parsées)
+REQUIRED_DATA_COLUMNS = ("Volume", "Epaisseur")
+
+# Statistiques retournées quand la régression ne peut pas être calculée
+EMPTY_STATISTICS = {
+    "slope": 0.0,
+    "intercept": 0.0,
+    "r2": 0.0,
+    "outliers_count": 0,
+    "outliers_percentage": 0.0
+}
+
+
 class AcquisitionAnalyzer:
     """
     Classe responsable de l'analyse des résultats d'acquisition
     et de la génération de graphiques
     """
 
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, render_workers: Optional[int] = None,
+                 robust_methods: Iterable[str] = (), graph_cache_max_bytes: int = GRAPH_CACHE_MAX_BYTES,
+                 graph_profile: Union[str, RenderProfile] = DEFAULT_GRAPH_PROFILE):
         """
         Initialise l'analyseur d'acquisition
 
         Args:
             output_dir: Répertoire de sortie pour les graphiques générés
                        (par défaut: dossier temporaire)
+            render_workers: Nombre de process pour le rendu des graphiques
+                            (par défaut: nombre de coeurs, 1 pour un rendu dans le process courant)
+            robust_methods: Régressions robustes calculées en plus des moindres carrés
+                            ('huber', 'theil_sen'), pour les plaques bruitées
+            graph_cache_max_bytes: Taille maximale du cache de graphiques (output_dir/graph_cache)
+            graph_profile: Profil de rendu des graphiques de results["graphs"] ('screen', 'report', 'vector')
         """
         self.output_dir = output_dir
+        self.render_workers = render_workers
+        self.robust_methods = tuple(robust_methods)
+        self.graph_profile = get_render_profile(graph_profile)
         if not self.output_dir:
             self.output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "temp")
 
         # Création du dossier de sortie s'il n'existe pas
         os.makedirs(self.output_dir, exist_ok=True)
+        self.graph_cache = GraphCache(os.path.join(self.output_dir, "graph_cache"), graph_cache_max_bytes)
 
         logger.info(f"Analyseur d'acquisition initialisé avec dossier de sortie: {self.output_dir}")
 
-    def analyze_results(self, results_folder: str, plate_type: str = None, acquisition_mode: str = None) -> Dict[str, Any]:
+    def analyze_results(self, results_folder: str, plate_type: str = None, acquisition_mode: str = None,
+                        lazy_graphs: bool = False) -> Dict[str, Any]:
         """
         Analyse les résultats d'acquisition dans le dossier spécifié
 
@@ -48,6 +92,7 @@ class AcquisitionAnalyzer:
             results_folder: Chemin vers le dossier contenant les résultats d'acquisition
             plate_type: Type de plaque (optionnel, détecté automatiquement si non fourni)
             acquisition_mode: Mode d'acquisition (optionnel, détecté automatiquement si non fourni)
+            lazy_graphs: Si True, les graphiques ne sont pas générés ici mais à la demande par get_graphs
 
         Returns:
             Dictionnaire avec les résultats d'analyse
@@ -79,20 +124,23 @@ class AcquisitionAnalyzer:
 
         # Chargement des données
         data = self._load_acquisition_data(results_folder)
-        if not data:
+        if data is None:
             results["valid"] = False
             results["errors"].append("Impossible de charger les données d'acquisition")
             return results
 
         results["data"] = data
 
+        # Régression calculée une seule fois, pour les statistiques et les graphiques
+        fit = self.fit_data(data)
+
         # Calcul des statistiques
-        statistics = self.calculate_statistics(data)
+        statistics = self.calculate_statistics(data, fit)
         results["statistics"] = statistics
 
         # Génération des graphiques
-        graph_paths = self.generate_graphs(data)
-        results["graphs"] = graph_paths
+        if not lazy_graphs:
+            results["graphs"] = self.generate_graphs(data, fit)
 
         return results
 
@@ -158,134 +206,180 @@ class AcquisitionAnalyzer:
         # Par défaut
         return "inconnu"
 
+    def _find_acquisition_data_files(self, results_folder: str) -> List[Path]:
+        """
+        Recherche les fichiers CSV de données d'acquisition du dossier de résultats
+
+        Seule la ligne d'en-tête de chaque CSV est lue : les exports qui ne contiennent pas
+        les colonnes REQUIRED_DATA_COLUMNS (détails par point, logs...) sont écartés sans être parsés.
+
+        Args:
+            results_folder: Chemin vers le dossier de résultats
+
+        Returns:
+            Fichiers de données, triés par nom (un fichier par area le cas échéant)
+        """
+        data_files = []
+        for csv_file in sorted(Path(results_folder).glob("*.csv")):
+            try:
+                columns = pd.read_csv(csv_file, sep=';', nrows=0).columns
+            except Exception as e:
+                logger.warning(f"En-tête illisible dans {csv_file}: {str(e)}")
+                continue
+
+            missing_columns = [col for col in REQUIRED_DATA_COLUMNS if col not in columns]
+            if missing_columns:
+                logger.debug(f"{csv_file.name} ignoré, colonnes manquantes: {missing_columns}")
+                continue
+            data_files.append(csv_file)
+
+        return data_files
+
     def _load_acquisition_data(self, results_folder: str) -> Optional[pd.DataFrame]:
         """
         Charge les données d'acquisition à partir du dossier de résultats
 
+        Seules les colonnes REQUIRED_DATA_COLUMNS sont lues. Quand le dossier contient plusieurs
+        fichiers de données (un par area), ils sont concaténés dans l'ordre de leurs noms.
+
         Args:
             results_folder: Chemin vers le dossier de résultats
 
         Returns:
             DataFrame pandas contenant les données ou None en cas d'erreur
         """
-        # Recherche des fichiers CSV dans le dossier
-        csv_files = list(Path(results_folder).glob("*.csv"))
-
-        if not csv_files:
+        if not any(Path(results_folder).glob("*.csv")):
             logger.error(f"Aucun fichier CSV trouvé dans {results_folder}")
             return None
 
-        # Utilisation du premier fichier CSV trouvé
-        # Dans une implémentation réelle, il faudrait une logique plus sophistiquée
-        # pour identifier le bon fichier de données
-        data_file = str(csv_files[0])
-        logger.info(f"Chargement des données depuis {data_file}")
+        data_files = self._find_acquisition_data_files(results_folder)
+        if not data_files:
+            logger.error(f"Colonnes manquantes dans les fichiers CSV de {results_folder}: "
+                         f"{list(REQUIRED_DATA_COLUMNS)} requises")
+            return None
 
         try:
-            # Lecture du fichier CSV
-            df = pd.read_csv(data_file, sep=';', decimal=',')
+            frames = []
+            for data_file in data_files:
+                logger.info(f"Chargement des données depuis {data_file}")
+                frames.append(pd.read_csv(data_file, sep=';', decimal=',', usecols=list(REQUIRED_DATA_COLUMNS),
+                                          dtype={col: 'float64' for col in REQUIRED_DATA_COLUMNS}, engine='c'))
+
+            if len(frames) == 1:
+                return frames[0]
+            return pd.concat(frames, ignore_index=True)
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement du fichier CSV: {str(e)}")
+            return None
 
-            # Vérification des colonnes minimales requises
-            required_columns = ["Volume", "Epaisseur"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
+    def fit_data(self, data: pd.DataFrame) -> Optional[FitResult]:
+        """
+        Régression linéaire du Volume en fonction de l'Épaisseur (et variantes robustes demandées)
 
-            if missing_columns:
-                logger.error(f"Colonnes manquantes dans le fichier CSV: {missing_columns}")
-                return None
+        Args:
+            data: DataFrame pandas contenant les données d'acquisition
 
-            return df
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement du fichier CSV: {str(e)}")
+        Returns:
+            Le résultat de la régression ou None si elle ne peut pas être calculée
+        """
+        if data is None or data.empty:
             return None
 
-    def calculate_statistics(self, data: pd.DataFrame) -> Dict[str, float]:
+        try:
+            return fit_linear(data["Epaisseur"].values, data["Volume"].values, self.robust_methods)
+        except ValueError as e:
+            logger.warning(f"Régression linéaire impossible: {str(e)}")
+        except Exception as e:
+            logger.error(f"Erreur lors du calcul de la régression linéaire: {str(e)}")
+        return None
+
+    def calculate_statistics(self, data: pd.DataFrame, fit: Optional[FitResult] = None) -> Dict[str, float]:
         """
         Calcule les statistiques à partir des données d'acquisition
 
         Args:
             data: DataFrame pandas contenant les données d'acquisition
+            fit: Régression déjà calculée par fit_data (calculée ici si None)
 
         Returns:
-            Dictionnaire avec les statistiques calculées
+            Dictionnaire avec les statistiques calculées. Pour chaque régression robuste,
+            les clés <méthode>_slope, <méthode>_intercept, <méthode>_r2 et <méthode>_outliers_count
+            sont ajoutées.
         """
         if data is None or data.empty:
             logger.error("Impossible de calculer les statistiques: données manquantes ou vides")
-            return {
-                "slope": 0.0,
-                "intercept": 0.0,
-                "r2": 0.0,
-                "outliers_count": 0,
-                "outliers_percentage": 0.0
-            }
+            return dict(EMPTY_STATISTICS)
 
-        statistics = {}
+        if fit is None:
+            fit = self.fit_data(data)
+        if fit is None:
+            return dict(EMPTY_STATISTICS)
 
-        try:
-            # Calcul de la régression linéaire (Volume en fonction de l'épaisseur)
-            x = data["Epaisseur"].values
-            y = data["Volume"].values
-
-            # Suppression des valeurs NaN
-            mask = ~np.isnan(x) & ~np.isnan(y)
-            x = x[mask]
-            y = y[mask]
-
-            if len(x) < 2:
-                logger.warning("Pas assez de données pour calculer une régression linéaire")
-                return {
-                    "slope": 0.0,
-                    "intercept": 0.0,
-                    "r2": 0.0,
-                    "outliers_count": 0,
-                    "outliers_percentage": 0.0
-                }
-
-            # Calcul de la régression linéaire
-            slope, intercept = np.polyfit(x, y, 1)
-
-            # Calcul du coefficient de détermination R²
-            y_pred = slope * x + intercept
-            ss_tot = np.sum((y - np.mean(y)) ** 2)
-            ss_res = np.sum((y - y_pred) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-
-            # Détection des valeurs aberrantes (outliers)
-            # Considère comme aberrant un point dont l'écart à la droite de régression
-            # est supérieur à 2 fois l'écart-type des résidus
-            residuals = y - y_pred
-            residual_std = np.std(residuals)
-            outliers_mask = np.abs(residuals) > 2 * residual_std
-            outliers_count = np.sum(outliers_mask)
-            outliers_percentage = (outliers_count / len(x)) * 100
-
-            statistics = {
-                "slope": slope,
-                "intercept": intercept,
-                "r2": r2,
-                "outliers_count": int(outliers_count),
-                "outliers_percentage": outliers_percentage
-            }
+        # Valeurs aberrantes : écart à la droite de régression supérieur à 2 fois l'écart-type des résidus
+        statistics = fit.to_statistics()
+        for method, robust_fit in fit.robust.items():
+            statistics[f"{method}_slope"] = robust_fit.slope
+            statistics[f"{method}_intercept"] = robust_fit.intercept
+            statistics[f"{method}_r2"] = robust_fit.r2
+            statistics[f"{method}_outliers_count"] = robust_fit.outliers_count
 
-            logger.info(f"Statistiques calculées: pente={slope:.4f}, R²={r2:.4f}, "
-                       f"outliers={outliers_count}/{len(x)} ({outliers_percentage:.2f}%)")
+        logger.info(f"Statistiques calculées: pente={fit.slope:.4f}, R²={fit.r2:.4f}, "
+                   f"outliers={fit.outliers_count}/{fit.n_points} ({fit.outliers_percentage:.2f}%)")
 
-            return statistics
-        except Exception as e:
-            logger.error(f"Erreur lors du calcul des statistiques: {str(e)}")
-            return {
-                "slope": 0.0,
-                "intercept": 0.0,
-                "r2": 0.0,
-                "outliers_count": 0,
-                "outliers_percentage": 0.0
-            }
+        return statistics
 
-    def generate_graphs(self, data: pd.DataFrame) -> List[str]:
+    def get_graphs(self, results: Dict[str, Any], profile: Union[str, RenderProfile, None] = None) -> List[str]:
+        """
+        Graphiques d'une analyse, générés à la demande (analyse faite avec lazy_graphs=True ou
+        images supprimées depuis)
+
+        Les données sont celles de results["data"] (DataFrame, ou enregistrements d'une session
+        sauvegardée), rechargées depuis results["folder"] à défaut. Les images déjà rendues pour les mêmes
+        données sont reprises du cache sans nouveau tracé.
+
+        Args:
+            results: Résultats retournés par analyze_results, results["graphs"] est mis à jour
+                     pour le profil de l'analyseur
+            profile: Profil de rendu (par défaut: self.graph_profile), par exemple 'report' pour un rapport PDF
+
+        Returns:
+            Liste des chemins vers les graphiques
+        """
+        profile = get_render_profile(profile) or self.graph_profile
+        if profile.params() != self.graph_profile.params():
+            return self.generate_graphs(self._results_data(results), profile=profile)
+
+        graph_paths = results.get("graphs") or []
+        if graph_paths and all(os.path.exists(path) for path in graph_paths):
+            return graph_paths
+
+        results["graphs"] = self.generate_graphs(self._results_data(results))
+        return results["graphs"]
+
+    def _results_data(self, results: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """Données d'acquisition d'un résultat d'analyse (rechargées depuis le dossier si absentes)"""
+        data = results.get("data")
+        if data is not None and not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data)
+        if data is None and results.get("folder"):
+            data = self._load_acquisition_data(results["folder"])
+        return data
+
+    def generate_graphs(self, data: pd.DataFrame, fit: Optional[FitResult] = None,
+                        profile: Union[str, RenderProfile, None] = None) -> List[str]:
         """
         Génère des graphiques à partir des données d'acquisition
 
+        Les images sont rangées dans le cache de graphiques sous une clé dérivée du hash des données
+        et des paramètres de tracé : des données déjà tracées ne sont pas rendues à nouveau, et deux
+        analyses différentes n'écrivent jamais dans les mêmes fichiers. Les figures manquantes sont
+        tracées avec l'API objet de matplotlib et rendues en parallèle dans la pool de process de
+        render_figures (self.render_workers process).
+
         Args:
             data: DataFrame pandas contenant les données d'acquisition
+            fit: Régression déjà calculée par fit_data à partir de data (calculée ici si nécessaire)
+            profile: Profil de rendu (par défaut: self.graph_profile)
 
         Returns:
             Liste des chemins vers les graphiques générés
@@ -294,128 +388,136 @@ class AcquisitionAnalyzer:
             logger.error("Impossible de générer des graphiques: données manquantes ou vides")
             return []
 
-        graph_paths = []
-
         try:
-            # Configuration du style des graphiques
-            plt.style.use('seaborn-v0_8-whitegrid')
-
-            # 1. Graphique Volume en fonction de l'Épaisseur
-            fig1, ax1 = plt.subplots(figsize=(10, 6))
-
-            # Données pour la régression linéaire
-            x = data["Epaisseur"].values
-            y = data["Volume"].values
-
-            # Suppression des valeurs NaN
-            mask = ~np.isnan(x) & ~np.isnan(y)
-            x = x[mask]
-            y = y[mask]
-
-            # Calcul de la régression linéaire
-            slope, intercept = np.polyfit(x, y, 1)
-
-            # Tracé des points
-            ax1.scatter(x, y, color='#009967', alpha=0.7, label='Mesures')
-
-            # Tracé de la droite de régression
-            x_line = np.linspace(min(x), max(x), 100)
-            y_line = slope * x_line + intercept
-            ax1.plot(x_line, y_line, color='#007d54', linestyle='-', linewidth=2,
-                    label=f'Régression: y = {slope:.4f}x + {intercept:.4f}')
-
-            # Calcul du R²
-            y_pred = slope * x + intercept
-            ss_tot = np.sum((y - np.mean(y)) ** 2)
-            ss_res = np.sum((y - y_pred) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-
-            # Ajout du R² au graphique
-            ax1.text(0.05, 0.95, f'R² = {r2:.4f}', transform=ax1.transAxes,
-                    fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-            # Configuration du graphique
-            ax1.set_title('Volume en fonction de l\'Épaisseur', fontsize=14)
-            ax1.set_xlabel('Épaisseur (µm)', fontsize=12)
-            ax1.set_ylabel('Volume (nL)', fontsize=12)
-            ax1.grid(True, linestyle='--', alpha=0.7)
-            ax1.legend(loc='lower right')
-
-            # Sauvegarde du graphique
-            volume_vs_thickness_path = os.path.join(self.output_dir, 'volume_vs_thickness.png')
-            fig1.savefig(volume_vs_thickness_path, dpi=300, bbox_inches='tight')
-            plt.close(fig1)
-
-            graph_paths.append(volume_vs_thickness_path)
-            logger.info(f"Graphique généré: {volume_vs_thickness_path}")
-
-            # 2. Graphique Épaisseur en fonction du Volume
-            fig2, ax2 = plt.subplots(figsize=(10, 6))
-
-            # Tracé des points
-            ax2.scatter(y, x, color='#17a2b8', alpha=0.7, label='Mesures')
-
-            # Calcul de la régression linéaire (inverse)
-            slope_inv, intercept_inv = np.polyfit(y, x, 1)
-
-            # Tracé de la droite de régression
-            y_line = np.linspace(min(y), max(y), 100)
-            x_line = slope_inv * y_line + intercept_inv
-            ax2.plot(y_line, x_line, color='#0c7b8a', linestyle='-', linewidth=2,
-                    label=f'Régression: y = {slope_inv:.4f}x + {intercept_inv:.4f}')
-
-            # Calcul du R² (inverse)
-            x_pred = slope_inv * y + intercept_inv
-            ss_tot_inv = np.sum((x - np.mean(x)) ** 2)
-            ss_res_inv = np.sum((x - x_pred) ** 2)
-            r2_inv = 1 - (ss_res_inv / ss_tot_inv)
-
-            # Ajout du R² au graphique
-            ax2.text(0.05, 0.95, f'R² = {r2_inv:.4f}', transform=ax2.transAxes,
-                    fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-            # Configuration du graphique
-            ax2.set_title('Épaisseur en fonction du Volume', fontsize=14)
-            ax2.set_xlabel('Volume (nL)', fontsize=12)
-            ax2.set_ylabel('Épaisseur (µm)', fontsize=12)
-            ax2.grid(True, linestyle='--', alpha=0.7)
-            ax2.legend(loc='lower right')
-
-            # Sauvegarde du graphique
-            thickness_vs_volume_path = os.path.join(self.output_dir, 'thickness_vs_volume.png')
-            fig2.savefig(thickness_vs_volume_path, dpi=300, bbox_inches='tight')
-            plt.close(fig2)
-
-            graph_paths.append(thickness_vs_volume_path)
-            logger.info(f"Graphique généré: {thickness_vs_volume_path}")
-
-            # 3. Graphique de distribution des résidus
-            fig3, ax3 = plt.subplots(figsize=(10, 6))
-
-            # Calcul des résidus
-            residuals = y - y_pred
-
-            # Tracé de l'histogramme des résidus
-            ax3.hist(residuals, bins=20, color='#ffc107', alpha=0.7, edgecolor='black')
-
-            # Ajout d'une ligne verticale à zéro
-            ax3.axvline(x=0, color='#dc3545', linestyle='--', linewidth=2)
-
-            # Configuration du graphique
-            ax3.set_title('Distribution des Résidus', fontsize=14)
-            ax3.set_xlabel('Résidu (Volume observé - Volume prédit)', fontsize=12)
-            ax3.set_ylabel('Fréquence', fontsize=12)
-            ax3.grid(True, linestyle='--', alpha=0.7)
-
-            # Sauvegarde du graphique
-            residuals_path = os.path.join(self.output_dir, 'residuals_distribution.png')
-            fig3.savefig(residuals_path, dpi=300, bbox_inches='tight')
-            plt.close(fig3)
-
-            graph_paths.append(residuals_path)
-            logger.info(f"Graphique généré: {residuals_path}")
+            profile = get_render_profile(profile) or self.graph_profile
+            data_hash = hash_arrays(data["Epaisseur"].values, data["Volume"].values)
+            params = {"version": GRAPH_CACHE_VERSION, "style": GRAPH_STYLE, "profile": profile.params(),
+                      "robust_methods": self.robust_methods}
+            keys = {name: graph_cache_key(name, data_hash, params) for name in GRAPH_NAMES}
+            filenames = {name: name + profile.extension for name in GRAPH_NAMES}
+
+            cached_paths = [self.graph_cache.get(keys[name], filenames[name]) for name in GRAPH_NAMES]
+            if all(cached_paths):
+                logger.info(f"Graphiques repris du cache: {cached_paths}")
+                return cached_paths
+
+            if fit is None:
+                fit = self.fit_data(data)
+            if fit is None:
+                logger.error("Impossible de générer des graphiques: régression linéaire impossible")
+                return []
+
+            # 2. Épaisseur en fonction du Volume : régression inverse, à partir des sommes de la régression
+            fit_inv = fit.inverse()
+            robust_lines = {method: (robust_fit.slope, robust_fit.intercept)
+                            for method, robust_fit in fit.robust.items()}
+
+            graph_requests = [
+                GraphRequest(keys['volume_vs_thickness'], filenames['volume_vs_thickness'],
+                             _plot_volume_vs_thickness, x=fit.x, y=fit.y, slope=fit.slope, intercept=fit.intercept,
+                             r2=fit.r2, robust_lines=robust_lines, profile=profile),
+                GraphRequest(keys['thickness_vs_volume'], filenames['thickness_vs_volume'],
+                             _plot_thickness_vs_volume, x=fit.x, y=fit.y, slope_inv=fit_inv.slope,
+                             intercept_inv=fit_inv.intercept, r2_inv=fit_inv.r2, profile=profile),
+                GraphRequest(keys['residuals_distribution'], filenames['residuals_distribution'],
+                             _plot_residuals, residuals=fit.residuals, profile=profile),
+            ]
+            graph_paths = self.graph_cache.get_or_render(graph_requests, self.render_workers)
+
+            for graph_path in graph_paths:
+                logger.info(f"Graphique généré: {graph_path}")
 
             return graph_paths
         except Exception as e:
             logger.error(f"Erreur lors de la génération des graphiques: {str(e)}")
-            return graph_paths
+            return []
+
+
+def _plot_volume_vs_thickness(x: np.ndarray, y: np.ndarray, slope: float, intercept: float, r2: float,
+                              path: str, robust_lines: Optional[Dict[str, Tuple[float, float]]] = None,
+                              profile: Union[str, RenderProfile] = DEFAULT_GRAPH_PROFILE) -> str:
+    """Graphique Volume en fonction de l'Épaisseur avec la droite de régression (et les droites robustes)"""
+    with style_context(GRAPH_STYLE):
+        fig = new_figure(figsize=(10, 6))
+        ax1 = fig.add_subplot()
+
+        # Tracé des points
+        ax1.scatter(x, y, color='#009967', alpha=0.7, label='Mesures')
+
+        # Tracé de la droite de régression
+        x_line = np.linspace(min(x), max(x), 100)
+        y_line = slope * x_line + intercept
+        ax1.plot(x_line, y_line, color='#007d54', linestyle='-', linewidth=2,
+                label=f'Régression: y = {slope:.4f}x + {intercept:.4f}')
+        for method, (robust_slope, robust_intercept) in (robust_lines or {}).items():
+            ax1.plot(x_line, robust_slope * x_line + robust_intercept, color=ROBUST_FIT_COLORS.get(method, 'gray'),
+                     linestyle='--', linewidth=1.5,
+                     label=f'{method}: y = {robust_slope:.4f}x + {robust_intercept:.4f}')
+
+        # Ajout du R² au graphique
+        ax1.text(0.05, 0.95, f'R² = {r2:.4f}', transform=ax1.transAxes,
+                fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+        # Configuration du graphique
+        ax1.set_title('Volume en fonction de l\'Épaisseur', fontsize=14)
+        ax1.set_xlabel('Épaisseur (µm)', fontsize=12)
+        ax1.set_ylabel('Volume (nL)', fontsize=12)
+        ax1.grid(True, linestyle='--', alpha=0.7)
+        ax1.legend(loc='lower right')
+
+        path = save_figure(fig, path, profile, bbox_inches='tight')
+    return path
+
+
+def _plot_thickness_vs_volume(x: np.ndarray, y: np.ndarray, slope_inv: float, intercept_inv: float, r2_inv: float,
+                              path: str, profile: Union[str, RenderProfile] = DEFAULT_GRAPH_PROFILE) -> str:
+    """Graphique Épaisseur en fonction du Volume avec la droite de régression inverse"""
+    with style_context(GRAPH_STYLE):
+        fig = new_figure(figsize=(10, 6))
+        ax2 = fig.add_subplot()
+
+        # Tracé des points
+        ax2.scatter(y, x, color='#17a2b8', alpha=0.7, label='Mesures')
+
+        # Tracé de la droite de régression
+        y_line = np.linspace(min(y), max(y), 100)
+        x_line = slope_inv * y_line + intercept_inv
+        ax2.plot(y_line, x_line, color='#0c7b8a', linestyle='-', linewidth=2,
+                label=f'Régression: y = {slope_inv:.4f}x + {intercept_inv:.4f}')
+
+        # Ajout du R² au graphique
+        ax2.text(0.05, 0.95, f'R² = {r2_inv:.4f}', transform=ax2.transAxes,
+                fontsize=12, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+        # Configuration du graphique
+        ax2.set_title('Épaisseur en fonction du Volume', fontsize=14)
+        ax2.set_xlabel('Volume (nL)', fontsize=12)
+        ax2.set_ylabel('Épaisseur (µm)', fontsize=12)
+        ax2.grid(True, linestyle='--', alpha=0.7)
+        ax2.legend(loc='lower right')
+
+        path = save_figure(fig, path, profile, bbox_inches='tight')
+    return path
+
+
+def _plot_residuals(residuals: np.ndarray, path: str,
+                    profile: Union[str, RenderProfile] = DEFAULT_GRAPH_PROFILE) -> str:
+    """Histogramme des résidus de la régression Volume / Épaisseur"""
+    with style_context(GRAPH_STYLE):
+        fig = new_figure(figsize=(10, 6))
+        ax3 = fig.add_subplot()
+
+        # Tracé de l'histogramme des résidus
+        ax3.hist(residuals, bins=20, color='#ffc107', alpha=0.7, edgecolor='black')
+
+        # Ajout d'une ligne verticale à zéro
+        ax3.axvline(x=0, color='#dc3545', linestyle='--', linewidth=2)
+
+        # Configuration du graphique
+        ax3.set_title('Distribution des Résidus', fontsize=14)
+        ax3.set_xlabel('Résidu (Volume observé - Volume prédit)', fontsize=12)
+        ax3.set_ylabel('Fréquence', fontsize=12)
+        ax3.grid(True, linestyle='--', alpha=0.7)
+
+        path = save_figure(fig, path, profile, bbox_inches='tight')
+    return path
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Service de rendu des figures (API objet Figure/Agg de matplotlib, sans état global pyplot)
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from matplotlib import style as mpl_style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+
+def new_figure(figsize=None, **kwargs) -> Figure:
+    """
+    Crée une figure rattachée à un canvas Agg, indépendante de pyplot
+
+    Contrairement à plt.figure, la figure n'est enregistrée nulle part : elle n'a pas besoin
+    d'être fermée et peut être créée dans un thread ou un process de rendu.
+
+    Args:
+        figsize: Taille (largeur, hauteur) en pouces, rcParams par défaut si None
+        **kwargs: Arguments supplémentaires de matplotlib.figure.Figure
+
+    Returns:
+        La figure créée
+    """
+    figure = Figure(figsize=figsize, **kwargs)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def style_context(style: Optional[str]):
+    """Contexte de style matplotlib (sans effet si style vaut None), sans modifier les rcParams globaux"""
+    return mpl_style.context(style) if style else nullcontext()
+
+
+class RenderProfile:
+    """
+    Format de sortie d'une figure pour un usage donné : résolution, format de fichier et
+    éventuellement taille imposée (en pouces) pour correspondre à la place occupée dans le document
+    """
+
+    def __init__(self, name: str, dpi: int, fmt: str = 'png', figsize: Optional[Tuple[float, float]] = None):
+        self.name = name
+        self.dpi = dpi
+        self.fmt = fmt
+        self.figsize = figsize
+
+    @property
+    def extension(self) -> str:
+        return '.' + self.fmt
+
+    def output_path(self, path: str) -> str:
+        """Chemin path avec l'extension du format du profil"""
+        return os.path.splitext(path)[0] + self.extension
+
+    def params(self) -> Dict[str, Any]:
+        return {"name": self.name, "dpi": self.dpi, "fmt": self.fmt, "figsize": self.figsize}
+
+    def __repr__(self):
+        return f"RenderProfile({self.name}, dpi={self.dpi}, fmt={self.fmt}, figsize={self.figsize})"
+
+
+# Profils de rendu :
+#   'screen' : aperçu dans la visionneuse de l'étape 3 (image redimensionnée par QPixmap, ~800 px de large)
+#   'report' : raster à la largeur utile des rapports PDF (7 pouces), résolution d'impression
+#   'vector' : SVG, pour les rapports HTML et les exports
+RENDER_PROFILES = {
+    'screen': RenderProfile('screen', dpi=100),
+    'report': RenderProfile('report', dpi=200, figsize=(7.0, 4.2)),
+    'vector': RenderProfile('vector', dpi=72, fmt='svg'),
+}
+
+
+def get_render_profile(profile: Union[str, RenderProfile, None]) -> Optional[RenderProfile]:
+    """Profil de rendu à partir de son nom (ou le profil lui-même, None si None)"""
+    if profile is None or isinstance(profile, RenderProfile):
+        return profile
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"Profil de rendu inconnu: {profile} (profils disponibles: {list(RENDER_PROFILES)})")
+    return RENDER_PROFILES[profile]
+
+
+def save_figure(figure: Figure, path: str, profile: Union[str, RenderProfile, None] = None, **kwargs) -> str:
+    """
+    Sauve une figure selon un profil de rendu
+
+    Sans profil, la figure est sauvée telle quelle dans path. Avec un profil, la taille, la résolution
+    et le format du profil sont appliqués et l'extension de path est remplacée par celle du format.
+
+    Args:
+        figure: Figure à sauver
+        path: Chemin du fichier
+        profile: Profil de rendu (nom ou RenderProfile)
+        **kwargs: Arguments supplémentaires de Figure.savefig
+
+    Returns:
+        Le chemin du fichier écrit
+    """
+    profile = get_render_profile(profile)
+    if profile is not None:
+        if profile.figsize:
+            figure.set_size_inches(profile.figsize)
+        path = profile.output_path(path)
+        kwargs.update(dpi=profile.dpi, format=profile.fmt)
+    figure.savefig(path, **kwargs)
+    return path
+
+
+class PlotSpec:
+    """
+    Figure à tracer plus tard : une fonction de tracé et ses arguments
+
+    La fonction doit être définie au niveau d'un module et les arguments être des données
+    (arrays, listes, chaînes, chemins) : un PlotSpec se pickle et peut être rendu dans un
+    process de la pool de rendu.
+    """
+
+    def __init__(self, function, **kwargs):
+        self.function = function
+        self.kwargs = kwargs
+
+    def render(self) -> Any:
+        return self.function(**self.kwargs)
+
+    def __repr__(self):
+        return f"PlotSpec({self.function.__name__})"
+
+
+def with_render_profile(plot_specs: Iterable[PlotSpec], profile: Union[str, RenderProfile]) -> List[PlotSpec]:
+    """
+    Copies de PlotSpec (fonctions de tracé acceptant un argument profile) rendues avec un profil donné,
+    par exemple les figures retournées par une routine de validation appelée avec render='deferred'
+    """
+    profile = get_render_profile(profile)
+    return [PlotSpec(plot_spec.function, **dict(plot_spec.kwargs, profile=profile)) for plot_spec in plot_specs]
+
+
+def _render_plot_spec(plot_spec: PlotSpec) -> Any:
+    return plot_spec.render()
+
+
+def render_figures(plot_specs: Iterable[PlotSpec], workers: Optional[int] = None) -> List[Any]:
+    """
+    Rend une liste de figures, en parallèle dans une pool de process si possible
+
+    Chaque figure est tracée avec l'API objet (new_figure), donc les workers ne partagent
+    aucun état pyplot.
+
+    Args:
+        plot_specs: Figures à rendre
+        workers: Nombre de process de rendu (par défaut: nombre de coeurs).
+                 Avec 1 worker ou une seule figure, le rendu se fait dans le process courant.
+
+    Returns:
+        Les valeurs retournées par les fonctions de tracé, dans l'ordre des plot_specs
+    """
+    plot_specs = list(plot_specs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(plot_specs))
+
+    if workers <= 1:
+        return [plot_spec.render() for plot_spec in plot_specs]
+
+    logger.debug(f"Rendu de {len(plot_specs)} figures sur {workers} process")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_plot_spec, plot_specs))
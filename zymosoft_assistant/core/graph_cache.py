@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache disque des graphiques, adressé par le contenu (hash des données et des paramètres de tracé)
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from zymosoft_assistant.core.figure_renderer import PlotSpec, render_figures
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale du cache de graphiques, au-delà les entrées les moins récemment utilisées sont supprimées
+GRAPH_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+def hash_arrays(*arrays) -> str:
+    """Hash (sha256) du contenu d'arrays numériques, indépendant de leur disposition mémoire"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=float)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def graph_cache_key(name: str, data_hash: str, params: Dict[str, Any]) -> str:
+    """Clé d'un graphique : son nom, le hash des données tracées et les paramètres de tracé"""
+    description = repr((name, data_hash, sorted(params.items())))
+    return hashlib.sha256(description.encode()).hexdigest()[:32]
+
+
+class GraphRequest:
+    """
+    Graphique demandé au cache : clé, nom du fichier image et fonction de tracé
+
+    La fonction de tracé reçoit ses kwargs et le chemin du fichier à écrire (argument path),
+    elle n'est appelée que si le graphique n'est pas déjà dans le cache.
+    """
+
+    def __init__(self, key: str, filename: str, function, **kwargs):
+        self.key = key
+        self.filename = filename
+        self.function = function
+        self.kwargs = kwargs
+
+
+class GraphCache:
+    """
+    Graphiques rendus, rangés dans cache_dir/<clé>/<fichier>
+
+    Deux analyses des mêmes données avec les mêmes paramètres partagent les mêmes images,
+    deux analyses différentes n'écrivent jamais dans le même dossier. Les images sont rendues dans
+    un dossier temporaire puis déplacées d'un bloc : une entrée du cache est toujours complète.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = GRAPH_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, key: str, filename: str) -> str:
+        return os.path.join(self.cache_dir, key, filename)
+
+    def get(self, key: str, filename: str) -> Optional[str]:
+        """Chemin de l'image en cache (et marque l'entrée comme récemment utilisée), None si absente"""
+        path = self.path(key, filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(os.path.join(self.cache_dir, key))
+        except OSError:
+            pass
+        return path
+
+    def get_or_render(self, requests: Sequence[GraphRequest], workers: Optional[int] = None) -> List[str]:
+        """
+        Chemins des images demandées, en rendant (dans la pool de render_figures) celles absentes du cache
+
+        Args:
+            requests: Graphiques demandés
+            workers: Nombre de process de rendu
+
+        Returns:
+            Les chemins des images, dans l'ordre des requests
+        """
+        paths = [self.get(request.key, request.filename) for request in requests]
+        missing = [request for request, path in zip(requests, paths) if path is None]
+        if not missing:
+            logger.debug(f"{len(requests)} graphique(s) trouvé(s) dans le cache")
+            return paths
+
+        # Rendu dans un dossier temporaire propre à cet appel
+        temp_dir = os.path.join(self.cache_dir, f".{uuid.uuid4().hex}.tmp")
+        os.makedirs(temp_dir)
+        try:
+            plot_specs = []
+            for index, request in enumerate(missing):
+                request_dir = os.path.join(temp_dir, str(index))
+                os.makedirs(request_dir)
+                plot_specs.append(PlotSpec(request.function, path=os.path.join(request_dir, request.filename),
+                                           **request.kwargs))
+            render_figures(plot_specs, workers)
+
+            for index, request in enumerate(missing):
+                try:
+                    os.replace(os.path.join(temp_dir, str(index)), os.path.join(self.cache_dir, request.key))
+                except OSError:
+                    # Entrée écrite entre temps par une autre analyse des mêmes données
+                    logger.debug(f"Entrée {request.key} déjà présente dans le cache")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.evict(keep={request.key for request in requests})
+        return [self.path(request.key, request.filename) for request in requests]
+
+    def evict(self, keep=()):
+        """
+        Supprime les entrées les moins récemment utilisées tant que le cache dépasse max_bytes
+
+        Args:
+            keep: Clés à ne pas supprimer (images qui viennent d'être demandées)
+        """
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.is_dir() or entry.name.startswith('.'):
+                    continue
+                size = sum(os.path.getsize(os.path.join(entry.path, name)) for name in os.listdir(entry.path))
+                entries.append((entry.stat().st_mtime, entry.name, size))
+                total_bytes += size
+
+        for _, key, size in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if key in keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            total_bytes -= size
+            logger.debug(f"Entrée {key} supprimée du cache de graphiques")
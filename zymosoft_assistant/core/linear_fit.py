@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Régression linéaire des données d'acquisition (moindres carrés et variantes robustes)
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from scipy import stats
+
+logger = logging.getLogger(__name__)
+
+# Méthodes de régression robustes disponibles en plus des moindres carrés
+ROBUST_METHODS = ('huber', 'theil_sen')
+
+# Constante de Huber (95% d'efficacité pour des résidus gaussiens) et itérations maximales de l'IRLS
+HUBER_EPSILON = 1.345
+HUBER_MAX_ITERATIONS = 50
+
+# Seuil de détection des valeurs aberrantes, en nombre d'écarts-types des résidus
+OUTLIER_THRESHOLD = 2
+
+
+class FitResult:
+    """
+    Résultat d'une régression y = slope * x + intercept
+
+    Porte les points utilisés (x, y sans NaN), les résidus et le masque des valeurs aberrantes,
+    ainsi que les sommes centrées (sxx, syy, sxy) qui permettent d'obtenir la régression inverse
+    (x en fonction de y) sans refaire de calcul sur les points.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, slope: float, intercept: float, method: str = 'ols',
+                 sums: Optional[Dict[str, float]] = None):
+        self.x = x
+        self.y = y
+        self.slope = float(slope)
+        self.intercept = float(intercept)
+        self.method = method
+        self.sums = sums if sums is not None else _centered_sums(x, y)
+        self.residuals = y - (self.slope * x + self.intercept)
+
+        ss_tot = self.sums["syy"]
+        ss_res = float(np.dot(self.residuals, self.residuals))
+        self.r2 = 1 - ss_res / ss_tot if ss_tot else float('nan')
+
+        # Les moindres carrés gardent l'écart-type des résidus, les régressions robustes une
+        # échelle robuste (MAD) pour que les points aberrants ne gonflent pas le seuil
+        if method == 'ols':
+            residual_scale = np.std(self.residuals)
+        else:
+            residual_scale = _mad_scale(self.residuals)
+        self.outliers_mask = np.abs(self.residuals) > OUTLIER_THRESHOLD * residual_scale
+
+        # Variantes robustes calculées sur les mêmes points (voir fit_linear)
+        self.robust: Dict[str, "FitResult"] = {}
+
+    @property
+    def n_points(self) -> int:
+        return len(self.x)
+
+    @property
+    def outliers_count(self) -> int:
+        return int(np.count_nonzero(self.outliers_mask))
+
+    @property
+    def outliers_percentage(self) -> float:
+        return self.outliers_count / self.n_points * 100
+
+    def predict(self, x) -> np.ndarray:
+        return self.slope * np.asarray(x, dtype=float) + self.intercept
+
+    def inverse(self) -> "FitResult":
+        """
+        Régression des moindres carrés de x en fonction de y, à partir des sommes déjà calculées
+        """
+        sums = self.sums
+        if not sums["syy"]:
+            raise ValueError("Régression inverse impossible: toutes les valeurs de y sont identiques")
+        slope = sums["sxy"] / sums["syy"]
+        intercept = sums["mean_x"] - slope * sums["mean_y"]
+        inverse_sums = {"mean_x": sums["mean_y"], "mean_y": sums["mean_x"],
+                        "sxx": sums["syy"], "syy": sums["sxx"], "sxy": sums["sxy"]}
+        return FitResult(self.y, self.x, slope, intercept, sums=inverse_sums)
+
+    def to_statistics(self) -> Dict[str, float]:
+        """Statistiques au format de AcquisitionAnalyzer.calculate_statistics"""
+        return {
+            "slope": self.slope,
+            "intercept": self.intercept,
+            "r2": self.r2,
+            "outliers_count": self.outliers_count,
+            "outliers_percentage": self.outliers_percentage
+        }
+
+    def __repr__(self):
+        return (f"FitResult({self.method}, slope={self.slope:.4g}, intercept={self.intercept:.4g}, "
+                f"r2={self.r2:.4f}, n={self.n_points})")
+
+
+def _centered_sums(x: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    mean_x = float(np.mean(x))
+    mean_y = float(np.mean(y))
+    dx = x - mean_x
+    dy = y - mean_y
+    return {"mean_x": mean_x, "mean_y": mean_y,
+            "sxx": float(np.dot(dx, dx)), "syy": float(np.dot(dy, dy)), "sxy": float(np.dot(dx, dy))}
+
+
+def _mad_scale(residuals: np.ndarray) -> float:
+    """Écart-type estimé par la déviation absolue médiane (cohérent pour des résidus gaussiens)"""
+    return 1.4826 * float(np.median(np.abs(residuals - np.median(residuals))))
+
+
+def _huber_fit(x: np.ndarray, y: np.ndarray, slope: float, intercept: float, tol: float = 1e-10):
+    """
+    Régression de Huber par moindres carrés repondérés (IRLS), partant de la solution des moindres carrés.
+    L'échelle des résidus est réestimée (MAD) à chaque itération.
+    """
+    for _ in range(HUBER_MAX_ITERATIONS):
+        residuals = y - (slope * x + intercept)
+        scale = _mad_scale(residuals)
+        if scale == 0:
+            break
+        abs_residuals = np.abs(residuals)
+        weights = np.where(abs_residuals <= HUBER_EPSILON * scale, 1.0,
+                           HUBER_EPSILON * scale / np.maximum(abs_residuals, np.finfo(float).tiny))
+
+        sum_w = weights.sum()
+        mean_x = np.dot(weights, x) / sum_w
+        mean_y = np.dot(weights, y) / sum_w
+        dx = x - mean_x
+        sxx = np.dot(weights, dx * dx)
+        if sxx == 0:
+            break
+        new_slope = np.dot(weights, dx * (y - mean_y)) / sxx
+        new_intercept = mean_y - new_slope * mean_x
+
+        converged = (abs(new_slope - slope) <= tol * max(1.0, abs(slope))
+                     and abs(new_intercept - intercept) <= tol * max(1.0, abs(intercept)))
+        slope, intercept = new_slope, new_intercept
+        if converged:
+            break
+    return slope, intercept
+
+
+def _theil_sen_fit(x: np.ndarray, y: np.ndarray):
+    """
+    Régression de Theil-Sen : médiane des pentes entre toutes les paires de points,
+    ordonnée à l'origine médiane des y - slope * x
+    """
+    slope, intercept, _, _ = stats.theilslopes(y, x, method='joint')
+    return slope, intercept
+
+
+def fit_linear(x, y, robust: Iterable[str] = ()) -> FitResult:
+    """
+    Régression linéaire des moindres carrés de y en fonction de x, par sommes centrées
+    (sans matrice de Vandermonde), en ignorant les points où x ou y vaut NaN
+
+    Args:
+        x: Abscisses
+        y: Ordonnées
+        robust: Variantes robustes à calculer en plus ('huber', 'theil_sen'),
+                disponibles dans FitResult.robust
+
+    Returns:
+        Le résultat de la régression
+
+    Raises:
+        ValueError: Moins de 2 points valides, x constant ou méthode robuste inconnue
+    """
+    robust = list(robust)
+    unknown_methods = [method for method in robust if method not in ROBUST_METHODS]
+    if unknown_methods:
+        raise ValueError(f"Méthodes de régression robustes inconnues: {unknown_methods} "
+                         f"(méthodes disponibles: {list(ROBUST_METHODS)})")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    x = x[mask]
+    y = y[mask]
+    if len(x) < 2:
+        raise ValueError("Pas assez de données pour calculer une régression linéaire")
+
+    sums = _centered_sums(x, y)
+    if not sums["sxx"]:
+        raise ValueError("Régression impossible: toutes les valeurs de x sont identiques")
+    slope = sums["sxy"] / sums["sxx"]
+    intercept = sums["mean_y"] - slope * sums["mean_x"]
+    fit = FitResult(x, y, slope, intercept, sums=sums)
+
+    for method in robust:
+        if method == 'huber':
+            robust_slope, robust_intercept = _huber_fit(x, y, slope, intercept)
+        else:
+            robust_slope, robust_intercept = _theil_sen_fit(x, y)
+        fit.robust[method] = FitResult(x, y, robust_slope, robust_intercept, method=method, sums=sums)
+        logger.debug(f"Régression {method}: pente={robust_slope:.4f}, ordonnée à l'origine={robust_intercept:.4f}")
+
+    return fit
@@ -30,7 +30,7 @@ from PyQt5.QtGui import QPixmap, QFont
 from zymosoft_assistant.utils.constants import COLOR_SCHEME, PLATE_TYPES, ACQUISITION_MODES, VALIDATION_CRITERIA
 from zymosoft_assistant.core.acquisition_analyzer import AcquisitionAnalyzer
 from zymosoft_assistant.core.report_generator import ReportGenerator
-from zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025 import compare_enzymo_2_ref, comparaison_ZC_to_ref_v1, \
+from zymosoft_assistant.scripts.Routine_VALIDATION_ZC_18022025 import compare_enzymo_2_ref_areas, comparaison_ZC_to_ref_v1, \
     comparaison_ZC_to_ref_v1_nanofilm
 from zymosoft_assistant.scripts.getDatasFromWellResults import processWellResults, calculateLODLOQComparison
 from zymosoft_assistant.core.file_validator import FileValidator
@@ -735,6 +735,9 @@ class AcquisitionDetailsDialog(QDialog):
         self.graph_titles = []
 
         graph_paths = [p for p in analysis.get("graphs", []) if os.path.exists(p)]
+        if not graph_paths and analysis.get("valid") and analysis.get("data") is not None:
+            # Images d'une session rechargée supprimées entre temps : reprises du cache ou générées à nouveau
+            graph_paths = AcquisitionAnalyzer(render_workers=1).get_graphs(analysis)
         results_folders = []
 
         for folder in [
@@ -1677,7 +1680,8 @@ class Step3Acquisition(StepFrame):
         analysis_results = self.analyzer.analyze_results(
             results_folder,
             plate_type=self.plate_type_var,
-            acquisition_mode=self.acquisition_mode_var
+            acquisition_mode=self.acquisition_mode_var,
+            lazy_graphs=True
         )
 
         # Créer un dossier pour les résultats de validation si nécessaire
@@ -1712,6 +1716,11 @@ class Step3Acquisition(StepFrame):
         if validation_results:
             analysis_results["validation"] = validation_results
 
+        # Graphiques affichés dans le panneau Images : générés (ou repris du cache) hors du thread de l'interface
+        if analysis_results.get("valid"):
+            self.progress_updated.emit(95, "Génération des graphiques...")
+            self.analyzer.get_graphs(analysis_results)
+
         self.progress_updated.emit(100, "Analyse terminée.")
         self.analysis_results = analysis_results
         self.analysis_completed.emit()
@@ -1856,44 +1865,31 @@ class Step3Acquisition(StepFrame):
                 all_results = []
 
                 if os.path.exists(excel_path):
-                    excel_file = pandas.ExcelFile(excel_path)
-                    sheet_names = excel_file.sheet_names
-
                     # Paramètres pour les pourcentages de dégradation (utilisés dans l'en-tête CSV)
                     # La fonction compare_enzymo_2_ref utilise des pourcentages fixes: 30%, 50%, 70%
                     deg_percentages = [30, 50, 70]
 
-                    # Itérer sur tous les onglets
-                    for sheet_name in sheet_names:
-                        try:
-                            # Normaliser les chemins
-                            reference_parent_folder_norm = os.path.normpath(reference_parent_folder)
-                            results_parent_folder_norm = os.path.normpath(results_parent_folder)
-                            comparison_dir_norm = os.path.normpath(comparison_dir)
-
-                            try:
-                                ref_data, validation_data = compare_enzymo_2_ref(
-                                    reference_parent_folder_norm, reference_machine,
-                                    acquisition_name_instrument_1, sheet_name,
-                                    results_parent_folder_norm, machine_to_validate,
-                                    acquisition_name_instrument_2,
-                                    comparison_dir_norm
-                                )
-                            except FileNotFoundError as fnf_error:
-                                logger.error(f"Fichier non trouvé lors de la comparaison enzymatique: {str(fnf_error)}",
-                                             exc_info=True)
-                                # Continuer avec le prochain onglet
-                                continue
-
-                            all_results.append(ref_data)
-                            all_results.append(validation_data)
-
-                            print(
-                                f"Onglet {sheet_name} - Référence: {ref_data}, Validation: {validation_data}")
-                        except Exception as e:
+                    # Comparaison de tous les onglets en un seul passage : chaque classeur est lu une fois,
+                    # les areas sont calculées en parallèle (un process par coeur)
+                    validation_excel_path = os.path.normpath(os.path.join(results_parent_folder,
+                                                                          acquisition_name_instrument_2,
+                                                                          'WellResults.xlsx'))
+                    comparisons = compare_enzymo_2_ref_areas(
+                        excel_path, reference_machine, acquisition_name_instrument_1,
+                        validation_excel_path, machine_to_validate, acquisition_name_instrument_2,
+                        os.path.normpath(comparison_dir), workers=None
+                    )
+                    for comparison in comparisons:
+                        if not comparison.ok:
                             logger.error(
-                                f"Erreur lors de la comparaison pour l'onglet {sheet_name}: {str(e)}",
-                                exc_info=True)
+                                f"Erreur lors de la comparaison pour l'onglet {comparison.onglet}: {comparison.error}")
+                            continue
+
+                        all_results.append(comparison.data_R)
+                        all_results.append(comparison.data_V)
+
+                        print(
+                            f"Onglet {comparison.onglet} - Référence: {comparison.data_R}, Validation: {comparison.data_V}")
 
                     # Créer le fichier CSV de résultats
                     if all_results:
@@ -2047,8 +2043,8 @@ class Step3Acquisition(StepFrame):
                 default_log_path = os.path.join(zymosoft_path, '..', 'Diag', 'Temp')
                 log_file_path = getLogFile(default_log_path)
 
-            # Analyse du fichier de log
-            log_analysis = analyzeLogFile(log_file_path)
+            # Analyse du fichier de log (l'index du log évite de relire l'historique à chaque analyse)
+            log_analysis = analyzeLogFile(log_file_path, use_index=True)
 
             # Stocker les résultats d'analyse des logs
             self.log_analysis_results = log_analysis
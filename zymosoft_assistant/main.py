@@ -8,6 +8,7 @@ Point d'entrée de l'application
 import sys
 import os
 import logging
+import multiprocessing
 import subprocess
 
 import matplotlib
@@ -146,6 +147,8 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # nécessaire aux pools de process (rendu des figures, comparaisons) dans l'exécutable Windows
+    multiprocessing.freeze_support()
     sys.exit(main())
 
 
@@ -17,8 +17,13 @@ from math import log
 from math import isnan
 import statistics
 import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from scipy import stats
 
+from zymosoft_assistant.core.figure_renderer import PlotSpec, new_figure, render_figures, save_figure, with_render_profile
+from zymosoft_assistant.scripts.getDatasFromWellResults import getWellResultsWorkbook
+
 # Helper function to safely create directories (including parent directories)
 def safe_mkdir(directory_path):
     """
@@ -29,10 +34,321 @@ def safe_mkdir(directory_path):
     """
     os.makedirs(directory_path, exist_ok=True)
 
+
+def windows_path_join(*parts):
+    """Chemin construit avec '\\' comme le font historiquement les routines (écrites pour Windows)."""
+    return '\\'.join(parts)
+
+
+# Politique de rendu des figures des routines de validation :
+#   'eager'    : les figures sont tracées et sauvées pendant la routine (comportement historique)
+#   'deferred' : la routine ne trace rien et retourne en plus une liste de PlotSpec à rendre plus tard
+#   'none'     : seuls les résultats sont calculés, aucune figure
+RENDER_POLICIES = ('eager', 'deferred', 'none')
+
+
+def check_render_policy(render):
+    if render not in RENDER_POLICIES:
+        raise ValueError(f"Politique de rendu inconnue: {render} (politiques disponibles: {list(RENDER_POLICIES)})")
+
+
+def apply_render_policy(render, plot_specs, function, **kwargs):
+    """
+    Trace tout de suite (eager), ajoute un PlotSpec à plot_specs (deferred) ou ne fait rien (none).
+    """
+    if render == 'eager':
+        function(**kwargs)
+    elif render == 'deferred':
+        plot_specs.append(PlotSpec(function, **kwargs))
+
+
+def render_plot_specs(plot_specs, workers=1, profile=None):
+    """
+    Rend dans l'ordre les figures retournées par une routine appelée avec render='deferred'.
+
+    workers : nombre de process de rendu (None = nombre de coeurs), voir render_figures
+    profile : profil de rendu ('screen', 'report', 'vector', voir RENDER_PROFILES de figure_renderer),
+              figures telles que tracées par la routine si None
+    Retourne la liste des fichiers sauvés.
+    """
+    if profile is not None:
+        plot_specs = with_render_profile(plot_specs, profile)
+    return [path for paths in render_figures(plot_specs, workers) for path in paths]
+
+
+def stack_repeta_iterations(files, kind='zymintern', plate_shape=(8, 12)):
+    """
+    Lit les fichiers synthese_interferometric_data.csv de chaque itération d'une répéta
+    et les empile dans un seul array de forme (itérations, métriques, lettres, colonnes).
+
+    kind : 'zymintern' ou 'nanofilm' (voir read_plate_synthese_cached)
+    plate_shape : géométrie (lettres, colonnes) utilisée quand il n'y a aucune itération
+    """
+    plate_format = int(np.prod(plate_shape))
+    plates = [read_plate_synthese_cached(file, kind, plate_format).values for file in files]
+    if not plates:
+        nb_metrics = len(SYNTHESE_ZYMINTERN_COLUMNS if kind == 'zymintern' else SYNTHESE_NANOFILM_COLUMNS) + 1
+        return np.zeros((0, nb_metrics) + tuple(plate_shape))
+    return np.stack(plates)
+
+
+def repeta_statistics(data_all_iteration):
+    """
+    Moyenne, écart-type et CV (en %) par puits et par métrique sur les itérations, en ignorant les nan.
+
+    data_all_iteration : array (itérations, métriques, lettres, colonnes)
+    Retourne trois arrays (métriques, lettres, colonnes).
+    """
+    # les itérations sont ramenées sur le dernier axe contigu : même ordre de sommation
+    # (donc mêmes valeurs au bit près) que np.nanmean/np.nanstd appelés puits par puits
+    per_well = np.ascontiguousarray(np.moveaxis(data_all_iteration, 0, -1))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # puits vide sur toutes les itérations -> nan
+        mean = np.nanmean(per_well, axis=-1)
+        std = np.nanstd(per_well, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CV = std / mean * 100
+    return mean, std, CV
+
+
+def write_wells_csv(path, string_title_csv_out, rows):
+    """
+    Ecrit un csv avec une ligne par puits ('A1', 'A2', ..., 'H12') suivie des valeurs du puits,
+    chaque valeur suivie d'un ';' (même format que les str(valeur)+';' historiques).
+
+    rows : array (lettres, colonnes, valeurs par puits)
+    """
+    number_of_letters_max, number_of_colonne_number_max = rows.shape[:2]
+    wells = [alphabet_majuscule[j_letter] + str(j_col+1)
+             for j_letter in range(number_of_letters_max) for j_col in range(number_of_colonne_number_max)]
+    table = pandas.DataFrame(rows.reshape(len(wells), -1))
+    table.insert(0, 'well', wells)
+    table['fin'] = '' # le ';' final de chaque ligne
+    with open(path, 'w') as csv_out:
+        csv_out.write(string_title_csv_out+'\n')
+        table.to_csv(csv_out, sep=';', header=False, index=False, na_rep='nan', lineterminator='\n')
+
+
+def write_repeta_data_raw_csv(path, string_title_csv_out, data_all_iteration):
+    """
+    Ecrit le csv data_raw des données brutes agglomérées : une ligne par puits,
+    puis pour chaque itération toutes les métriques.
+
+    data_all_iteration : array (itérations, métriques, lettres, colonnes)
+    """
+    nb_iteration, nb_metrics = data_all_iteration.shape[:2]
+    # (lettres, colonnes, itérations, métriques) -> itérations puis métriques sur chaque ligne
+    rows = data_all_iteration.transpose(2, 3, 0, 1).reshape(data_all_iteration.shape[2:] + (nb_iteration*nb_metrics,))
+    write_wells_csv(path, string_title_csv_out, rows)
+
+
+def plot_repeta_sans_ref(nom_plaque, nb_iteration, nb_well_over_threshold, CV_repeta_threshold,
+                         volume_mean_for_this_plate, volume_CV_for_this_plate,
+                         diametre_mean_for_this_plate, diametre_CV_for_this_plate, directory_out_this_plate,
+                         path_join=windows_path_join, profile=None):
+    """
+    Figures de repeta_sans_ref_v1 (CV des volumes vs V mean, CV des diametres vs D mean),
+    sauvées en jpg dans directory_out_this_plate. Retourne la liste des fichiers sauvés.
+
+    path_join : construction des chemins (windows_path_join historique ou os.path.join)
+    profile : profil de rendu de figure_renderer (taille, dpi et format), figures telles quelles si None
+    """
+    number_of_letters_max = volume_mean_for_this_plate.shape[0]
+#    génération de dégradés de couleurs du même nombre que le nombre de lettres
+    color_letter =gen_color(cmap="viridis",n=number_of_letters_max)
+    v_min_mean = np.nanmin(volume_mean_for_this_plate)
+    v_max_mean = np.nanmax(volume_mean_for_this_plate)
+    paths = [path_join(directory_out_this_plate, nom_plaque+'_CV_on_V_vs_V_mean.jpg'),
+             path_join(directory_out_this_plate, nom_plaque+'_CV_on_D_vs_D_mean.jpg')]
+
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.set_title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs\n'+str(nb_well_over_threshold)+ ' puits au dessus de '+str(CV_repeta_threshold)+'% de CV sur le volumes')
+    for j_letter in range(number_of_letters_max):
+        ax.plot(volume_mean_for_this_plate[j_letter,:],volume_CV_for_this_plate[j_letter,:],'o',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])
+    ax.axhline(y = CV_repeta_threshold,xmin=v_min_mean, xmax=v_max_mean, ls='--' , color = 'k', label = str(CV_repeta_threshold)+'%')
+    ax.set_xlabel('V_mean µm^3')
+    ax.set_ylabel('CV %')
+    ax.legend()
+    paths[0] = save_figure(fig, paths[0], profile)
+
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.set_title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs')
+    for j_letter in range(number_of_letters_max):
+        ax.plot(diametre_mean_for_this_plate[j_letter,:],diametre_CV_for_this_plate[j_letter,:],'v',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])
+    ax.axhline(y = 5,xmin=v_min_mean, xmax=v_max_mean, ls='--' , color = 'k', label = '5%')
+    ax.set_xlabel('D_mean µm')
+    ax.set_ylabel('CV on D%')
+    ax.legend()
+    paths[1] = save_figure(fig, paths[1], profile)
+    return paths
+
+
+def relative_difference(values_instrument_1, values_instrument_2):
+    """
+    Différence relative (1 - 2) / 2 en % et ratio 1 / 2, à nan là où la référence 2 vaut 0.
+    """
+    reference_nulle = values_instrument_2 == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        difference_relative = np.where(reference_nulle, np.nan, (values_instrument_1 - values_instrument_2)/values_instrument_2 *100)
+        ratio = np.where(reference_nulle, np.nan, values_instrument_1 / values_instrument_2)
+    return difference_relative, ratio
+
+
+def comparaison_ZC_to_ref_kernel(volume_instrument_1, diametre_instrument_1, porcent_dot_keep_instrument_1,
+                                 volume_instrument_2, diametre_instrument_2, porcent_dot_keep_instrument_2,
+                                 tolerance_relative_fit, tolerance=20):
+    """
+    Calculs de comparaison_ZC_to_ref_v1 sans aucune figure : différences 1 - 2 (2 = référence),
+    filtre des outliers, fit des volumes (instrument 2 en x, instrument 1 en y) et écart au fit.
+
+    Les entrées sont des arrays (lettres, colonnes) ; les vecteurs sont à plat dans l'ordre A1, A2, ..., H12.
+    tolerance : filtre grossier (en % de différence relative) des outliers exclus du fit
+    Retourne un dict dont les clés reprennent les noms de variables de comparaison_ZC_to_ref_v1.
+    """
+    Matrix_volume_difference = volume_instrument_1 - volume_instrument_2
+    Matrix_volume_difference_relative, Matrix_volume_ratio = relative_difference(volume_instrument_1, volume_instrument_2)
+    Matrix_diametre_difference = diametre_instrument_1 - diametre_instrument_2
+    Matrix_diametre_difference_relative, _ = relative_difference(diametre_instrument_1, diametre_instrument_2)
+    Matrix_nb_dot_utile_pourcent_difference = porcent_dot_keep_instrument_1 - porcent_dot_keep_instrument_2
+
+# mise sous forme de vecteur des volumes et diamètres pour fiter
+    vecteur_volume_instrument_1 = np.array(volume_instrument_1, dtype=float).ravel()
+    vecteur_volume_instrument_2 = np.array(volume_instrument_2, dtype=float).ravel()
+    vecteur_ratio = Matrix_volume_difference_relative.ravel()
+
+# filtre très grossier pour ne pas prendre les outliers dans le calcul du fit
+    mask_nan = np.isnan(vecteur_ratio)
+    mask_volumes_eloignes = (np.abs(vecteur_ratio) > tolerance) | mask_nan
+    mask_volumes_proches = ~mask_volumes_eloignes
+#    nb de puits exclus du fit (hors nan)
+    nb_puits_trop_loins = np.sum(mask_volumes_eloignes) - np.sum(mask_nan)
+
+#calcul du fit sur les volumes (sur tous les puits si aucun n'est assez proche)
+    if mask_volumes_proches.any():
+        fit = stats.linregress(vecteur_volume_instrument_2[mask_volumes_proches], vecteur_volume_instrument_1[mask_volumes_proches])
+    else:
+        fit = stats.linregress(vecteur_volume_instrument_2, vecteur_volume_instrument_1)
+    slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = fit
+    data_fit = slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse
+
+# calcul de l'écart data - fit et mask en fct du seuillage de l'écart tolérable
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ecart_au_fit = np.where(vecteur_volume_instrument_1 != 0,
+                                100 * np.abs(data_fit - vecteur_volume_instrument_1)/vecteur_volume_instrument_1, 0)
+    mask_volumes_eloignes_fit = ecart_au_fit > tolerance_relative_fit
+    nb_puits_loin_fit = np.sum(mask_volumes_eloignes_fit)
+
+#   calcul de moyennes et ecarts types des différences en volumes et diametres
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # plaque sans aucune différence relative définie -> nan
+        Matrix_volume_difference_relative_mean = np.nanmean(Matrix_volume_difference_relative)
+        Matrix_volume_difference_relative_std = np.nanstd(Matrix_volume_difference_relative)
+        Matrix_diametre_difference_relative_mean = np.nanmean(Matrix_diametre_difference_relative)
+        Matrix_diametre_difference_relative_std = np.nanstd(Matrix_diametre_difference_relative)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Matrix_volume_difference_relative_CV = 100*Matrix_volume_difference_relative_std/Matrix_volume_difference_relative_mean
+        Matrix_diametre_difference_relative_CV = 100*Matrix_diametre_difference_relative_std/Matrix_diametre_difference_relative_mean
+
+    return {
+        'Matrix_volume_difference': Matrix_volume_difference,
+        'Matrix_volume_difference_relative': Matrix_volume_difference_relative,
+        'Matrix_volume_ratio': Matrix_volume_ratio,
+        'Matrix_diametre_difference': Matrix_diametre_difference,
+        'Matrix_diametre_difference_relative': Matrix_diametre_difference_relative,
+        'Matrix_nb_dot_utile_pourcent_difference': Matrix_nb_dot_utile_pourcent_difference,
+        'vecteur_volume_instrument_1': vecteur_volume_instrument_1,
+        'vecteur_volume_instrument_2': vecteur_volume_instrument_2,
+        'vecteur_diametre_instrument_1': np.array(diametre_instrument_1, dtype=float).ravel(),
+        'vecteur_diametre_instrument_2': np.array(diametre_instrument_2, dtype=float).ravel(),
+        'vecteur_ratio': vecteur_ratio,
+        'mask_volumes_proches': mask_volumes_proches,
+        'mask_volumes_eloignes': mask_volumes_eloignes,
+        'mask_nan': mask_nan,
+        'nb_puits_trop_loins': nb_puits_trop_loins,
+        'slope_fit_inverse': slope_fit_inverse,
+        'intercept_fit_inverse': intercept_fit_inverse,
+        'r_value_fit_inverse': r_value_fit_inverse,
+        'p_value_fit_inverse': p_value_fit_inverse,
+        'std_err_fit_inverse': std_err_fit_inverse,
+        'data_fit': data_fit,
+        'ecart_au_fit': ecart_au_fit,
+        'mask_volumes_eloignes_fit': mask_volumes_eloignes_fit,
+        'nb_puits_loin_fit': nb_puits_loin_fit,
+        'Matrix_volume_difference_relative_mean': Matrix_volume_difference_relative_mean,
+        'Matrix_volume_difference_relative_std': Matrix_volume_difference_relative_std,
+        'Matrix_volume_difference_relative_CV': Matrix_volume_difference_relative_CV,
+        'Matrix_diametre_difference_relative_mean': Matrix_diametre_difference_relative_mean,
+        'Matrix_diametre_difference_relative_std': Matrix_diametre_difference_relative_std,
+        'Matrix_diametre_difference_relative_CV': Matrix_diametre_difference_relative_CV,
+    }
+
+
+def plot_comparaison_ZC_to_ref(comparaison, name_dossier_instrument_1, type_intrument_1, type_intrument_2,
+                               directory_plaque_to_save, name_dossier_to_save, tolerance_relative_fit, profile=None):
+    """
+    Figures de comparaison_ZC_to_ref_v1 (volumes par puits, fit, puits loin du fit) à partir du
+    résultat de comparaison_ZC_to_ref_kernel, sauvées en jpg dans directory_plaque_to_save.
+    Retourne la liste des fichiers sauvés.
+
+    profile : profil de rendu de figure_renderer (taille, dpi et format), figures telles quelles si None
+    """
+    vecteur_volume_instrument_1 = comparaison['vecteur_volume_instrument_1']
+    vecteur_volume_instrument_2 = comparaison['vecteur_volume_instrument_2']
+    mask_volumes_proches = comparaison['mask_volumes_proches']
+    mask_volumes_eloignes = comparaison['mask_volumes_eloignes']
+    mask_volumes_eloignes_fit = comparaison['mask_volumes_eloignes_fit']
+    slope_fit_inverse = comparaison['slope_fit_inverse']
+    intercept_fit_inverse = comparaison['intercept_fit_inverse']
+    r_value_fit_inverse = comparaison['r_value_fit_inverse']
+    label_fit = 'slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4))
+    paths = [directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits.jpg',
+             directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_FIT.jpg',
+             directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_fit.jpg']
+
+    # To keep
+    fig = new_figure(figsize=(12,6))
+    ax = fig.add_subplot()
+    fig.suptitle(name_dossier_instrument_1+' volumes par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n ')#\n'
+    ax.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'o',color='blue',label='data utile au fit')
+    ax.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='outlier')
+    ax.plot(np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2)),np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2)),label='bissectrice = target',color='k')
+    ax.set_xlabel('V issu stat µm^3  '+type_intrument_2)
+    ax.set_ylabel('V issu stat µm^3  '+type_intrument_1)
+    ax.legend()
+    paths[0] = save_figure(fig, paths[0], profile)
+
+    # représentation graphique du fit
+    fig = new_figure(figsize=(12,6))
+    ax = fig.add_subplot()
+    fig.suptitle(name_dossier_instrument_1+' FIT\nvolumes par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(comparaison['nb_puits_trop_loins'])+' puits exclus pour le calcul du fit')#\n'
+    ax.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'+',color='blue',label='data utile pour fit')
+    ax.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='data exclue pour fit')
+    ax.plot(vecteur_volume_instrument_2,comparaison['data_fit'],color='#000080',linestyle = '-',label=label_fit)
+    ax.set_xlabel('V issu stat µm^3  '+type_intrument_2)
+    ax.set_ylabel('V issu stat µm^3  '+type_intrument_1)
+    ax.legend()
+    paths[1] = save_figure(fig, paths[1], profile)
+
+#  figure avec représentation des points ok ko vis à vis du fit
+    fig = new_figure(figsize=(12,6))
+    ax = fig.add_subplot()
+    fig.suptitle(name_dossier_instrument_1+' volumes par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n nb puits loin du fit ='+str(comparaison['nb_puits_loin_fit'])+' tolerance ='+str(tolerance_relative_fit))#\n'
+    ax.plot(vecteur_volume_instrument_2,vecteur_volume_instrument_1,'v',color='green',label='data proche fit')
+    ax.plot(vecteur_volume_instrument_2[mask_volumes_eloignes_fit],vecteur_volume_instrument_1[mask_volumes_eloignes_fit],'rx',label='data loin fit')
+    ax.plot(vecteur_volume_instrument_2,comparaison['data_fit'],color='k',linestyle = '-',label=label_fit)
+    ax.set_xlabel('V issu stat µm^3  '+type_intrument_2)
+    ax.set_ylabel('V issu stat µm^3  '+type_intrument_1)
+    ax.legend()
+    paths[2] = save_figure(fig, paths[2], profile)
+    return paths
+
+
 # =============================================================================
 #  fonctions de la validation        
 # =============================================================================
-def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold):
+def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold,render='eager'):
     # =============================================================================
     # le but de cette fonction et de rassembler les données de répéta de l'imagerie d'une même plaque 
         # =============================================================================
@@ -56,94 +372,67 @@ def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_
     #           creation du csv avec les data brutes agglomérées 
     #       -> retourne les valeurs des indicateurs et les array intéressants
     #            nb_iteration , nb_well_over_threshold , CV_max_volume, CV_min_volume, CV_mean_volume, CV_max_diametre, CV_min_diametre, CV_mean_diametre ,volume_mean_for_this_plate , volume_CV_for_this_plate , diametre_mean_for_this_plate , diametre_CV_for_this_plate 
+    #       -> render : 'eager' (figures sauvées pendant l'appel), 'deferred' (la liste des PlotSpec est
+    #            ajoutée à la fin des valeurs retournées) ou 'none' (aucune figure)
     # =============================================================================
+    check_render_policy(render)
     liste_dossier_present = os.listdir(directory_source)
+#    cherche le nombre d'itérations de l'imagerie et retient les noms de dossiers concernés
+    liste_dossier_plaque = [dossier for dossier in liste_dossier_present if nom_plaque in dossier]
+# le dossier de sortie dans le dossier output avec le nom de plaque comme nom
+    directory_out_this_plate = directory_racine_output + '\\'+nom_plaque
+    files = [directory_source + '\\' + dossier + '\\' + nom_reconstruction + '\\synthese_interferometric_data.csv'
+             for dossier in liste_dossier_plaque]
+    return repeta_sans_ref_from_files(files, liste_dossier_plaque, nom_plaque, directory_out_this_plate,
+                                      CV_repeta_threshold, render, windows_path_join)
+
+
+def repeta_sans_ref_from_files(files, liste_dossier_plaque, nom_plaque, directory_out_this_plate, CV_repeta_threshold,
+                               render='eager', path_join=os.path.join):
+    """
+    Calculs et sorties de repeta_sans_ref_v1 pour une plaque dont les itérations sont déjà trouvées.
+
+    files : fichiers synthese_interferometric_data.csv des itérations
+    liste_dossier_plaque : noms des dossiers des itérations (titres du csv data_raw)
+    path_join : construction des chemins de sortie (os.path.join, ou windows_path_join pour repeta_sans_ref_v1)
+    Retourne les mêmes valeurs que repeta_sans_ref_v1.
+    """
+    check_render_policy(render)
 #    géométrie des plaques 96 puits
     number_of_letters_max = 8
     number_of_colonne_number_max = 12
-#    génération de dégradés de couleurs du même nombre que le nombre de lettres
-    color_letter =gen_color(cmap="viridis",n=number_of_letters_max)
-    color_letter_bis =gen_color(cmap="autumn",n=number_of_letters_max)
-#    génération des array qui vont contenir les métriques 
-    volume_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    volume_std_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_std_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_dot_detecte_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_dot_keep_now_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_cycle_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_dot_utile_mean_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    volume_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    volume_std_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_std_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_dot_detecte_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_dot_keep_now_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_cycle_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_dot_utile_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-    volume_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    volume_CV_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    diametre_CV_std_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    nb_dot_detecte_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_dot_keep_now_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    n_cycle_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-    porcent_dot_utile_CV_for_this_plate = np.zeros((number_of_letters_max,number_of_colonne_number_max)) 
-
-#    cherche le nombre d'itérations de l'imagerie et retient les noms de dossiers concernés
-    liste_dossier_plaque = []
-    nb_iteration = 0
-    j_1 = 0
-    while j_1<len(liste_dossier_present):
-        if nom_plaque in liste_dossier_present[j_1]:
-            liste_dossier_plaque.append(liste_dossier_present[j_1])
-            nb_iteration += 1
-        j_1 += 1
-# création du dossie de sortie dans le dossier output avec le nom de plaque comme nom
-    directory_out_this_plate = directory_racine_output + '\\'+nom_plaque
+    nb_iteration = len(liste_dossier_plaque)
+# création du dossie de sortie
     if os.path.exists(directory_out_this_plate) == False:
         os.mkdir(directory_out_this_plate)
 
-#    array qui vont récoltés toutes les entrées des itérations
-    volume_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    volume_std_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    diametre_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    diametre_std_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    nb_dot_detecte_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    n_dot_keep_now_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    n_cycle_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-    porcent_dot_utile_plaque_all_iteration = np.zeros((number_of_letters_max,number_of_colonne_number_max,nb_iteration)) 
-
-#    par itération de l'acquisition, on va chercher synthese_interferometric_data.csv et on agglomère les data dans les array ci dessus 
-#    ecriture dans un fichier csv de sortie les data utilisées
-    string_title_csv_out = 'well;'
-    j_iteration = 0
-    while j_iteration<nb_iteration:
-
-        dossier_now = directory_source + '\\' + liste_dossier_plaque[j_iteration]
-        dossier_reconstruction =  dossier_now+ '\\'  + nom_reconstruction
-        file = dossier_reconstruction + '\\synthese_interferometric_data.csv'
-#        lecture de synthese_interferometric_data.csv issu de Zyminterne
-        volume_now, volume_std_now, diametre_now, diametre_std_now, N_dot_detected_now, N_dot_keep_now, N_cycle_now, porcent_dot_keep_now =  import_data_from_csv_synthese_zymintern(file)
-#
+#    par itération de l'acquisition, on va chercher synthese_interferometric_data.csv et on empile les data
+#    dans un seul array (itérations, métriques, lettres, colonnes)
+#    métriques : volume, volume_std, diametre, diametre_std, N_dot_detected, N_dot_keep, N_cycle, porcent_dot_keep
+    data_all_iteration = stack_repeta_iterations(files, 'zymintern', (number_of_letters_max,number_of_colonne_number_max))
         #        copie des dotmaps pour un suivi  de l'allure des dots
         # copyfile(dossier_reconstruction+'\\dot_map_730.png',directory_out_this_plate+'\\dot_map_730_'+liste_dossier_plaque[j_iteration]+'.png')
         # copyfile(dossier_reconstruction+'\\dot_map_contour_730.png',directory_out_this_plate+'\\dot_map_contour_730'+liste_dossier_plaque[j_iteration]+'.png')
         # copyfile(dossier_reconstruction+'\\dot_map_cycle_730.png',directory_out_this_plate+'\\dot_map_cycle_730'+liste_dossier_plaque[j_iteration]+'.png')
 
-        volume_plaque_all_iteration[:,:,j_iteration] = np.copy(volume_now[:,:])
-        volume_std_plaque_all_iteration[:,:,j_iteration] = np.copy(volume_std_now[:,:])
-        diametre_plaque_all_iteration[:,:,j_iteration] = np.copy(diametre_now[:,:])
-        diametre_std_plaque_all_iteration[:,:,j_iteration] = np.copy(diametre_std_now[:,:])
-        nb_dot_detecte_plaque_all_iteration[:,:,j_iteration] = np.copy(N_dot_detected_now[:,:])
-        n_dot_keep_now_plaque_all_iteration[:,:,j_iteration] = np.copy(N_dot_keep_now[:,:])
-        n_cycle_plaque_all_iteration[:,:,j_iteration] = np.copy(N_cycle_now[:,:])
-        porcent_dot_utile_plaque_all_iteration[:,:,j_iteration] = np.copy(porcent_dot_keep_now[:,:])            
-#        incrément de la string de titre du csv de sortie 
-#        NB: le nom du dossier considéré est renseigné dans la 1ere colonne de la plaque (Volume)
-        string_title_csv_out += 'Volume_' + liste_dossier_plaque[j_iteration] + ';'
+# calcul des moyennes des différentes métriques sauvées pour toutes les itérations et des écart-types et leur CV
+#        attention puisque des métriques de base sont des écarts-types, on a ici des écart types d'écarts types
+    mean_for_this_plate, std_for_this_plate, CV_for_this_plate = repeta_statistics(data_all_iteration)
+    (volume_mean_for_this_plate, volume_std_mean_for_this_plate, diametre_mean_for_this_plate, diametre_std_mean_for_this_plate,
+     nb_dot_detecte_mean_for_this_plate, n_dot_keep_now_mean_for_this_plate, n_cycle_mean_for_this_plate,
+     porcent_dot_utile_mean_for_this_plate) = mean_for_this_plate
+    (volume_std_for_this_plate, volume_std_std_for_this_plate, diametre_std_for_this_plate, diametre_std_std_for_this_plate,
+     nb_dot_detecte_std_for_this_plate, n_dot_keep_now_std_for_this_plate, n_cycle_std_for_this_plate,
+     porcent_dot_utile_std_for_this_plate) = std_for_this_plate
+    (volume_CV_for_this_plate, volume_CV_std_for_this_plate, diametre_CV_for_this_plate, diametre_CV_std_for_this_plate,
+     nb_dot_detecte_CV_for_this_plate, n_dot_keep_now_CV_for_this_plate, n_cycle_CV_for_this_plate,
+     porcent_dot_utile_CV_for_this_plate) = CV_for_this_plate
+
+#    ecriture dans un fichier csv de sortie les data utilisées
+#    NB: le nom du dossier considéré est renseigné dans la 1ere colonne de la plaque (Volume)
+    string_title_csv_out = 'well;'
+    for j_iteration, dossier in enumerate(liste_dossier_plaque):
+        string_title_csv_out += 'Volume_' + dossier + ';'
         string_title_csv_out += 'Volume_std_' + str(j_iteration) + ';'
         string_title_csv_out += 'Diametre_' + str(j_iteration) + ';'
         string_title_csv_out += 'Diametre_std' + str(j_iteration) + ';'
@@ -151,65 +440,7 @@ def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_
         string_title_csv_out += 'N_dot_keep_now' + str(j_iteration) + ';'
         string_title_csv_out += 'N_cycle_now' + str(j_iteration) + ';'
         string_title_csv_out += 'porcent_dot_keep_now' + str(j_iteration) + ';'
-
-        j_iteration += 1
-
-# calcul des moyennes des différentes métriques sauvées pour toutes les itérations et des écart-types et leur CV
-#        attention puisque des métriques de base sont des écarts-types, on a ici des écart types d'écarts types
-
-
-    csv_out_this_plate = open(directory_out_this_plate+'\\data_raw.csv','w')
-
-    csv_out_this_plate.write(string_title_csv_out+'\n')
-
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-#            calcul des moyennes
-            volume_mean_for_this_plate[j_letter,j_col]= np.nanmean(volume_plaque_all_iteration[j_letter,j_col,:])
-            volume_std_mean_for_this_plate[j_letter,j_col]= np.nanmean(volume_std_plaque_all_iteration[j_letter,j_col,:])
-            diametre_mean_for_this_plate[j_letter,j_col]= np.nanmean(diametre_plaque_all_iteration[j_letter,j_col,:])
-            diametre_std_mean_for_this_plate[j_letter,j_col]= np.nanmean(diametre_std_plaque_all_iteration[j_letter,j_col,:])
-            nb_dot_detecte_mean_for_this_plate[j_letter,j_col]= np.nanmean(nb_dot_detecte_plaque_all_iteration[j_letter,j_col,:])
-            n_dot_keep_now_mean_for_this_plate[j_letter,j_col]= np.nanmean(n_dot_keep_now_plaque_all_iteration[j_letter,j_col,:])
-            n_cycle_mean_for_this_plate[j_letter,j_col]= np.nanmean(n_cycle_plaque_all_iteration[j_letter,j_col,:])
-            porcent_dot_utile_mean_for_this_plate[j_letter,j_col]= np.nanmean(porcent_dot_utile_plaque_all_iteration[j_letter,j_col,:])
-#            calcul des ecarts types
-            volume_std_for_this_plate[j_letter,j_col]= np.nanstd(volume_plaque_all_iteration[j_letter,j_col,:])
-            volume_std_std_for_this_plate[j_letter,j_col]= np.nanstd(volume_std_plaque_all_iteration[j_letter,j_col,:])
-            diametre_std_for_this_plate[j_letter,j_col]= np.nanstd(diametre_plaque_all_iteration[j_letter,j_col,:])
-            diametre_std_std_for_this_plate[j_letter,j_col]= np.nanstd(diametre_std_plaque_all_iteration[j_letter,j_col,:])
-            nb_dot_detecte_std_for_this_plate[j_letter,j_col]= np.nanstd(nb_dot_detecte_plaque_all_iteration[j_letter,j_col,:])
-            n_dot_keep_now_std_for_this_plate[j_letter,j_col]= np.nanstd(n_dot_keep_now_plaque_all_iteration[j_letter,j_col,:])
-            n_cycle_std_for_this_plate[j_letter,j_col]= np.nanstd(n_cycle_plaque_all_iteration[j_letter,j_col,:])
-            porcent_dot_utile_std_for_this_plate[j_letter,j_col]= np.nanstd(porcent_dot_utile_plaque_all_iteration[j_letter,j_col,:])
-#            calcul des CV
-            volume_CV_for_this_plate[j_letter,j_col]= np.copy(volume_std_for_this_plate[j_letter,j_col]/volume_mean_for_this_plate[j_letter,j_col]*100)
-            volume_CV_std_for_this_plate[j_letter,j_col]= np.copy(volume_std_std_for_this_plate[j_letter,j_col]/volume_std_mean_for_this_plate[j_letter,j_col]*100)
-            diametre_CV_for_this_plate[j_letter,j_col]= np.copy(diametre_std_for_this_plate[j_letter,j_col]/diametre_mean_for_this_plate[j_letter,j_col]*100)
-            diametre_CV_std_for_this_plate[j_letter,j_col]= np.copy(diametre_std_std_for_this_plate[j_letter,j_col]/diametre_std_mean_for_this_plate[j_letter,j_col]*100)
-            nb_dot_detecte_CV_for_this_plate[j_letter,j_col]= np.copy(nb_dot_detecte_std_for_this_plate[j_letter,j_col]/nb_dot_detecte_mean_for_this_plate[j_letter,j_col]*100)
-            n_dot_keep_now_CV_for_this_plate[j_letter,j_col]= np.copy(n_dot_keep_now_std_for_this_plate[j_letter,j_col]/n_dot_keep_now_mean_for_this_plate[j_letter,j_col]*100)
-            n_cycle_CV_for_this_plate[j_letter,j_col]= np.copy(n_cycle_std_for_this_plate[j_letter,j_col]/n_cycle_mean_for_this_plate[j_letter,j_col]*100)
-            porcent_dot_utile_CV_for_this_plate[j_letter,j_col]= np.copy(porcent_dot_utile_std_for_this_plate[j_letter,j_col]/porcent_dot_utile_mean_for_this_plate[j_letter,j_col]*100)
-            line_csv_out = ''
-            line_csv_out += alphabet_majuscule[j_letter] + str(j_col+1) + ';'
-
-            j_iteration = 0
-            while j_iteration<nb_iteration:
-                line_csv_out += str(volume_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(volume_std_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-                line_csv_out += str(diametre_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(diametre_std_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-                line_csv_out += str(nb_dot_detecte_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(n_dot_keep_now_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-                line_csv_out += str(n_cycle_plaque_all_iteration[j_letter,j_col,j_iteration])+';'+str(porcent_dot_utile_plaque_all_iteration[j_letter,j_col,j_iteration])+';'
-
-                j_iteration += 1
-
-            csv_out_this_plate.write(line_csv_out+'\n')    
-            j_col += 1
-        j_letter += 1
-
-    csv_out_this_plate.close()
+    write_repeta_data_raw_csv(path_join(directory_out_this_plate, 'data_raw.csv'), string_title_csv_out, data_all_iteration)
 
     #affiche_colormap_etude_general_v2(volume_mean_for_this_plate,nom_plaque+'volume_mean_for_this_plate on all iteration','jet',0,500)
     #plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'volume_mean_for_this_plate.jpg')
@@ -247,37 +478,97 @@ def repeta_sans_ref_v1(directory_source,nom_plaque,nom_reconstruction,directory_
     CV_min_diametre = np.nanmin(diametre_CV_for_this_plate)
     CV_mean_diametre = np.nanmean(diametre_CV_for_this_plate)
 
-    v_min_mean = np.nanmin(volume_mean_for_this_plate)
-    v_max_mean = np.nanmax(volume_mean_for_this_plate)
+    plot_specs = []
+    apply_render_policy(render, plot_specs, plot_repeta_sans_ref,
+                        nom_plaque=nom_plaque, nb_iteration=nb_iteration, nb_well_over_threshold=nb_well_over_threshold,
+                        CV_repeta_threshold=CV_repeta_threshold,
+                        volume_mean_for_this_plate=volume_mean_for_this_plate, volume_CV_for_this_plate=volume_CV_for_this_plate,
+                        diametre_mean_for_this_plate=diametre_mean_for_this_plate, diametre_CV_for_this_plate=diametre_CV_for_this_plate,
+                        directory_out_this_plate=directory_out_this_plate, path_join=path_join)
 
+    results = (nb_iteration , nb_well_over_threshold , CV_max_volume, CV_min_volume, CV_mean_volume, CV_max_diametre, CV_min_diametre, CV_mean_diametre ,volume_mean_for_this_plate , volume_CV_for_this_plate , diametre_mean_for_this_plate , diametre_CV_for_this_plate)
+    if render == 'deferred':
+        return results + (plot_specs,)
+    return results
 
-    plt.close('all')
-    plt.figure(1)
-    plt.title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs\n'+str(nb_well_over_threshold)+ ' puits au dessus de '+str(CV_repeta_threshold)+'% de CV sur le volumes')
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        plt.plot(volume_mean_for_this_plate[j_letter,:],volume_CV_for_this_plate[j_letter,:],'o',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])        
-        j_letter += 1
-    plt.axhline(y = CV_repeta_threshold,xmin=v_min_mean, xmax=v_max_mean, ls='--' , color = 'k', label = str(CV_repeta_threshold)+'%')
-    plt.xlabel('V_mean µm^3')
-    plt.ylabel('CV %')
-    plt.legend()
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_V_vs_V_mean.jpg')
+# colonnes du tableau des KPI de répéta (mêmes titres que data_repeta_micro_depot.csv de la routine)
+REPETA_KPI_COLUMNS = ['nom_plaque', 'nb_lecture', 'tolerance_en_cv_colume', 'nb_puits_au_dessus_du_seuil',
+                      'CV_max_V', 'CV_min_V', 'CV_mean_V', 'CV_max_D', 'CV_min_D', 'CV_mean_D']
 
-    plt.figure(2)
-    plt.title(nom_plaque+' sur ' + str(nb_iteration)+ 'runs')
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        plt.plot(diametre_mean_for_this_plate[j_letter,:],diametre_CV_for_this_plate[j_letter,:],'v',color = color_letter[j_letter], label = alphabet_majuscule[j_letter])        
-        j_letter += 1
-    plt.axhline(y = 5,xmin=v_min_mean, xmax=v_max_mean, ls='--' , color = 'k', label = '5%')
-    plt.xlabel('D_mean µm')
-    plt.ylabel('CV on D%')
-    plt.legend()
-    plt.savefig(directory_out_this_plate+'\\'+nom_plaque+'_CV_on_D_vs_D_mean.jpg')
-    plt.close('all')
 
-    return  nb_iteration , nb_well_over_threshold , CV_max_volume, CV_min_volume, CV_mean_volume, CV_max_diametre, CV_min_diametre, CV_mean_diametre ,volume_mean_for_this_plate , volume_CV_for_this_plate , diametre_mean_for_this_plate , diametre_CV_for_this_plate 
+def group_repeta_folders(directory_source, liste_plaques):
+    """
+    Lit une seule fois le dossier source et regroupe par plaque les dossiers d'itération
+    (un dossier appartient à une plaque si son nom contient le nom de la plaque, comme dans repeta_sans_ref_v1).
+
+    Retourne un dict nom_plaque -> liste des noms de dossiers (ordre de os.scandir).
+    """
+    with os.scandir(directory_source) as entries:
+        liste_dossier_present = [entry.name for entry in entries if entry.is_dir()]
+    return {nom_plaque: [dossier for dossier in liste_dossier_present if nom_plaque in dossier]
+            for nom_plaque in liste_plaques}
+
+
+def _repeta_sans_ref_batch_plate(directory_source, liste_dossier_plaque, nom_plaque, nom_reconstruction,
+                                 directory_racine_output, CV_repeta_threshold, render):
+    """Répéta d'une plaque du batch (exécutée dans un process de la pool), chemins os.path.join."""
+    files = [os.path.join(directory_source, dossier, nom_reconstruction, 'synthese_interferometric_data.csv')
+             for dossier in liste_dossier_plaque]
+    return repeta_sans_ref_from_files(files, liste_dossier_plaque, nom_plaque,
+                                      os.path.join(directory_racine_output, nom_plaque), CV_repeta_threshold, render)
+
+
+def repeta_sans_ref_batch(directory_source, liste_plaques, nom_reconstruction, directory_racine_output,
+                          CV_repeta_threshold, workers=None, render='eager'):
+    """
+    Répéta sans référence de toute une campagne : toutes les plaques de liste_plaques, en parallèle.
+
+    Le dossier source n'est lu qu'une fois (group_repeta_folders), chaque plaque est traitée comme par
+    repeta_sans_ref_v1 (data_raw.csv et figures dans directory_racine_output/nom_plaque) dans une pool
+    de process, et les chemins sont construits avec os.path.join (Windows et Linux).
+    Les KPI de toutes les plaques sont écrits dans directory_racine_output/data_repeta_micro_depot.csv.
+
+    workers : nombre de process (None = nombre de coeurs, 1 = dans le process courant)
+    render : 'eager' ou 'none' (voir RENDER_POLICIES), 'deferred' retourne aussi la liste des PlotSpec
+    Retourne le DataFrame des KPI (colonnes REPETA_KPI_COLUMNS, une ligne par plaque dans l'ordre de liste_plaques).
+    Une plaque sans itération a nb_lecture = 0 et des KPI nan.
+    """
+    check_render_policy(render)
+    safe_mkdir(directory_racine_output)
+    dossiers_par_plaque = group_repeta_folders(directory_source, liste_plaques)
+    plaques = [nom_plaque for nom_plaque in liste_plaques if dossiers_par_plaque[nom_plaque]]
+    tasks = [(directory_source, dossiers_par_plaque[nom_plaque], nom_plaque, nom_reconstruction,
+              directory_racine_output, CV_repeta_threshold, render) for nom_plaque in plaques]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        results = [_repeta_sans_ref_batch_plate(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_repeta_sans_ref_batch_plate, *zip(*tasks)))
+    results_par_plaque = dict(zip(plaques, results))
+
+    rows = []
+    plot_specs = []
+    for nom_plaque in liste_plaques:
+        if nom_plaque not in results_par_plaque:
+            print(f"Aucune itération trouvée pour la plaque {nom_plaque} dans {directory_source}")
+            rows.append([nom_plaque, 0, CV_repeta_threshold] + [np.nan] * 7)
+            continue
+        result = results_par_plaque[nom_plaque]
+        rows.append([nom_plaque, result[0], CV_repeta_threshold] + list(result[1:8]))
+        if render == 'deferred':
+            plot_specs.extend(result[-1])
+    kpi = pandas.DataFrame(rows, columns=REPETA_KPI_COLUMNS)
+    kpi.to_csv(os.path.join(directory_racine_output, 'data_repeta_micro_depot.csv'), sep=';', index=False,
+               lineterminator='\n')
+
+    if render == 'deferred':
+        return kpi, plot_specs
+    return kpi
+
 
 def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,directory_racine_output,CV_repeta_threshold):
     # =============================================================================
@@ -515,7 +806,7 @@ def repeta_sans_ref_v1_nanofilm(directory_source,nom_plaque,nom_reconstruction,d
 
     return  nb_iteration , nb_well_over_threshold , CV_max_thickness, CV_min_thickness, CV_mean_thickness, CV_max_I4, CV_min_I4, CV_mean_I4 ,CV_max_I7, CV_min_I7, CV_mean_I7, thickness_mean_for_this_plate , thickness_CV_for_this_plate , intensity_455_mean_for_this_plate , intensity_455_CV_for_this_plate , intensity_730_mean_for_this_plate , intensity_730_CV_for_this_plate
 
-def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit):    
+def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit,render='eager'):    
 # =============================================================================
 #     le but de cette fonction est de comparer les data en volumes d'un lecteur à un autre
 #    la 1ere appli est de confronter les data ZC 3 - 4 au proto (mais ça peut servir dans d'autres config ZC to ZC...)
@@ -550,9 +841,12 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     #                   kpi
     #       -> retourne les valeurs des indicateurs et les array intéressants
     #            name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, vecteur_volume_instrument_1, vecteur_volume_instrument_2
+    #       -> render : 'eager' (figures sauvées pendant l'appel), 'deferred' (la liste des PlotSpec est
+    #            ajoutée à la fin des valeurs retournées) ou 'none' (aucune figure)
     # =============================================================================
 # =============================================================================
 
+    check_render_policy(render)
     #Debug , print tout les paramètre de la fonction
     print('nom_gp:',nom_gp)
     print('chemin_intrument_1:',chemin_intrument_1)
@@ -595,44 +889,20 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     # =============================================================================
     # la comparaison
     # =============================================================================
-    plt.close('all')   
-    Matrix_volume_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_volume_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max))        
-    Matrix_volume_ratio = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_diametre_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-    Matrix_diametre_difference_relative = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-
-    Matrix_nb_dot_utile_pourcent_difference = np.zeros((number_of_letters_max,number_of_colonne_number_max))    
-
-#    fichier de sortie des data raw
-    fichier_save = open(directory_plaque_to_save+'\\data_comparative'+type_intrument_1+'_'+type_intrument_2+'.csv','w')
-    fichier_save.write('weel;V_instrument_1;D_instrument_1;V_instrument_2;D_instrument_2;\n')
-
     # calcul des différences selon le schéma: 1 - 2 par défaut et 2 la référence pour les relatives
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-            Matrix_volume_difference[j_letter,j_col] = np.copy(volume_instrument_1[j_letter,j_col] - volume_instrument_2[j_letter,j_col])
-#            prise en compte du cas patholoque ou on doit diviser par 0
-            if volume_instrument_2[j_letter,j_col] != 0:
-                Matrix_volume_difference_relative[j_letter,j_col] = np.copy((volume_instrument_1[j_letter,j_col] - volume_instrument_2[j_letter,j_col])/volume_instrument_2[j_letter,j_col] *100)
-                Matrix_volume_ratio[j_letter,j_col] =np.copy(volume_instrument_1[j_letter,j_col] / volume_instrument_2[j_letter,j_col])
-            else:
-                Matrix_volume_difference_relative[j_letter,j_col] = np.nan
-                Matrix_volume_ratio[j_letter,j_col] = np.nan
-
-            Matrix_diametre_difference[j_letter,j_col] = np.copy(diametre_instrument_1[j_letter,j_col] - diametre_instrument_2[j_letter,j_col] )
-            if diametre_instrument_2[j_letter,j_col] != 0:
-               Matrix_diametre_difference_relative[j_letter,j_col]  = np.copy((diametre_instrument_1[j_letter,j_col] - diametre_instrument_2[j_letter,j_col] ) / diametre_instrument_2[j_letter,j_col] *100)
-            else:
-                Matrix_diametre_difference_relative[j_letter,j_col] = np.nan
+    comparaison = comparaison_ZC_to_ref_kernel(volume_instrument_1, diametre_instrument_1, porcent_dot_keep_instrument_1,
+                                               volume_instrument_2, diametre_instrument_2, porcent_dot_keep_instrument_2,
+                                               tolerance_relative_fit)
+    Matrix_volume_difference = comparaison['Matrix_volume_difference']
+    Matrix_volume_difference_relative = comparaison['Matrix_volume_difference_relative']
+    Matrix_volume_ratio = comparaison['Matrix_volume_ratio']
+    Matrix_diametre_difference = comparaison['Matrix_diametre_difference']
+    Matrix_diametre_difference_relative = comparaison['Matrix_diametre_difference_relative']
 
-            Matrix_nb_dot_utile_pourcent_difference[j_letter,j_col] = np.copy(porcent_dot_keep_instrument_1[j_letter,j_col] - porcent_dot_keep_instrument_2[j_letter,j_col]) 
-            fichier_save.write(alphabet_majuscule[j_letter]+str(j_col+1)+';'+str(volume_instrument_1[j_letter,j_col])+';'+str(diametre_instrument_1[j_letter,j_col])+';'+str(volume_instrument_2[j_letter,j_col])+';'+str(diametre_instrument_2[j_letter,j_col])+';\n')
-            j_col += 1
-        j_letter += 1
-    fichier_save.close()
+#    fichier de sortie des data raw
+    write_wells_csv(directory_plaque_to_save+'\\data_comparative'+type_intrument_1+'_'+type_intrument_2+'.csv',
+                    'weel;V_instrument_1;D_instrument_1;V_instrument_2;D_instrument_2;',
+                    np.stack([volume_instrument_1, diametre_instrument_1, volume_instrument_2, diametre_instrument_2], axis=-1))
 
 # présentation des différences calculées selon des colormaps    
     #affiche_colormap_etude_general(Matrix_volume_difference,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\nMatrix_volume_difference','RdGy',np.nanmin(Matrix_volume_difference),np.nanmax(Matrix_volume_difference))
@@ -650,121 +920,12 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
     #affiche_colormap_etude_general(Matrix_diametre_difference_relative,name_dossier_instrument_1+'\n'+type_intrument_1+' vs '+type_intrument_2+'\n Matrix_diametre_difference_relative','cool',np.nanmin(Matrix_diametre_difference_relative),np.nanmax(Matrix_diametre_difference_relative))
     #plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+'Matrix_diametre_difference_relative.jpg')
 
-# mise sous forme de vecteur des volumes et diamètres pour fiter     
-
-    vecteur_volume_instrument_1 = np.zeros(96)
-    vecteur_volume_instrument_2 = np.zeros(96)
-    vecteur_ratio = np.zeros(96)
-    vecteur_diametre_instrument_1 = np.zeros(96)
-    vecteur_diametre_instrument_2 = np.zeros(96)
-
-    # initialisation du masque à tous les puits = true
-    mask_volumes_proches = vecteur_ratio <1 
-    mask_volumes_eloignes = vecteur_ratio>1
-    mask_nan =  vecteur_ratio>1
-
-    j_letter = 0
-    while j_letter<number_of_letters_max:
-        j_col = 0
-        while j_col<number_of_colonne_number_max:
-            index_inside_vector = int(12*(j_letter)+(j_col))
-            vecteur_volume_instrument_1[index_inside_vector] = np.copy(volume_instrument_1[j_letter,j_col]) 
-            vecteur_volume_instrument_2[index_inside_vector] = np.copy(volume_instrument_2[j_letter,j_col]) 
-            vecteur_ratio[index_inside_vector] = np.copy(Matrix_volume_difference_relative[j_letter,j_col])
-            vecteur_diametre_instrument_1[index_inside_vector] = np.copy(diametre_instrument_1[j_letter,j_col]) 
-            vecteur_diametre_instrument_2[index_inside_vector] = np.copy(diametre_instrument_2[j_letter,j_col]) 
-            j_col += 1
-        j_letter += 1
-
-# filtre très grossier pour ne pas prendre les outliers dans le calcul du fit    
-    tolerance = 20    
-    j_pos = 0
-    while j_pos<96:
-        if np.abs(vecteur_ratio[j_pos])>tolerance:
-            mask_volumes_proches[j_pos] = False
-            mask_volumes_eloignes[j_pos] = True
-        if np.isnan(vecteur_ratio[j_pos]):
-            mask_volumes_proches[j_pos] = False
-            mask_volumes_eloignes[j_pos] = True
-            mask_nan[j_pos] = True
-        j_pos +=1
-
-#    nb de puits utiles pour le fit
-    nb_puits_trop_loins = np.sum(mask_volumes_eloignes) - np.sum(mask_nan)
-    # To keep
-    plt.close(10)
-    plt.figure(10,figsize=(12,6))
-    plt.suptitle(name_dossier_instrument_1+' volumes par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n ')#\n'
-    plt.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'o',color='blue',label='data utile au fit')
-    plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='outlier')
-    plt.plot(np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2)),np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2)),label='bissectrice = target',color='k')
-    plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-    plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-    plt.legend()
-    plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits.jpg')
-
-    mask_volumes_eloignes_fit = vecteur_volume_instrument_2 >0 
-#calcul du fit sur les volumes 
-    if True in mask_volumes_proches:
-        x_considere_fit_lin_inverse = vecteur_volume_instrument_2[mask_volumes_proches]
-        y_considere_fit_lin_inverse = vecteur_volume_instrument_1[mask_volumes_proches]
-        slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = stats.linregress(x_considere_fit_lin_inverse,y_considere_fit_lin_inverse)
-        representation_x = np.arange(np.nanmin(vecteur_volume_instrument_2),np.nanmax(vecteur_volume_instrument_2),(np.nanmax(vecteur_volume_instrument_2)-np.nanmin(vecteur_volume_instrument_2))/50)
-
-        # To keep
-        data_fit = slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse
-    # représentation graphique du fit    
-        plt.close(15)
-        plt.figure(15,figsize=(12,6))
-        plt.suptitle(name_dossier_instrument_1+' FIT\nvolumes par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(nb_puits_trop_loins)+' puits exclus pour le calcul du fit')#\n'
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'+',color='blue',label='data utile pour fit')
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='data exclue pour fit')
-        plt.plot(vecteur_volume_instrument_2,slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse,color='#000080',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-        plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-        plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-        plt.legend()    
-        plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_FIT.jpg')
-    else:
-        slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, p_value_fit_inverse, std_err_fit_inverse = stats.linregress(vecteur_volume_instrument_2,vecteur_volume_instrument_1)
-        data_fit = slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse
-    # représentation graphique du fit    
-        plt.close(15)
-        plt.figure(15,figsize=(12,6))
-        plt.suptitle(name_dossier_instrument_1+' FIT\nvolumes par puits '+type_intrument_1+' vs '+type_intrument_2 +'\n '+str(nb_puits_trop_loins)+' puits exclus pour le calcul du fit')#\n'
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_proches],vecteur_volume_instrument_1[mask_volumes_proches],'+',color='blue',label='data utile pour fit')
-        plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes],vecteur_volume_instrument_1[mask_volumes_eloignes],'rx',label='data exclue pour fit')
-        plt.plot(vecteur_volume_instrument_2,slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse,color='#000080',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-        plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-        plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-        plt.legend()    
-        plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_FIT.jpg')
-# calcul de l'écart data - fit et mask en fct du seuillage de l'écart tolérable
-    j_pos = 0
-    while j_pos<96:
-        if vecteur_volume_instrument_1[j_pos] != 0:
-            ecart_au_fit = 100 * np.abs(data_fit[j_pos] - vecteur_volume_instrument_1[j_pos])/vecteur_volume_instrument_1[j_pos]
-        else:
-            ecart_au_fit = 0     
-        if ecart_au_fit>tolerance_relative_fit:
-            mask_volumes_eloignes_fit[j_pos] = True
-        else:
-            mask_volumes_eloignes_fit[j_pos] = False
-        j_pos +=1
-
-# indicateur de la qualité des data vs fit       
-    nb_puits_loin_fit = np.sum(mask_volumes_eloignes_fit)
-
-#  figure avec représentation des points ok ko vis à vis du fit    
-    plt.close(10)
-    plt.figure(10,figsize=(12,6))
-    plt.suptitle(name_dossier_instrument_1+' volumes par puits '+type_intrument_2+' vs '+type_intrument_1 +'\n nb puits loin du fit ='+str(nb_puits_loin_fit)+' tolerance ='+str(tolerance_relative_fit))#\n'
-    plt.plot(vecteur_volume_instrument_2,vecteur_volume_instrument_1,'v',color='green',label='data proche fit')
-    plt.plot(vecteur_volume_instrument_2[mask_volumes_eloignes_fit],vecteur_volume_instrument_1[mask_volumes_eloignes_fit],'rx',label='data loin fit')
-    plt.plot(vecteur_volume_instrument_2,slope_fit_inverse*vecteur_volume_instrument_2+intercept_fit_inverse,color='k',linestyle = '-',label='slope='+str(round(slope_fit_inverse,2))+'\nord='+str(round(intercept_fit_inverse,2))+'\nR²'+str(round(r_value_fit_inverse,4)))
-    plt.xlabel('V issu stat µm^3  '+type_intrument_2)
-    plt.ylabel('V issu stat µm^3  '+type_intrument_1)
-    plt.legend()
-    plt.savefig(directory_plaque_to_save+'\\'+name_dossier_to_save+' volumes par puits_fit.jpg')
+    plot_specs = []
+    apply_render_policy(render, plot_specs, plot_comparaison_ZC_to_ref,
+                        comparaison=comparaison, name_dossier_instrument_1=name_dossier_instrument_1,
+                        type_intrument_1=type_intrument_1, type_intrument_2=type_intrument_2,
+                        directory_plaque_to_save=directory_plaque_to_save, name_dossier_to_save=name_dossier_to_save,
+                        tolerance_relative_fit=tolerance_relative_fit)
 
 #    assemblage des figures de dotmaps et colormaps
     # merge_two_figure([directory_source_synthese_instrument_1,directory_source_synthese_instrument_2],name_dossier_instrument_1,['dot_map_730.png','dot_map_730.png'],directory_plaque_to_save)
@@ -796,20 +957,28 @@ def comparaison_ZC_to_ref_v1(nom_gp,chemin_intrument_1,type_intrument_1,chemin_i
 
     # copyfile(directory_source_synthese_instrument_1+'\\dot_map_cycle_730.png',directory_plaque_to_save+'\\dot_map_cycle_730'+type_intrument_1+'.png')
     # copyfile(directory_source_synthese_instrument_2+'\\dot_map_cycle_730.png',directory_plaque_to_save+'\\dot_map_cycle_730'+type_intrument_2+'.png')
-#   calcul de moyenneset ecarts types des différences en volumes et diametres
-    Matrix_volume_difference_relative_mean = np.nanmean(Matrix_volume_difference_relative)
-    Matrix_volume_difference_relative_std = np.nanstd(Matrix_volume_difference_relative)    
-    Matrix_volume_difference_relative_CV = np.copy(100*Matrix_volume_difference_relative_std/Matrix_volume_difference_relative_mean)
-    Matrix_diametre_difference_relative_mean =np.nanmean(Matrix_diametre_difference_relative)
-    Matrix_diametre_difference_relative_std =np.nanstd(Matrix_diametre_difference_relative)
-    Matrix_diametre_difference_relative_CV = np.copy(100*Matrix_diametre_difference_relative_std/Matrix_diametre_difference_relative_mean)
+    nb_puits_trop_loins = comparaison['nb_puits_trop_loins']
+    slope_fit_inverse = comparaison['slope_fit_inverse']
+    intercept_fit_inverse = comparaison['intercept_fit_inverse']
+    r_value_fit_inverse = comparaison['r_value_fit_inverse']
+    nb_puits_loin_fit = comparaison['nb_puits_loin_fit']
+    vecteur_volume_instrument_1 = comparaison['vecteur_volume_instrument_1']
+    vecteur_volume_instrument_2 = comparaison['vecteur_volume_instrument_2']
+#   moyennes et ecarts types des différences en volumes et diametres
+    Matrix_volume_difference_relative_mean = comparaison['Matrix_volume_difference_relative_mean']
+    Matrix_volume_difference_relative_CV = comparaison['Matrix_volume_difference_relative_CV']
+    Matrix_diametre_difference_relative_mean = comparaison['Matrix_diametre_difference_relative_mean']
+    Matrix_diametre_difference_relative_CV = comparaison['Matrix_diametre_difference_relative_CV']
 #   fichier de sortie avec les KPI ( To keep)
     fichier_out = open(directory_plaque_to_save+'\\data_extraite_KPI_'+type_intrument_1+'_'+type_intrument_2+'.csv','w')
     fichier_out.write('name_plate;nb_puits_utiles_pour_fit;fit lineaire_x=;y=;slope;intercept;R²;nb_puits_loin_du_fit;tolerance vis a vis du fit;Matrix_volume_difference_relative_mean;Matrix_volume_difference_relative_CV;Matrix_diametre_difference_relative_mean;Matrix_diametre_difference_relative_CV;\n')
     fichier_out.write(name_dossier_to_save+';'+str(nb_puits_trop_loins)+';'+type_intrument_1+';'+type_intrument_2+';'+str(slope_fit_inverse)+';'+str(intercept_fit_inverse)+';'+str(r_value_fit_inverse)+';'+str(nb_puits_loin_fit)+';'+str(tolerance_relative_fit)+';'+str(Matrix_volume_difference_relative_mean)+';'+str(Matrix_volume_difference_relative_CV)+';'+str(Matrix_diametre_difference_relative_mean)+';'+str(Matrix_diametre_difference_relative_CV)+'\n')    
     fichier_out.close()
 
-    return name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, Matrix_volume_difference_relative_mean , Matrix_volume_difference_relative_CV , Matrix_diametre_difference_relative_mean , Matrix_diametre_difference_relative_CV , vecteur_volume_instrument_1, vecteur_volume_instrument_2
+    results = (name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, Matrix_volume_difference_relative_mean , Matrix_volume_difference_relative_CV , Matrix_diametre_difference_relative_mean , Matrix_diametre_difference_relative_CV , vecteur_volume_instrument_1, vecteur_volume_instrument_2)
+    if render == 'deferred':
+        return results + (plot_specs,)
+    return results
 
 def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1,chemin_intrument_2,type_intrument_2,directory_racine_to_save,name_dossier_to_save,tolerance_relative_fit):    
 # =============================================================================
@@ -1075,22 +1244,402 @@ def comparaison_ZC_to_ref_v1_nanofilm(nom_gp,chemin_intrument_1,type_intrument_1
     return name_dossier_to_save, slope_fit_inverse, intercept_fit_inverse, r_value_fit_inverse, nb_puits_loin_fit, Matrix_thickness_difference_relative_mean , Matrix_thickness_difference_relative_CV , vecteur_thickness_instrument_1, vecteur_thickness_instrument_2
 
 
-def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisition_name_instrument_1,onglet,directory_source_instrument_2,type_instrument_2,acquisition_name_instrument_2,directory_to_save):        
+def read_well_results_sheet_rows(workbook, onglet):
+    """
+    Lignes d'un onglet d'un classeur WellResults (comme pandas.read_excel(chemin, sheet_name=onglet).values.tolist()).
 
-    # =============================================================================
-    ''' BUT '''
-    # le but de cette fonction est de comparer les données enzymologiques entre deux acquisitions :
-    # une acquisition avec la machine de référence (type_instrument_1) et l'autre acquisition avec 
-    # la machine à valider (type_instrument_2).
-    # =============================================================================
-    #     # autheur : Hubert Goddefroy
-    #     # 06/04/22 : fonction développée dans le cadre de la validation métrologique des Zymocubes
-    #     # nécessite le module home_made_tools_v2.py 
-    # =============================================================================
-    #
-    ''' ENTREES '''
-    # directory_source_instrument_1 : pointe vers le dossier contenant toutes les
-    # acquisitions de la machine de référence.
+    workbook : chemin du WellResults.xlsx (lu une seule fois grâce au cache de getWellResultsWorkbook)
+               ou WellResultsWorkbook déjà ouvert
+    """
+    return getWellResultsWorkbook(workbook).get_sheet(onglet).values.tolist()
+
+
+# % de dégradation d'intérêt des comparaisons enzymo (sensibilité = activité à 50%)
+POURCENTAGES_DEG = (30, 50, 70)
+
+# inverses des fits des en-têtes WellResults : type de fit -> (nombre de paramètres, activité (U/mL) donnant
+# y % de dégradation en fonction de y et des paramètres alpha, beta[, gamma[, delta]])
+FIT_INVERSES = {
+    'Linear': (2, lambda y, alpha, beta: (y-beta)/alpha),
+    'Exponential plateau 1': (2, lambda y, alpha, beta: -log(1-y/alpha)/beta),
+    'Exponential plateau 2': (3, lambda y, alpha, beta, gamma: -log(1-(y-gamma)/alpha)/beta),
+    'Logistic 1': (2, lambda y, alpha, beta: (y*beta)/(alpha-y)),
+    'Logistic 2': (3, lambda y, alpha, beta, gamma: (y-gamma)*beta/(alpha-y)),
+    'Logistic 3': (4, lambda y, alpha, beta, gamma, delta: ((y-gamma)*(beta**delta)/(alpha-y))**(1/delta)),
+}
+
+
+def fit_parameters_from_entete(Entete):
+    """
+    Type de fit et paramètres (alpha, beta[, gamma[, delta]]) de l'en-tête d'un onglet WellResults :
+    type en Entete[1][1], paramètres en Entete[2][1], Entete[3][1], ...
+    """
+    fit_type = Entete[1][1]
+    if fit_type not in FIT_INVERSES:
+        raise ValueError(f"Type de fit inconnu: {fit_type} (types disponibles: {list(FIT_INVERSES)})")
+    return fit_type, [float(Entete[2 + j][1]) for j in range(FIT_INVERSES[fit_type][0])]
+
+
+def inverse_fit_activities(fit_type, parameters, pourcentages_deg):
+    """
+    Rétro-calcul du fit (forme fermée) : array des activités (U/mL) donnant chacun des % de dégradation.
+
+    L'activité vaut nan là où l'inverse n'existe pas : pente nulle, log d'un nombre négatif ou nul, asymptote
+    atteinte, puissance non réelle pour le Logistic 3. Les formules sont évaluées en flottants Python
+    (mêmes arrondis que les rétro-calculs historiques de compare_enzymo_2_ref).
+    """
+    inverse = FIT_INVERSES[fit_type][1]
+    activites = []
+    for y in pourcentages_deg:
+        try:
+            activite = inverse(y, *parameters)
+        except (ZeroDivisionError, ValueError, OverflowError):
+            activite = np.nan
+        activites.append(np.nan if isinstance(activite, complex) else activite)
+    return np.array(activites, dtype=float)
+
+
+def gamme_column(Gamme, j_colonne):
+    """Colonne numérique des lignes de gamme d'un onglet WellResults (cellules vides '' -> nan)."""
+    return np.array([np.nan if ligne[j_colonne] == '' else float(ligne[j_colonne]) for ligne in Gamme], dtype=float)
+
+
+def gamme_non_exclus(Gamme):
+    """Masque des lignes de gamme dont le puits n'est pas exclu (colonne Exclusion à 'False')."""
+    return np.array([ligne[4] == 'False' for ligne in Gamme], dtype=bool)
+
+
+def nearest_dilutions(activites_gamme, activites_cibles, ecart_max=1000):
+    """
+    Pour chaque activité cible, activité théorique de la gamme la plus proche (premier puits en cas d'égalité).
+    Sans activité à moins de ecart_max (ou cible nan), l'activité du premier puits de la gamme est retenue.
+    """
+    activites_gamme = np.asarray(activites_gamme, dtype=float)
+    ecarts = np.abs(activites_gamme[None, :] - np.asarray(activites_cibles, dtype=float)[:, None])
+    ecarts[np.isnan(ecarts)] = np.inf
+    indices = np.argmin(ecarts, axis=1) if activites_gamme.size else np.zeros(len(ecarts), dtype=int)
+    trouve = ecarts[np.arange(len(ecarts)), indices] < ecart_max if activites_gamme.size else False
+    return activites_gamme[np.where(trouve, indices, 0)]
+
+
+def replicate_cv(deg, masks):
+    """
+    CV (%) des réplicats : pour chaque ligne de masks, écart-type (population) * 100 / moyenne
+    des dégradations non nan sélectionnées (nan s'il n'y en a aucune). Retourne une liste de floats.
+    """
+    selection = np.asarray(masks, dtype=bool) & ~np.isnan(deg)
+    nb_replicats = selection.sum(axis=1)
+    # sommes séquentielles (cumsum, les puits non sélectionnés comptent pour 0) : mêmes arrondis
+    # que l'accumulation historique puits par puits
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moyenne = np.cumsum(np.where(selection, deg, 0.0), axis=1)[:, -1]/nb_replicats
+        ecarts = np.where(selection, deg - moyenne[:, None], 0.0)
+        ecartype = np.sqrt(np.cumsum(ecarts**2, axis=1)[:, -1]/nb_replicats)
+        cv = ecartype*100/moyenne
+    return np.where(nb_replicats > 0, cv, np.nan).tolist()
+
+
+class EnzymoAreaComparison:
+    """
+    Résultat de la comparaison enzymo d'une area (onglet) entre la machine de référence et la machine à valider.
+
+    reference, validation : indicateurs de chaque acquisition (acquisition, machine, lod, loq, sensibilite,
+                            cv_deg_30, cv_deg_50, cv_deg_70, echantillons = liste de (activite, rsd))
+    differences : différences relatives en % de la validation par rapport à la référence (mêmes clés,
+                  echantillons = liste de (diff activite, diff rsd))
+    data_R, data_V : listes historiques retournées par compare_enzymo_2_ref (lignes du csv data_compar_enzymo_2_ref)
+    plot_specs : figures à rendre si la comparaison a été faite avec render='deferred'
+    error : message d'erreur si la comparaison de cette area a échoué (les autres attributs valent alors None)
+    """
+
+    INDICATEURS = ('lod', 'loq', 'sensibilite', 'cv_deg_30', 'cv_deg_50', 'cv_deg_70')
+
+    def __init__(self, onglet, data_R=None, data_V=None, plot_specs=None, error=None):
+        self.onglet = onglet
+        self.data_R = data_R
+        self.data_V = data_V
+        self.plot_specs = plot_specs if plot_specs is not None else []
+        self.error = error
+        self.reference = None
+        self.validation = None
+        self.differences = None
+        if error is None:
+            # data_V : 9 valeurs, 2 par échantillon, 6 différences puis 2 différences par échantillon
+            nb_echantillons_V = (len(data_V) - 15) // 4
+            self.reference = self._indicateurs(data_R[:9], data_R[9:])
+            self.validation = self._indicateurs(data_V[:9], data_V[9:9 + 2*nb_echantillons_V])
+            differences = data_V[9 + 2*nb_echantillons_V:]
+            self.differences = dict(zip(self.INDICATEURS, differences[:6]))
+            self.differences['echantillons'] = list(zip(differences[6::2], differences[7::2]))
+
+    @classmethod
+    def _indicateurs(cls, base, echantillons):
+        indicateurs = {'acquisition': base[0], 'machine': base[1]}
+        indicateurs.update(zip(cls.INDICATEURS, base[3:9]))
+        indicateurs['echantillons'] = list(zip(echantillons[0::2], echantillons[1::2]))
+        return indicateurs
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f"EnzymoAreaComparison({self.onglet!r}, {'ok' if self.ok else self.error})"
+
+
+class _NpNan:
+    """
+    Marque np.nan dans les lignes envoyées aux process de la pool : les lignes vides sont reconnues par
+    comparaison à [np.nan, ...], qui repose sur l'identité de np.nan, que le pickle ne conserve pas.
+    """
+
+
+def _mark_np_nan(rows):
+    return [[_NpNan() if value is np.nan else value for value in row] for row in rows]
+
+
+def _restore_np_nan(rows):
+    return [[np.nan if isinstance(value, _NpNan) else value for value in row] for row in rows]
+
+
+def _compare_enzymo_2_ref_area(results_Reference, results_Validation, type_instrument_1, acquisition_name_instrument_1,
+                               onglet, type_instrument_2, acquisition_name_instrument_2, directory_to_save, render,
+                               marked_np_nan=False):
+    """
+    Comparaison enzymo d'une area (exécutée dans un process de la pool de compare_enzymo_2_ref_areas).
+    marked_np_nan : les lignes ont été passées par _mark_np_nan
+    """
+    if marked_np_nan:
+        results_Reference = _restore_np_nan(results_Reference)
+        results_Validation = _restore_np_nan(results_Validation)
+    try:
+        result = compare_enzymo_2_ref_rows(results_Reference, results_Validation, type_instrument_1,
+                                           acquisition_name_instrument_1, onglet, type_instrument_2,
+                                           acquisition_name_instrument_2, directory_to_save, render)
+    except Exception as e:
+        return EnzymoAreaComparison(onglet, error=f"{type(e).__name__}: {e}")
+    return EnzymoAreaComparison(onglet, *result)
+
+
+def compare_enzymo_2_ref_areas(workbook_reference, type_instrument_1, acquisition_name_instrument_1,
+                               workbook_validation, type_instrument_2, acquisition_name_instrument_2,
+                               directory_to_save, onglets=None, render='eager', workers=1):
+    """
+    compare_enzymo_2_ref sur toutes les areas en un seul passage : chaque classeur WellResults est lu une seule fois.
+
+    workbook_reference, workbook_validation : WellResultsWorkbook déjà ouverts ou chemins des WellResults.xlsx
+                                              (ouverts via le cache partagé getWellResultsWorkbook)
+    onglets : areas à comparer (par défaut tous les onglets du classeur de référence)
+    workers : nombre de process (1 = dans le process courant, None = nombre de coeurs). Les areas sont
+              indépendantes : en parallèle, la comparaison dure à peu près le temps de l'area la plus longue.
+    Retourne une liste d'EnzymoAreaComparison, une par onglet dans l'ordre des onglets quel que soit workers.
+    Une area en erreur n'arrête pas les suivantes : son erreur est dans EnzymoAreaComparison.error.
+    """
+    check_render_policy(render)
+    workbook_reference = getWellResultsWorkbook(workbook_reference)
+    workbook_validation = getWellResultsWorkbook(workbook_validation)
+    if onglets is None:
+        onglets = workbook_reference.sheet_names
+
+    # lecture des onglets dans ce process (classeurs en cache), calculs des areas dans la pool
+    comparisons = [None] * len(onglets)
+    tasks = []
+    for j_onglet, onglet in enumerate(onglets):
+        try:
+            rows = (read_well_results_sheet_rows(workbook_reference, onglet),
+                    read_well_results_sheet_rows(workbook_validation, onglet))
+        except Exception as e:
+            comparisons[j_onglet] = EnzymoAreaComparison(onglet, error=f"{type(e).__name__}: {e}")
+            continue
+        tasks.append((j_onglet, rows, (type_instrument_1, acquisition_name_instrument_1, onglet, type_instrument_2,
+                                       acquisition_name_instrument_2, directory_to_save, render)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        results = [_compare_enzymo_2_ref_area(*rows, *arguments) for _, rows, arguments in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_compare_enzymo_2_ref_area, *[_mark_np_nan(sheet_rows) for sheet_rows in rows],
+                                       *arguments, marked_np_nan=True)
+                       for _, rows, arguments in tasks]
+            results = [future.result() for future in futures]
+    for (j_onglet, _, _), comparison in zip(tasks, results):
+        comparisons[j_onglet] = comparison
+    return comparisons
+
+
+def plot_compare_enzymo_2_ref(Gamme_R, Gamme_V, type_instrument_1, type_instrument_2, acquisition_name_instrument_2, onglet, directory_to_save, profile=None):
+    """
+    Figures de compare_enzymo_2_ref : taux de dégradation de l'instrument 2 en fonction de l'instrument 1
+    et gammes moyennes des deux instruments, sauvées en png dans directory_to_save.
+    Retourne la liste des fichiers sauvés.
+
+    Gamme_R, Gamme_V : lignes de la section gamme du WellResults (référence, à valider)
+    profile : profil de rendu de figure_renderer (taille, dpi et format), figures telles quelles si None
+    """
+    ## Graphique % de dégradation de l'Instrument 2 (à valider) en fonction de l'instrument 1 : notre référence.
+    paths = [directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_taux_degradation.png',
+             directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_Gammes.png']
+
+    deg_REF = []
+    deg_VALID = []
+    for k in range(len(Gamme_R)):
+        if (Gamme_R[k][4] == 'False' and Gamme_V[k][4] == 'False') and (Gamme_R[k][0] == Gamme_V[k][0]):
+            deg_REF.append(float(Gamme_R[k][2]))
+            deg_VALID.append(float(Gamme_V[k][2]))
+
+
+    # To keep
+    if len(deg_REF) > 0:
+
+        # print('\n\n\ndeg_REF : \n\n',deg_REF)
+        # print('\n\n\ndeg_VALID : \n\n',deg_VALID)
+
+        fig = new_figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        fig.suptitle('Comparaison des taux de dégradation\npour les gammes au ' + type_instrument_1 + ' et au ' + type_instrument_2 + '\n' + acquisition_name_instrument_2 + ' ' + onglet)
+        ax.plot(deg_REF,deg_VALID,'o',color='blue')
+        ax.plot(np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),label='bissectrice = target',color='k')
+        ax.set_xlabel('% de dégradation au ' + type_instrument_1)
+        ax.set_ylabel('% de dégradation au ' + type_instrument_2)
+        ax.legend()
+        paths[0] = save_figure(fig, paths[0], profile)
+
+        ## tout ce qui est noté P dans la suite est équivalent à R (R pour référence
+        ## et avant le Proto était la référence)
+        ## Tout ce qui est noté Z dans la suite est équivalent à V(Z pour ZC qui était
+        ## la machine à Valider)
+        ##
+        ## ici je trace le graphique des deux gammes des machines de référence et à valider
+
+        ecart = 0.1 # obligé de mettre une tolérance pour les tests d'égalité en activité enzymatique car on peut avoir 22,009 et 22,094 pour un même point de gamme
+        abscisses_P = []
+        for k in range(len(Gamme_R)):
+            indic = 0
+            if Gamme_R[k][3] != '':
+                for j in range(len(abscisses_P)):
+                    if (abscisses_P[j] - ecart < float(Gamme_R[k][3])) and  (float(Gamme_R[k][3]) < abscisses_P[j] + ecart):
+                        indic = 1
+                if indic == 0:
+                    abscisses_P.append(float(Gamme_R[k][3]))
+
+        gamme_moyenne_P = []
+        for k in range(len(abscisses_P)):
+            gamme_moyenne_P.append([abscisses_P[k]])
+        for k in range(len(Gamme_R)):
+            if Gamme_R[k][3] != '':
+                for j in range(len(gamme_moyenne_P)):
+                    if (gamme_moyenne_P[j][0] - ecart < float(Gamme_R[k][3]) < gamme_moyenne_P[j][0] + ecart) and Gamme_R[k][4] == 'False':
+                        gamme_moyenne_P[j].append(float(Gamme_R[k][2]))
+        for k in range(len(gamme_moyenne_P)):
+            if len(gamme_moyenne_P[k]) > 1:
+                gamme_moyenne_P[k].append(sum(gamme_moyenne_P[k][1:])/(len(gamme_moyenne_P[k])-1))
+                gamme_moyenne_P[k].append(statistics.pstdev(gamme_moyenne_P[k][1:-1]))
+
+        gamme_moyenne_Z = []
+        for k in range(len(abscisses_P)):
+            gamme_moyenne_Z.append([abscisses_P[k]])
+        for k in range(len(Gamme_V)):
+            for j in range(len(gamme_moyenne_Z)):
+                if Gamme_V[k][3] != '': # nouveau
+                    if float(Gamme_V[k][3]) == gamme_moyenne_Z[j][0] and Gamme_V[k][4] == 'False':
+                        gamme_moyenne_Z[j].append(float(Gamme_V[k][2]))
+        for k in range(len(gamme_moyenne_Z)):
+            if len(gamme_moyenne_Z[k]) > 1:
+                gamme_moyenne_Z[k].append(sum(gamme_moyenne_Z[k][1:])/(len(gamme_moyenne_Z[k])-1))
+                gamme_moyenne_Z[k].append(statistics.pstdev(gamme_moyenne_Z[k][1:-1]))
+
+        for k in range(len(gamme_moyenne_P)):
+            if len(gamme_moyenne_P[k]) == 1:
+                gamme_moyenne_P[k].append(0)
+                gamme_moyenne_P[k].append(0)
+            if len(gamme_moyenne_Z[k]) == 1:
+                gamme_moyenne_Z[k].append(0)
+                gamme_moyenne_Z[k].append(0)
+
+        mask = []
+        for k in range(len(gamme_moyenne_P)):
+            if len(gamme_moyenne_P[k]) == 1 and len(gamme_moyenne_Z[k]) == 1:
+                mask.append(k)
+
+        Abscisses_Gamme = []
+        Y_Gamme_P = []
+        Y_Gamme_Z = []
+        Y_Error_P = []
+        Y_Error_Z = []
+
+        for k in range(len(abscisses_P)):
+            if k not in mask:
+                Abscisses_Gamme.append(abscisses_P[k])
+                Y_Gamme_P.append(gamme_moyenne_P[k][-2])
+                Y_Gamme_Z.append(gamme_moyenne_Z[k][-2])
+                Y_Error_P.append(gamme_moyenne_P[k][-1])
+                Y_Error_Z.append(gamme_moyenne_P[k][-1])
+
+        fig = new_figure()
+        ax = fig.add_subplot()
+        ax.set_title('Gammes comparées de ' + type_instrument_1 + ', la référence et de\n' + type_instrument_2 + ', la machine à valider\n' + acquisition_name_instrument_2 + ' ' + onglet)
+
+        # print('\n\n\nY_Gamme_P : \n\n',Y_Gamme_P)
+        # print('\n\n\nY_Gamme_Z : \n\n',Y_Gamme_Z)
+
+        ax.plot(Abscisses_Gamme,Y_Gamme_P,'o',color = 'red', label = type_instrument_1)
+        ax.errorbar(Abscisses_Gamme,Y_Gamme_P,yerr = Y_Error_P,fmt = 'none', capsize = 6, ecolor = 'red', zorder = 1)
+        ax.plot(Abscisses_Gamme,Y_Gamme_Z,'o',color = 'blue', label = type_instrument_2)
+        ax.errorbar(Abscisses_Gamme,Y_Gamme_Z,yerr = Y_Error_Z,fmt = 'none', capsize = 6, ecolor = 'blue', zorder = 1)
+
+        ax.set_xlabel('Activité des points de gamme (U/mL)')
+        ax.set_ylabel('Z.U.')
+        ax.legend()
+
+        paths[1] = save_figure(fig, paths[1], profile)
+    else:
+        fig = new_figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.text(
+            0.5,
+            0.5,
+            'Aucune donnee commune exploitable pour tracer le taux de degradation',
+            ha='center',
+            va='center',
+            wrap=True
+        )
+        ax.axis('off')
+        paths[0] = save_figure(fig, paths[0], profile)
+
+        fig = new_figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.text(
+            0.5,
+            0.5,
+            'Aucune donnee commune exploitable pour tracer les gammes',
+            ha='center',
+            va='center',
+            wrap=True
+        )
+        ax.axis('off')
+        paths[1] = save_figure(fig, paths[1], profile)
+    return paths
+
+
+def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisition_name_instrument_1,onglet,directory_source_instrument_2,type_instrument_2,acquisition_name_instrument_2,directory_to_save,render='eager'):        
+
+    # =============================================================================
+    ''' BUT '''
+    # le but de cette fonction est de comparer les données enzymologiques entre deux acquisitions :
+    # une acquisition avec la machine de référence (type_instrument_1) et l'autre acquisition avec 
+    # la machine à valider (type_instrument_2).
+    # =============================================================================
+    #     # autheur : Hubert Goddefroy
+    #     # 06/04/22 : fonction développée dans le cadre de la validation métrologique des Zymocubes
+    #     # nécessite le module home_made_tools_v2.py 
+    # =============================================================================
+    #
+    ''' ENTREES '''
+    # directory_source_instrument_1 : pointe vers le dossier contenant toutes les
+    # acquisitions de la machine de référence.
     #
     # type_instrument_1 : machine de référence à laquelle sera comparée la machine 
     # en cours de validation.
@@ -1141,6 +1690,9 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
     # diff % RSD Ech_1 (%) (autant de fois qu'il y a d'échantillons différents 
     # déclarés dans le plan de plaque);
     #
+    # render : 'eager' (figures sauvées pendant l'appel), 'deferred' (une 3e valeur est retournée :
+    # la liste des PlotSpec des figures) ou 'none' (aucune figure)
+    #
     ''' ARCHITECTURE DE DONNEES '''
     # dossier contenant les acquisitions à la machine 1, référence :
             # dossier de l'acquisition :
@@ -1163,6 +1715,7 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
 
     # Chemin pointant vers le fichier Well_Results.xlsx de la machine de référence :
     # Vérifier si le chemin contient déjà le dossier 'Images'
+    check_render_policy(render)
     if os.path.basename(acquisition_name_instrument_1) == 'Images':
         chemin_well_result_reference = os.path.join(directory_source_instrument_1, acquisition_name_instrument_1, 'WellResults.xlsx')
     else:
@@ -1174,8 +1727,34 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
     #     results_Reference = list(file_read)
     # WellResultsReference.close()    
 
-    df = pandas.read_excel(chemin_well_result_reference,sheet_name=onglet)
-    results_Reference = df.values.tolist()
+    results_Reference = read_well_results_sheet_rows(chemin_well_result_reference, onglet)
+
+    if os.path.basename(acquisition_name_instrument_2) == 'Images':
+        chemin_well_result_validation = os.path.join(directory_source_instrument_2, acquisition_name_instrument_2, 'WellResults.xlsx')
+    else:
+        chemin_well_result_validation = os.path.join(directory_source_instrument_2, acquisition_name_instrument_2, 'WellResults.xlsx')
+    # chemin_well_result_validation = 'G:\\Mon Drive\\support interne\\debugg_routine_valid\\valid\\GPAxHA230130-06_01\\WellResults.csv'
+    # with open(chemin_well_result_validation) as WellResultsValidation:
+    #     file_read = csv.reader(WellResultsValidation)
+    #     results_Validation = list(file_read)
+    # WellResultsValidation.close()
+
+    results_Validation = read_well_results_sheet_rows(chemin_well_result_validation, onglet)
+
+    return compare_enzymo_2_ref_rows(results_Reference, results_Validation, type_instrument_1, acquisition_name_instrument_1,
+                                     onglet, type_instrument_2, acquisition_name_instrument_2, directory_to_save, render)
+
+
+def compare_enzymo_2_ref_rows(results_Reference, results_Validation, type_instrument_1, acquisition_name_instrument_1,
+                              onglet, type_instrument_2, acquisition_name_instrument_2, directory_to_save, render='eager'):
+    """
+    Calculs de compare_enzymo_2_ref sur les lignes déjà lues de l'onglet des deux classeurs WellResults
+    (listes de lignes, comme df.values.tolist() de la feuille). Retourne les mêmes valeurs que compare_enzymo_2_ref.
+    """
+    check_render_policy(render)
+    # les listes sont modifiées (dernière ligne vide retirée) : on travaille sur des copies
+    results_Reference = list(results_Reference)
+    results_Validation = list(results_Validation)
 
     if results_Reference[-1] == [] or results_Reference[-1] == [';;;;;;;;;'] or results_Reference[-1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
         print(results_Reference[-1])
@@ -1331,275 +1910,28 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
     # le calcul de la sensibilité/activité à 50% de dégradation et des CV à 30, 50 et 70% de 
     # dégradation dépendent directement du type de fit.
     # Non seulement le rétro calcul mais également le nombre de paramètres et donc la taille de l'en-tête
-    if Entete_R[1][1] == 'Linear':
-        alpha = float(Entete_R[2][1])
-        beta = float(Entete_R[3][1])
-
-        if alpha != 0:
-            sensibilite_R = (50-beta)/alpha
-        else:
-            sensibilite_R = np.nan
-
-        ## Calcul pour la machine de référence des CV en % de dégradation à 30%, 50% 
-        # et 70% de dégradation
-
-        activites_deg = [[0,0],[0,0],[0,0]]
-
-        if alpha != 0:
-            activites_deg[0][0] = (30-beta)/alpha
-        else:
-            activites_deg[0][0] = np.nan
-        activites_deg[1][0] = sensibilite_R
-        if alpha != 0:
-            activites_deg[2][0] = (70-beta)/alpha
-        else:
-            activites_deg[2][0] = np.nan
-    elif Entete_R[1][1] == 'Exponential plateau 1':
-        alpha = float(Entete_R[2][1])
-        beta = float(Entete_R[3][1])
-
-        if 1-50/alpha > 0:
-            sensibilite_R = -log(1-50/alpha)/beta
-        else:
-            sensibilite_R = np.nan
-
-        ## Calcul pour la machine de référence des CV en % de dégradation à 30%, 50% 
-        # et 70% de dégradation
-
-        activites_deg = [[0,0],[0,0],[0,0]]
-
-        if 1-30/alpha > 0:
-            activites_deg[0][0] = -log(1-30/alpha)/beta
-        else:
-            activites_deg[0][0] = np.nan
-        activites_deg[1][0] = sensibilite_R
-        if 1-70/alpha > 0:
-            activites_deg[2][0] = -log(1-70/alpha)/beta
-        else:
-            activites_deg[2][0] = np.nan
-    elif Entete_R[1][1] == 'Exponential plateau 2':
-        alpha = float(Entete_R[2][1])
-        beta = float(Entete_R[3][1])
-        gamma = float(Entete_R[4][1])
-
-        if 1-(50-gamma)/alpha > 0:
-            sensibilite_R = -log(1-(50-gamma)/alpha)/beta
-        else:
-            sensibilite_R = np.nan
-
-        ## Calcul pour la machine de référence des CV en % de dégradation à 30%, 50% 
-        # et 70% de dégradation
-
-        activites_deg = [[0,0],[0,0],[0,0]]
-
-        if 1-(30-gamma)/alpha > 0:
-            activites_deg[0][0] = -log(1-(30-gamma)/alpha)/beta
-        else:
-            activites_deg[0][0] = np.nan
-        activites_deg[1][0] = sensibilite_R
-        if 1-(70-gamma)/alpha > 0:
-            activites_deg[2][0] = -log(1-(70-gamma)/alpha)/beta
-        else:
-            activites_deg[2][0] = np.nan
-    elif Entete_R[1][1] == 'Logistic 1':
-        alpha = float(Entete_R[2][1])
-        beta = float(Entete_R[3][1])
-
-        if alpha - 50 != 0:
-            sensibilite_R = (50*beta)/(alpha-50)
-        else:
-            sensibilite_R = np.nan
-
-        ## Calcul pour la machine de référence des CV en % de dégradation à 30%, 50% 
-        # et 70% de dégradation
-
-        activites_deg = [[0,0],[0,0],[0,0]]
-
-        if alpha - 30 != 0:
-            activites_deg[0][0] = (30*beta)/(alpha-30)
-        else:
-            activites_deg[0][0] = np.nan
-        activites_deg[1][0] = sensibilite_R
-        if alpha - 70 != 0:
-            activites_deg[2][0] = (70*beta)/(alpha-70)
-        else:
-            activites_deg[2][0] = np.nan
-    elif Entete_R[1][1] == 'Logistic 2':
-        alpha = float(Entete_R[2][1])
-        beta = float(Entete_R[3][1])
-        gamma = float(Entete_R[4][1])
-
-        if alpha - 50 != 0:
-            sensibilite_R = (50-gamma)*beta/(alpha-50)
-        else:
-            sensibilite_R = np.nan
-
-        ## Calcul pour la machine de référence des CV en % de dégradation à 30%, 50% 
-        # et 70% de dégradation
-
-        activites_deg = [[0,0],[0,0],[0,0]]
-
-        if alpha - 30 != 0:
-            activites_deg[0][0] = (30-gamma)*beta/(alpha-30)
-        else:
-            activites_deg[0][0] = np.nan
-        activites_deg[1][0] = sensibilite_R
-        if alpha - 70 != 0:
-            activites_deg[2][0] = (70-gamma)*beta/(alpha-70)
-        else:
-            activites_deg[2][0] = np.nan
-    elif Entete_R[1][1] == 'Logistic 3':
-        alpha = float(Entete_R[2][1])
-        beta = float(Entete_R[3][1])
-        gamma = float(Entete_R[4][1])
-        delta = float(Entete_R[5][1])
-
-        if alpha - 50 != 0:
-            sensibilite_R = ((50-gamma)*(beta**delta)/(alpha-50))**(1/delta)
-        else:
-            sensibilite_R = np.nan
-
-        ## Calcul pour la machine de référence des CV en % de dégradation à 30%, 50% 
-        # et 70% de dégradation
-
-        activites_deg = [[0,0],[0,0],[0,0]]
-
-        if alpha - 30 != 0:
-            activites_deg[0][0] = ((30-gamma)*(beta**delta)/(alpha-30))**(1/delta)
-        else:
-            activites_deg[0][0] = np.nan
-        activites_deg[1][0] = sensibilite_R
-        if alpha - 70 != 0:
-            activites_deg[2][0] = ((70-gamma)*(beta**delta)/(alpha-70))**(1/delta)
-        else:
-            activites_deg[2][0] = np.nan
-
+    activites_deg = inverse_fit_activities(*fit_parameters_from_entete(Entete_R), POURCENTAGES_DEG)
+    sensibilite_R = float(activites_deg[1])
 
     # Pour les trois % de dégradation d'intérêt (30, 50 et 70) on cherche la valeur
     # théorique de dilution qui se rapporche le plus de la valeur calculée comme étant celle
     # qui donnera respectivement 30, 50 ou 70% de dégradation des dots.
     # On recherche les positions les plus proches seulement pour la machine de référence,
     # pour la machine à valider, on reprendra les mêmes puits trouvés à cette étape.
-    for k in range(len(activites_deg)):
-        find_min = 1000
-        indice_min = 0
-        for l in range(len(Gamme_R)):
-            if Gamme_R[l][3] != '':
-                if abs(float(Gamme_R[l][3]) - activites_deg[k][0]) < find_min:
-                    find_min = abs(float(Gamme_R[l][3])-activites_deg[k][0])
-                    indice_min = l
-        activites_deg[k][1] = float(Gamme_R[indice_min][3])
-
-    deg_30 = []
-    positions_30 = []
-    deg_50 = []
-    positions_50 = []
-    deg_70 = []
-    positions_70 = []
-    for k in range(len(Gamme_R)):
-        if Gamme_R[k][4] == 'False':  # le puit n'est pas exclu
-            if float(Gamme_R[k][3]) == activites_deg[0][1]:
-                positions_30.append(Gamme_R[k][0])
-                if Gamme_R[k][2] == '':
-                    deg_30.append(np.nan)
-                else:
-                    deg_30.append(float(Gamme_R[k][2]))
-            if float(Gamme_R[k][3]) == activites_deg[1][1]:
-                positions_50.append(Gamme_R[k][0])
-                if Gamme_R[k][2] == '':
-                    deg_50.append(np.nan)
-                else:
-                    deg_50.append(float(Gamme_R[k][2]))
-            if float(Gamme_R[k][3]) == activites_deg[2][1]:
-                positions_70.append(Gamme_R[k][0])
-                if Gamme_R[k][2] == '':
-                    deg_70.append(np.nan)
-                else:
-                    deg_70.append(float(Gamme_R[k][2]))
-
-    moyenne_deg_30 = 0
-    moyenne_deg_50 = 0
-    moyenne_deg_70 = 0
-    ecartype_deg_30 = 0
-    ecartype_deg_50 = 0
-    ecartype_deg_70 = 0
-    kompt = 0
-    for k in range(len(deg_30)):
-        if not isnan(deg_30[k]):
-            moyenne_deg_30 += deg_30[k]
-            kompt += 1
-    if kompt == 0:
-        moyenne_deg_30 = np.nan
-    else:
-        moyenne_deg_30 = moyenne_deg_30/kompt
-    kompt = 0
-    for k in range(len(deg_50)):
-        if not isnan(deg_50[k]):
-            moyenne_deg_50 += deg_50[k]
-            kompt += 1
-    if kompt == 0:
-        moyenne_deg_50 = np.nan
-    else:
-        moyenne_deg_50 = moyenne_deg_50/kompt
-    kompt = 0    
-    for k in range(len(deg_70)):
-        if not isnan(deg_70[k]):
-            moyenne_deg_70 += deg_70[k]
-            kompt += 1
-    if kompt == 0:
-        moyenne_deg_70 = np.nan
-    else:
-        moyenne_deg_70 = moyenne_deg_70/kompt
-
-    kompt = 0
-    for k in range(len(deg_30)):
-        if not isnan(deg_30[k]):
-            ecartype_deg_30 += (deg_30[k] - moyenne_deg_30)**2
-            kompt += 1
-    if kompt == 0:
-        ecartype_deg_30 = np.nan
-    else:
-        ecartype_deg_30 = sqrt(ecartype_deg_30/kompt)
-    kompt = 0
-    for k in range(len(deg_50)):
-        if not isnan(deg_50[k]):
-            ecartype_deg_50 += (deg_50[k] - moyenne_deg_50)**2
-            kompt += 1
-    if kompt == 0:
-        ecartype_deg_50 = np.nan
-    else:
-        ecartype_deg_50 = sqrt(ecartype_deg_50/kompt)
-    kompt = 0
-    for k in range(len(deg_70)):
-        if not isnan(deg_70[k]):
-            ecartype_deg_70 += (deg_70[k] - moyenne_deg_70)**2
-            kompt += 1
-    if kompt == 0:
-        ecartype_deg_70 = np.nan
-    else:
-        ecartype_deg_70 = sqrt(ecartype_deg_70/kompt)
+    activites_gamme_R = gamme_column(Gamme_R, 3)
+    activites_dilution = nearest_dilutions(activites_gamme_R, activites_deg)
+
+    # réplicats non exclus de chaque dilution retenue : une ligne de masque par % de dégradation
+    masks_R = gamme_non_exclus(Gamme_R) & (activites_gamme_R == activites_dilution[:, None])
+    positions_R = np.array([ligne[0] for ligne in Gamme_R], dtype=object)
+    positions_30, positions_50, positions_70 = (positions_R[mask].tolist() for mask in masks_R)
 
-    # cv_357_R contient les Cv  30 50 et 70 % de dégradation
-    cv_357_R = [ecartype_deg_30*100/moyenne_deg_30,ecartype_deg_50*100/moyenne_deg_50,ecartype_deg_70*100/moyenne_deg_70]
+    cv_357_R = replicate_cv(gamme_column(Gamme_R, 2), masks_R)
 
     #######################################################################
     #############     INSTRUMENT 2 : MACHINE A VALIDER     ################
     #######################################################################
 
-    # Vérifier si le chemin contient déjà le dossier 'Images'
-    if os.path.basename(acquisition_name_instrument_2) == 'Images':
-        chemin_well_result_validation = os.path.join(directory_source_instrument_2, acquisition_name_instrument_2, 'WellResults.xlsx')
-    else:
-        chemin_well_result_validation = os.path.join(directory_source_instrument_2, acquisition_name_instrument_2, 'WellResults.xlsx')
-    # chemin_well_result_validation = 'G:\\Mon Drive\\support interne\\debugg_routine_valid\\valid\\GPAxHA230130-06_01\\WellResults.csv'
-    # with open(chemin_well_result_validation) as WellResultsValidation:
-    #     file_read = csv.reader(WellResultsValidation)
-    #     results_Validation = list(file_read)
-    # WellResultsValidation.close()
-
-    df = pandas.read_excel(chemin_well_result_validation,sheet_name=onglet)
-    results_Validation = df.values.tolist()
-
     if results_Validation[-1] == [] or results_Validation[-1] == [';;;;;;;;;'] or results_Validation[-1] == [np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]:
         results_Validation.pop()
 
@@ -1752,299 +2084,21 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
 
     # print('\n\n\nentete_V à vérifier : \n\n',Entete_V)
 
-    if Entete_V[1][1] == 'Linear':
-        alpha = float(Entete_V[2][1])
-        beta = float(Entete_V[3][1])
-
-        if alpha != 0:
-            sensibilite_V = (50-beta)/alpha
-        else:
-            sensibilite_V = np.nan
-
-    elif Entete_V[1][1] == 'Exponential plateau 1':
-        alpha = float(Entete_V[2][1])
-        beta = float(Entete_V[3][1])
-
-        if 1-50/alpha > 0:
-            sensibilite_V = -log(1-50/alpha)/beta
-        else:
-            sensibilite_V = np.nan
-
-    elif Entete_V[1][1] == 'Exponential plateau 2':
-        alpha = float(Entete_V[2][1])
-        beta = float(Entete_V[3][1])
-        gamma = float(Entete_V[4][1])
-
-        if 1-(50-gamma)/alpha > 0:
-            sensibilite_V = -log(1-(50-gamma)/alpha)/beta
-        else:
-            sensibilite_V = np.nan
-
-    elif Entete_V[1][1] == 'Logistic 1':
-        alpha = float(Entete_V[2][1])
-        beta = float(Entete_V[3][1])
-
-        if alpha - 50 != 0:
-            sensibilite_V = (50*beta)/(alpha-50)
-        else:
-            sensibilite_V = np.nan
-
-    elif Entete_V[1][1] == 'Logistic 2':
-        alpha = float(Entete_V[2][1])
-        beta = float(Entete_V[3][1])
-        gamma = float(Entete_V[4][1])
-
-        if alpha - 50 != 0:
-            sensibilite_V = (50-gamma)*beta/(alpha-50)
-        else:
-            sensibilite_V = np.nan
-
-    elif Entete_V[1][1] == 'Logistic 3':
-        alpha = float(Entete_V[2][1])
-        beta = float(Entete_V[3][1])
-        gamma = float(Entete_V[4][1])
-        delta = float(Entete_V[5][1])
-
-        if alpha - 50 != 0:
-            sensibilite_V = ((50-gamma)*(beta**delta)/(alpha-50))**(1/delta)
-        else:
-            sensibilite_V = np.nan
-
-    ## CV en % de dégradation à 30%, 50% et 70% de dégradation
-
-    deg_30 = []
-    deg_50 = []
-    deg_70 = []
-    for k in range(len(Gamme_V)):
-        if Gamme_V[k][0] in positions_30 and Gamme_V[k][4] == 'False':
-            if Gamme_V[k][2] == '':
-                deg_30.append(np.nan)
-            else:
-                deg_30.append(float(Gamme_V[k][2]))
-        if Gamme_V[k][0] in positions_50 and Gamme_V[k][4] == 'False':
-            if Gamme_V[k][2] == '':
-                deg_50.append(np.nan)
-            else:
-                deg_50.append(float(Gamme_V[k][2]))
-        if Gamme_V[k][0] in positions_70 and Gamme_V[k][4] == 'False':
-            if Gamme_V[k][2] == '':
-                deg_70.append(np.nan)
-            else:
-                deg_70.append(float(Gamme_V[k][2]))
-
-
-    moyenne_deg_30 = 0
-    moyenne_deg_50 = 0
-    moyenne_deg_70 = 0
-    ecartype_deg_30 = 0
-    ecartype_deg_50 = 0
-    ecartype_deg_70 = 0
-    kompt = 0
-    for k in range(len(deg_30)):
-        if not isnan(deg_30[k]):
-            moyenne_deg_30 += deg_30[k]
-            kompt += 1
-    if kompt == 0:
-        moyenne_deg_30 = np.nan
-    else:
-        moyenne_deg_30 = moyenne_deg_30/kompt
-    kompt = 0
-    for k in range(len(deg_50)):
-        if not isnan(deg_50[k]):
-            moyenne_deg_50 += deg_50[k]
-            kompt += 1
-    if kompt == 0:
-        moyenne_deg_50 = np.nan
-    else:
-        moyenne_deg_50 = moyenne_deg_50/kompt
-    kompt = 0    
-    for k in range(len(deg_70)):
-        if not isnan(deg_70[k]):
-            moyenne_deg_70 += deg_70[k]
-            kompt += 1
-    if kompt == 0:
-        moyenne_deg_70 = np.nan
-    else:
-        moyenne_deg_70 = moyenne_deg_70/kompt
-
-    kompt = 0
-    for k in range(len(deg_30)):
-        if not isnan(deg_30[k]):
-            ecartype_deg_30 += (deg_30[k] - moyenne_deg_30)**2
-            kompt += 1
-    if kompt == 0:
-        ecartype_deg_30 = np.nan
-    else:
-        ecartype_deg_30 = sqrt(ecartype_deg_30/kompt)
-    kompt = 0
-    for k in range(len(deg_50)):
-        if not isnan(deg_50[k]):
-            ecartype_deg_50 += (deg_50[k] - moyenne_deg_50)**2
-            kompt += 1
-    if kompt == 0:
-        ecartype_deg_50 = np.nan
-    else:
-        ecartype_deg_50 = sqrt(ecartype_deg_50/kompt)
-    kompt = 0
-    for k in range(len(deg_70)):
-        if not isnan(deg_70[k]):
-            ecartype_deg_70 += (deg_70[k] - moyenne_deg_70)**2
-            kompt += 1
-    if kompt == 0:
-        ecartype_deg_70 = np.nan
-    else:
-        ecartype_deg_70 = sqrt(ecartype_deg_70/kompt)
-
-    cv_357_V = [ecartype_deg_30*100/moyenne_deg_30,ecartype_deg_50*100/moyenne_deg_50,ecartype_deg_70*100/moyenne_deg_70]
-
-    ## Graphique % de dégradation de l'Instrument 2 (à valider) en fonction de l'instrument 1 : notre référence.
-
-    deg_REF = []
-    deg_VALID = []
-    for k in range(len(Gamme_R)):
-        if (Gamme_R[k][4] == 'False' and Gamme_V[k][4] == 'False') and (Gamme_R[k][0] == Gamme_V[k][0]):
-            deg_REF.append(float(Gamme_R[k][2]))
-            deg_VALID.append(float(Gamme_V[k][2]))
-
-
-    # To keep
-    if len(deg_REF) > 0:
-
-        # print('\n\n\ndeg_REF : \n\n',deg_REF)
-        # print('\n\n\ndeg_VALID : \n\n',deg_VALID)
-
-        plt.close('all')
-        plt.figure(figsize=(8, 6))
-        # plt.close(26)
-        # plt.clf()
-        # fig26 = plt.figure(26)
-        plt.suptitle('Comparaison des taux de dégradation\npour les gammes au ' + type_instrument_1 + ' et au ' + type_instrument_2 + '\n' + acquisition_name_instrument_2 + ' ' + onglet)
-        plt.plot(deg_REF,deg_VALID,'o',color='blue')
-        plt.plot(np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),np.arange(np.nanmin(deg_REF),np.nanmax(deg_REF)),label='bissectrice = target',color='k')
-        plt.xlabel('% de dégradation au ' + type_instrument_1)
-        plt.ylabel('% de dégradation au ' + type_instrument_2)
-        plt.legend()
-        plt.savefig(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_taux_degradation.png')
-        # plt.close(26)
-        plt.close()
-
-        ## tout ce qui est noté P dans la suite est équivalent à R (R pour référence
-        ## et avant le Proto était la référence)
-        ## Tout ce qui est noté Z dans la suite est équivalent à V(Z pour ZC qui était 
-        ## la machine à Valider)
-        ##
-        ## ici je trace le graphique des deux gammes des machines de référence et à valider
-
-        ecart = 0.1 # obligé de mettre une tolérance pour les tests d'égalité en activité enzymatique car on peut avoir 22,009 et 22,094 pour un même point de gamme
-        abscisses_P = []
-        for k in range(len(Gamme_R)):
-            indic = 0
-            if Gamme_R[k][3] != '':
-                for j in range(len(abscisses_P)):
-                    if (abscisses_P[j] - ecart < float(Gamme_R[k][3])) and  (float(Gamme_R[k][3]) < abscisses_P[j] + ecart):
-                        indic = 1
-                if indic == 0:
-                    abscisses_P.append(float(Gamme_R[k][3]))
-
-        gamme_moyenne_P = []
-        for k in range(len(abscisses_P)):
-            gamme_moyenne_P.append([abscisses_P[k]])
-        for k in range(len(Gamme_R)):
-            if Gamme_R[k][3] != '':
-                for j in range(len(gamme_moyenne_P)):
-                    if (gamme_moyenne_P[j][0] - ecart < float(Gamme_R[k][3]) < gamme_moyenne_P[j][0] + ecart) and Gamme_R[k][4] == 'False':
-                        gamme_moyenne_P[j].append(float(Gamme_R[k][2]))
-        for k in range(len(gamme_moyenne_P)):
-            if len(gamme_moyenne_P[k]) > 1:
-                gamme_moyenne_P[k].append(sum(gamme_moyenne_P[k][1:])/(len(gamme_moyenne_P[k])-1))
-                gamme_moyenne_P[k].append(statistics.pstdev(gamme_moyenne_P[k][1:-1]))
-
-        gamme_moyenne_Z = []
-        for k in range(len(abscisses_P)):
-            gamme_moyenne_Z.append([abscisses_P[k]])
-        for k in range(len(Gamme_V)):
-            for j in range(len(gamme_moyenne_Z)):
-                if Gamme_V[k][3] != '': # nouveau
-                    if float(Gamme_V[k][3]) == gamme_moyenne_Z[j][0] and Gamme_V[k][4] == 'False':
-                        gamme_moyenne_Z[j].append(float(Gamme_V[k][2]))
-        for k in range(len(gamme_moyenne_Z)):
-            if len(gamme_moyenne_Z[k]) > 1:
-                gamme_moyenne_Z[k].append(sum(gamme_moyenne_Z[k][1:])/(len(gamme_moyenne_Z[k])-1))
-                gamme_moyenne_Z[k].append(statistics.pstdev(gamme_moyenne_Z[k][1:-1]))
-
-        for k in range(len(gamme_moyenne_P)):
-            if len(gamme_moyenne_P[k]) == 1:
-                gamme_moyenne_P[k].append(0)
-                gamme_moyenne_P[k].append(0)
-            if len(gamme_moyenne_Z[k]) == 1:
-                gamme_moyenne_Z[k].append(0)
-                gamme_moyenne_Z[k].append(0)
-
-        mask = []
-        for k in range(len(gamme_moyenne_P)):
-            if len(gamme_moyenne_P[k]) == 1 and len(gamme_moyenne_Z[k]) == 1:
-                mask.append(k)
-
-        Abscisses_Gamme = []
-        Y_Gamme_P = []
-        Y_Gamme_Z = []
-        Y_Error_P = []
-        Y_Error_Z = []
-
-        for k in range(len(abscisses_P)):
-            if k not in mask:
-                Abscisses_Gamme.append(abscisses_P[k])
-                Y_Gamme_P.append(gamme_moyenne_P[k][-2])
-                Y_Gamme_Z.append(gamme_moyenne_Z[k][-2])
-                Y_Error_P.append(gamme_moyenne_P[k][-1])
-                Y_Error_Z.append(gamme_moyenne_P[k][-1])
-
-        # plt.close('all')
-        plt.close(27)
-        fig27 = plt.figure(27)
-        plt.title('Gammes comparées de ' + type_instrument_1 + ', la référence et de\n' + type_instrument_2 + ', la machine à valider\n' + acquisition_name_instrument_2 + ' ' + onglet)
-
-        # print('\n\n\nY_Gamme_P : \n\n',Y_Gamme_P)
-        # print('\n\n\nY_Gamme_Z : \n\n',Y_Gamme_Z)
-
-        plt.plot(Abscisses_Gamme,Y_Gamme_P,'o',color = 'red', label = type_instrument_1)        
-        plt.errorbar(Abscisses_Gamme,Y_Gamme_P,yerr = Y_Error_P,fmt = 'none', capsize = 6, ecolor = 'red', zorder = 1)
-        plt.plot(Abscisses_Gamme,Y_Gamme_Z,'o',color = 'blue', label = type_instrument_2)        
-        plt.errorbar(Abscisses_Gamme,Y_Gamme_Z,yerr = Y_Error_Z,fmt = 'none', capsize = 6, ecolor = 'blue', zorder = 1)
+    sensibilite_V = float(inverse_fit_activities(*fit_parameters_from_entete(Entete_V), POURCENTAGES_DEG)[1])
 
-        plt.xlabel('Activité des points de gamme (U/mL)')
-        plt.ylabel('Z.U.')
-        plt.legend()
+    # mêmes puits que ceux retenus pour la machine de référence
+    positions_V = [ligne[0] for ligne in Gamme_V]
+    masks_V = gamme_non_exclus(Gamme_V) & np.array([[position in positions for position in positions_V]
+                                                    for positions in (positions_30, positions_50, positions_70)],
+                                                   dtype=bool).reshape(len(POURCENTAGES_DEG), len(Gamme_V))
 
-        plt.savefig(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_Gammes.png')
-        plt.close(27)
-    else:
-        plt.close('all')
-        plt.figure(figsize=(8, 6))
-        plt.text(
-            0.5,
-            0.5,
-            'Aucune donnee commune exploitable pour tracer le taux de degradation',
-            ha='center',
-            va='center',
-            wrap=True
-        )
-        plt.axis('off')
-        plt.savefig(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_taux_degradation.png')
-        plt.close()
+    cv_357_V = replicate_cv(gamme_column(Gamme_V, 2), masks_V)
 
-        plt.figure(figsize=(8, 6))
-        plt.text(
-            0.5,
-            0.5,
-            'Aucune donnee commune exploitable pour tracer les gammes',
-            ha='center',
-            va='center',
-            wrap=True
-        )
-        plt.axis('off')
-        plt.savefig(directory_to_save + '\\' + acquisition_name_instrument_2 + '_' + onglet + '_Gammes.png')
-        plt.close()
+    ## Graphiques % de dégradation et gammes de l'Instrument 2 (à valider) en fonction de l'instrument 1 : notre référence.
+    plot_specs = []
+    apply_render_policy(render, plot_specs, plot_compare_enzymo_2_ref,
+                        Gamme_R=Gamme_R, Gamme_V=Gamme_V, type_instrument_1=type_instrument_1, type_instrument_2=type_instrument_2,
+                        acquisition_name_instrument_2=acquisition_name_instrument_2, onglet=onglet, directory_to_save=directory_to_save)
 
     data_R = [acquisition_name_instrument_1,type_instrument_1,onglet,lod_R,loq_R,sensibilite_R,cv_357_R[0],cv_357_R[1],cv_357_R[2]]
     for k in range(len(Sample_R)):
@@ -2084,4 +2138,6 @@ def compare_enzymo_2_ref(directory_source_instrument_1,type_instrument_1,acquisi
             nexto.append(np.nan)
     data_V = data_V + nexto
 
+    if render == 'deferred':
+        return data_R, data_V, plot_specs
     return data_R, data_V
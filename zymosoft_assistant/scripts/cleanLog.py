@@ -5,30 +5,370 @@ Removes serial input/output debug lines from log files
 Option to keep only the last acquisition
 """
 
+import gzip
 import os
+import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:  # zstd output is optional
+    zstandard = None
 
-def clean_log_file(input_file, output_file=None, keep_last_acquisition_only=False):
+
+# Size of the byte chunks read from the input log (memory use does not depend on the log size)
+CHUNK_SIZE = 1024 * 1024
+
+ACQUISITION_MARKER = b"Starting acquisition"
+
+# One match per line containing the acquisition marker
+ACQUISITION_LINE_RE = re.compile(re.escape(ACQUISITION_MARKER) + rb"[^\n]*")
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+GZIP_COMPRESS_LEVEL = 6
+ZSTD_COMPRESS_LEVEL = 3
+
+# Below this size, starting worker processes costs more than it saves
+PARALLEL_MIN_SIZE = 256 * 1024 * 1024
+
+
+def iter_line_chunks(infile, start=0, end=None, chunk_size=CHUNK_SIZE):
+    """
+    Read a binary file by fixed-size chunks cut on line boundaries
+
+    Args:
+        infile: Binary file object
+        start (int): Offset of the first byte to read (must be a line start)
+        end (int): Offset where reading stops (must be a line start, default: end of file)
+        chunk_size (int): Number of bytes read at once
+
+    Yields:
+        bytes: Chunk made of complete lines (the last chunk may end without a newline)
+    """
+    infile.seek(start)
+    remaining = None if end is None else end - start
+    pending = b''
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        data = infile.read(size)
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+
+        data = pending + data
+        cut = data.rfind(b'\n') + 1
+        if cut:
+            pending = data[cut:]
+            yield data[:cut]
+        else:
+            pending = data
+    if pending:
+        yield pending
+
+
+def count_lines(chunk):
+    """
+    Count the lines of a chunk
+
+    Args:
+        chunk (bytes): Chunk returned by iter_line_chunks
+
+    Returns:
+        int: Number of lines
+    """
+    lines = chunk.count(b'\n')
+    if chunk and not chunk.endswith(b'\n'):
+        lines += 1
+    return lines
+
+
+def is_serial_noise(line):
+    """
+    Check if a line is a serial input/output, motor or stepping debug line
+
+    Args:
+        line (str): Log line
+
+    Returns:
+        bool: True if the line must be removed
+    """
+    # Substring tests on str are faster than a combined regex; most frequent family first
+    return ('[SERIAL][IN]' in line or
+            '[SERIAL][OUT]' in line or
+            'Port COM' in line or
+            'MOTOR' in line or
+            'STEP' in line or
+            'TO POINT' in line or
+            'Seeking' in line or
+            'Stepping' in line)
+
+
+def filter_chunk(chunk):
+    """
+    Remove the serial input/output lines from a chunk
+
+    Args:
+        chunk (bytes): Chunk returned by iter_line_chunks
+
+    Returns:
+        tuple: (kept bytes, number of lines kept, number of lines removed)
+    """
+    # surrogateescape keeps undecodable bytes unchanged in the output
+    lines = chunk.decode('utf-8', errors='surrogateescape').split('\n')
+    ends_with_newline = not lines[-1]
+    if ends_with_newline:
+        lines.pop()
+
+    kept = [line for line in lines if not is_serial_noise(line)]
+    text = '\n'.join(kept)
+    if kept and (ends_with_newline or is_serial_noise(lines[-1])):
+        text += '\n'
+    return text.encode('utf-8', errors='surrogateescape'), len(kept), len(lines) - len(kept)
+
+
+def find_last_acquisition_offset(infile, chunk_size=CHUNK_SIZE):
+    """
+    Find the start of the last "Starting acquisition" line by reading the file backwards
+
+    Args:
+        infile: Binary file object
+        chunk_size (int): Number of bytes read at once
+
+    Returns:
+        int: Offset of the line start, or None if the log has no acquisition
+    """
+    infile.seek(0, os.SEEK_END)
+    end = infile.tell()
+    overlap = b''
+    while end > 0:
+        start = max(0, end - chunk_size)
+        infile.seek(start)
+        block = infile.read(end - start) + overlap
+        position = block.rfind(ACQUISITION_MARKER)
+        if position >= 0:
+            return _find_line_start(infile, start + position, chunk_size)
+        overlap = block[:len(ACQUISITION_MARKER) - 1]
+        end = start
+    return None
+
+
+def _find_line_start(infile, offset, chunk_size=CHUNK_SIZE):
+    end = offset
+    while end > 0:
+        start = max(0, end - chunk_size)
+        infile.seek(start)
+        block = infile.read(end - start)
+        position = block.rfind(b'\n')
+        if position >= 0:
+            return start + position + 1
+        end = start
+    return 0
+
+
+def count_acquisitions(infile, end, chunk_size=CHUNK_SIZE):
+    """
+    Count the lines and the acquisitions located before an offset
+
+    Args:
+        infile: Binary file object
+        end (int): Offset where counting stops (must be a line start)
+        chunk_size (int): Number of bytes read at once
+
+    Returns:
+        tuple: (number of lines, number of "Starting acquisition" lines)
+    """
+    lines = 0
+    acquisitions = 0
+    for chunk in iter_line_chunks(infile, 0, end, chunk_size):
+        lines += count_lines(chunk)
+        acquisitions += len(ACQUISITION_LINE_RE.findall(chunk))
+    return lines, acquisitions
+
+
+def resolve_compression(output_file, compression=None):
+    """
+    Determine the compression of the output file
+
+    Args:
+        output_file (str): Path to the output file (optional)
+        compression (str): "gzip", "zstd" or None to use the output file extension
+
+    Returns:
+        str: "gzip", "zstd" or None for an uncompressed output
+    """
+    if compression is None and output_file is not None:
+        suffix = Path(output_file).suffix.lower()
+        for name, extension in COMPRESSION_SUFFIXES.items():
+            if suffix == extension:
+                compression = name
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression '{compression}' (expected 'gzip' or 'zstd')")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package")
+    return compression
+
+
+def open_output(output_path, compression=None):
+    """
+    Open the output file for binary writing, compressed if requested
+
+    Args:
+        output_path (str): Path to the output file
+        compression (str): "gzip", "zstd" or None
+
+    Returns:
+        Writable binary file object
+    """
+    if compression == "gzip":
+        return gzip.open(output_path, 'wb', compresslevel=GZIP_COMPRESS_LEVEL)
+    if compression == "zstd":
+        compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESS_LEVEL)
+        return compressor.stream_writer(open(output_path, 'wb'))
+    return open(output_path, 'wb')
+
+
+def filter_range(infile, outfile, start, end=None, chunk_size=CHUNK_SIZE):
+    """
+    Write the lines of a byte range without the serial input/output lines
+
+    Args:
+        infile: Binary input file object
+        outfile: Binary output file object
+        start (int): Offset of the first byte of the range (must be a line start)
+        end (int): Offset where the range stops (must be a line start, default: end of file)
+        chunk_size (int): Number of bytes read at once
+
+    Returns:
+        tuple: (number of lines kept, number of lines removed)
+    """
+    lines_kept = 0
+    lines_removed = 0
+    for chunk in iter_line_chunks(infile, start, end, chunk_size):
+        kept, kept_count, removed_count = filter_chunk(chunk)
+        outfile.write(kept)
+        lines_kept += kept_count
+        lines_removed += removed_count
+    return lines_kept, lines_removed
+
+
+def split_line_ranges(infile, start, end, parts):
+    """
+    Split a byte range into newline-aligned ranges of similar size
+
+    Args:
+        infile: Binary file object
+        start (int): Offset of the range start (must be a line start)
+        end (int): Offset of the range end
+        parts (int): Number of ranges wanted
+
+    Returns:
+        list: (start, end) offsets of the non-empty ranges, in file order
+    """
+    boundaries = [start]
+    for part in range(1, parts):
+        target = start + (end - start) * part // parts
+        if target <= boundaries[-1]:
+            continue
+        # Move the boundary to the start of the next line
+        infile.seek(target - 1)
+        infile.readline()
+        boundary = min(infile.tell(), end)
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+    if end > boundaries[-1]:
+        boundaries.append(end)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _filter_range_to_file(input_file, start, end, part_file, compression, chunk_size):
+    # Runs in a worker process: each part is compressed on its own, gzip members and
+    # zstd frames can be concatenated into a single valid file
+    with open(input_file, 'rb') as infile, open_output(part_file, compression) as outfile:
+        return filter_range(infile, outfile, start, end, chunk_size)
+
+
+def filter_range_parallel(input_file, output_path, start, end, workers, compression=None,
+                          chunk_size=CHUNK_SIZE):
+    """
+    Filter a byte range of a log in several worker processes
+
+    The range is split on line boundaries, each part is filtered into a temporary file
+    and the parts are concatenated in order, so the output is identical to the
+    sequential filtering.
+
+    Args:
+        input_file (str): Path to the input log file
+        output_path (str): Path to the output file
+        start (int): Offset of the first byte to filter (must be a line start)
+        end (int): Offset where filtering stops
+        workers (int): Number of worker processes
+        compression (str): "gzip", "zstd" or None
+        chunk_size (int): Number of bytes read at once
+
+    Returns:
+        tuple: (number of lines kept, number of lines removed)
+    """
+    with open(input_file, 'rb') as infile:
+        ranges = split_line_ranges(infile, start, end, workers)
+
+    parts_folder = tempfile.mkdtemp(prefix="cleanlog_", dir=Path(output_path).parent)
+    try:
+        part_files = [os.path.join(parts_folder, f"part{i:04d}") for i in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_filter_range_to_file, str(input_file), range_start, range_end,
+                                       part_file, compression, chunk_size)
+                       for (range_start, range_end), part_file in zip(ranges, part_files)]
+            counts = [future.result() for future in futures]
+
+        with open(output_path, 'wb') as outfile:
+            for part_file in part_files:
+                with open(part_file, 'rb') as part:
+                    shutil.copyfileobj(part, outfile, CHUNK_SIZE)
+    finally:
+        shutil.rmtree(parts_folder, ignore_errors=True)
+
+    return sum(kept for kept, _ in counts), sum(removed for _, removed in counts)
+
+
+def clean_log_file(input_file, output_file=None, keep_last_acquisition_only=False, compression=None,
+                   chunk_size=CHUNK_SIZE, workers=1):
     """
     Clean log file by removing serial input/output lines
     Optionally keep only the last acquisition
 
+    The log is streamed by chunks of chunk_size bytes, so memory use does not depend on
+    the log size. The last acquisition is located by reading the log backwards.
+    Line endings and bytes of the kept lines are written unchanged.
+
+    With workers > 1, logs larger than PARALLEL_MIN_SIZE are filtered in parallel
+    worker processes; the output and the line counts are identical to the sequential mode.
+
     Args:
         input_file (str): Path to the input log file
         output_file (str): Path to the output file (optional)
         keep_last_acquisition_only (bool): If True, keep only the last acquisition
+        compression (str): "gzip" or "zstd" to compress the output (default: from the
+            output file extension, ".gz" or ".zst")
+        chunk_size (int): Number of bytes read at once
+        workers (int): Number of worker processes for very large logs
 
     Returns:
         str: Path to the cleaned output file
     """
     input_path = Path(input_file)
+    compression = resolve_compression(output_file, compression)
 
     # Generate output filename if not provided
     if output_file is None:
         suffix = "_cleaned_last" if keep_last_acquisition_only else "_cleaned"
         output_file = input_path.stem + suffix + input_path.suffix
+        if compression is not None:
+            output_file += COMPRESSION_SUFFIXES[compression]
 
     output_path = Path(output_file)
 
@@ -41,47 +381,31 @@ def clean_log_file(input_file, output_file=None, keep_last_acquisition_only=Fals
     acquisitions_found = 0
 
     try:
-        with open(input_path, 'r', encoding='utf-8', errors='ignore') as infile:
-            all_lines = infile.readlines()
-
-        # If we need to keep only the last acquisition, find it first
-        last_acquisition_start = 0
-        if keep_last_acquisition_only:
-            acquisition_starts = []
-            for i, line in enumerate(all_lines):
-                if "Starting acquisition" in line:
-                    acquisition_starts.append(i)
+        with open(input_path, 'rb') as infile:
+            # If we need to keep only the last acquisition, find it first
+            last_acquisition_start = 0
+            if keep_last_acquisition_only:
+                last_acquisition_offset = find_last_acquisition_offset(infile, chunk_size)
+                if last_acquisition_offset is not None:
+                    last_acquisition_start = last_acquisition_offset
+                    lines_removed, acquisitions_found = count_acquisitions(infile, last_acquisition_offset,
+                                                                           chunk_size)
                     acquisitions_found += 1
+                    print(
+                        f"Found {acquisitions_found} acquisition(s), keeping only the last one starting at line {lines_removed + 1}")
+                else:
+                    print("Warning: No 'Starting acquisition' found in the log file")
 
-            if acquisition_starts:
-                last_acquisition_start = acquisition_starts[-1]
-                print(
-                    f"Found {acquisitions_found} acquisition(s), keeping only the last one starting at line {last_acquisition_start + 1}")
+            # Process lines
+            input_size = os.path.getsize(input_path)
+            if workers > 1 and input_size - last_acquisition_start >= PARALLEL_MIN_SIZE:
+                lines_kept, removed_count = filter_range_parallel(input_path, output_path, last_acquisition_start,
+                                                                  input_size, workers, compression, chunk_size)
             else:
-                print("Warning: No 'Starting acquisition' found in the log file")
-                last_acquisition_start = 0
-
-        # Process lines
-        with open(output_path, 'w', encoding='utf-8') as outfile:
-            for i, line in enumerate(all_lines):
-                # Skip lines before last acquisition if option is enabled
-                if keep_last_acquisition_only and i < last_acquisition_start:
-                    lines_removed += 1
-                    continue
-
-                # Check if line contains serial input/output patterns
-                if ('[SERIAL][IN]' in line or
-                        '[SERIAL][OUT]' in line or
-                        'Port COM' in line or
-                        'MOTOR' in line or
-                        'STEP' in line or
-                        'TO POINT' in line or
-                        'Seeking' in line or
-                        'Stepping' in line):
-                    lines_removed += 1
-                else:
-                    outfile.write(line)
-                    lines_kept += 1
+                with open_output(output_path, compression) as outfile:
+                    lines_kept, removed_count = filter_range(infile, outfile, last_acquisition_start,
+                                                             chunk_size=chunk_size)
+            lines_removed += removed_count
 
     except Exception as e:
         raise Exception(f"Error processing file: {e}")
@@ -101,28 +425,51 @@ def clean_log_file(input_file, output_file=None, keep_last_acquisition_only=Fals
 def main():
     """Main function to handle command line usage"""
     if len(sys.argv) < 2:
-        print("Usage: python log_cleaner.py <input_file> [output_file] [--last-only]")
+        print("Usage: python log_cleaner.py <input_file> [output_file] [--last-only] [--gzip | --zstd] [--workers N]")
         print("Examples:")
         print("  python log_cleaner.py this.log")
         print("  python log_cleaner.py this.log cleaned_log.log")
         print("  python log_cleaner.py this.log --last-only")
         print("  python log_cleaner.py this.log cleaned_log.log --last-only")
+        print("  python log_cleaner.py this.log --last-only --gzip")
+        print("  python log_cleaner.py this.log --workers 8")
         print("")
         print("Options:")
         print("  --last-only    Keep only the last acquisition in the log file")
+        print("  --gzip         Write a gzip-compressed output file (.gz)")
+        print("  --zstd         Write a zstd-compressed output file (.zst, requires 'zstandard')")
+        print("  --workers N    Filter logs larger than 256 MB with N worker processes")
         sys.exit(1)
 
     input_file = sys.argv[1]
 
     # Parse arguments
     keep_last_only = '--last-only' in sys.argv
+    compression = None
+    if '--gzip' in sys.argv:
+        compression = "gzip"
+    elif '--zstd' in sys.argv:
+        compression = "zstd"
+
+    workers = 1
+    args = sys.argv[1:]
+    if '--workers' in args:
+        position = args.index('--workers')
+        try:
+            workers = int(args[position + 1])
+        except (IndexError, ValueError):
+            print("Error: --workers expects a number of processes")
+            sys.exit(1)
+        del args[position:position + 2]
 
-    # Remove --last-only from args to find output file
-    args_without_flag = [arg for arg in sys.argv[1:] if arg != '--last-only']
+    # Remove flags from args to find output file
+    flags = ('--last-only', '--gzip', '--zstd')
+    args_without_flag = [arg for arg in args if arg not in flags]
     output_file = args_without_flag[1] if len(args_without_flag) > 1 else None
 
     try:
-        clean_log_file(input_file, output_file, keep_last_acquisition_only=keep_last_only)
+        clean_log_file(input_file, output_file, keep_last_acquisition_only=keep_last_only,
+                       compression=compression, workers=workers)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
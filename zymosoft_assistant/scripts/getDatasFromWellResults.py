@@ -1,8 +1,25 @@
 import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from math import sqrt
 
+logger = logging.getLogger(__name__)
+
+# Nombre de classeurs WellResults gardés en mémoire (acquisition, référence, ...)
+WELL_RESULTS_CACHE_SIZE = 8
+
+# Fichier annexe (à côté du classeur) contenant les sections déjà extraites
+WELL_RESULTS_SIDECAR_SUFFIX = ".sections.npz"
+WELL_RESULTS_SIDECAR_VERSION = 1
+
+_well_results_cache = OrderedDict()
+_well_results_cache_lock = threading.Lock()
+
 
 def getWellResultFile(folder_path):
     """
@@ -28,171 +45,449 @@ def getNumberOfAreasInWellResultFile(file_path):
     """
     Cette fonction récupère le nombre d'areas dans un fichier de résultats de puits.
     Elle compte simplement le nombre de feuilles dans le xlsx
-    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param file_path: Chemin vers le fichier de résultats de puits (ou WellResultsWorkbook).
     """
-    try:
-        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
-            return len(xls.sheet_names)
-    except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+    return getWellResultsWorkbook(file_path).number_of_areas
 
 
-def getDataForAreaInWellResultFile(file_path, area_index):
+def findSectionRows(df, section_title, header_marker):
     """
-    Cette fonction récupère les données pour une area spécifique du tableau WellCalibrationResult.
+    Localise un tableau d'une feuille de résultats de puits : ligne de titre de la section,
+    ligne d'en-têtes de colonnes, puis bloc de données jusqu'à la première ligne vide.
+    La recherche porte sur toutes les cellules de la feuille en une seule opération.
+
+    :param df: DataFrame de la feuille.
+    :param section_title: Début du texte de la cellule de titre (ex: 'WellCalibrationResult').
+    :param header_marker: Texte contenu dans la ligne d'en-têtes (ex: 'Activity').
+    :return: Tuple (section_row, header_row, data_start_row, data_end_row), None pour les
+             lignes non trouvées ; le bloc de données est df.iloc[data_start_row:data_end_row].
+    """
+    cells = df.to_numpy(dtype=str)
 
-    :param file_path: Chemin vers le fichier de résultats de puits.
-    :param area_index: Index de l'area (basé sur 0).
+    section_rows = np.flatnonzero(np.char.startswith(cells, section_title).any(axis=1))
+    if section_rows.size == 0:
+        return None, None, None, None
+    section_row = int(section_rows[0])
+
+    header_rows = np.flatnonzero((np.char.find(cells[section_row + 1:], header_marker) >= 0).any(axis=1))
+    if header_rows.size == 0:
+        return section_row, None, None, None
+    header_row = section_row + 1 + int(header_rows[0])
+
+    # Le bloc s'arrête à la première ligne dont la première cellule est vide
+    data_start_row = header_row + 1
+    first_column = df.iloc[data_start_row:, 0]
+    empty_rows = np.flatnonzero((first_column.isna() | first_column.astype(str).str.strip().eq('')).to_numpy())
+    data_end_row = data_start_row + int(empty_rows[0]) if empty_rows.size else len(df)
+
+    return section_row, header_row, data_start_row, data_end_row
+
+
+def toNumeric(values):
+    """
+    Convertit une colonne de nombres écrits avec une virgule ou un point décimal.
+
+    :param values: Series à convertir.
+    :return: Series de float, NaN pour les cellules non numériques.
+    """
+    text = values.astype(str).str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(text, errors='coerce')
+
+
+def parseCalibrationSection(df, sheet_name):
+    """
+    Extrait les données du tableau WellCalibrationResult d'une feuille de résultats de puits.
+
+    :param df: DataFrame de la feuille.
+    :param sheet_name: Nom de la feuille (pour les messages d'erreur).
     :return: Dictionnaire avec les listes 'activity' et 'values'.
     """
-    try:
-        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
-            sheet_names = xls.sheet_names
+    section_row, header_row, data_start_row, data_end_row = findSectionRows(df, 'WellCalibrationResult', 'Activity')
 
-            if area_index >= len(sheet_names):
-                raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {len(sheet_names)}")
+    if section_row is None:
+        raise ValueError(f"Section WellCalibrationResult non trouvée dans {sheet_name}")
 
-            # Lire la feuille spécifique
-            sheet_name = sheet_names[area_index]
-            df = pd.read_excel(xls, sheet_name=sheet_name)
+    if header_row is None:
+        raise ValueError(f"En-tête de colonne Activity non trouvé dans {sheet_name}")
 
-            # Trouver la section WellCalibrationResult
-            calibration_start_row = None
-            for idx, row in df.iterrows():
-                if any(str(cell).startswith('WellCalibrationResult') for cell in row if pd.notna(cell)):
-                    calibration_start_row = idx
-                    break
+    # Activité en 1ère colonne, valeur (écart type) en 4ème colonne
+    if df.shape[1] < 4:
+        return {'activity': [], 'values': []}
 
-            if calibration_start_row is None:
-                raise ValueError(f"Section WellCalibrationResult non trouvée dans {sheet_name}")
+    block = df.iloc[data_start_row:data_end_row]
+    activities = toNumeric(block.iloc[:, 0])
+    values = toNumeric(block.iloc[:, 3])
 
-            # Chercher la ligne avec les en-têtes de colonnes (Activity, etc.)
-            header_row = None
-            for idx in range(calibration_start_row + 1, len(df)):
-                row = df.iloc[idx]
-                if 'Activity' in str(row.iloc[0]) or any('Activity' in str(cell) for cell in row if pd.notna(cell)):
-                    header_row = idx
-                    break
+    # Ignorer les lignes qui ne contiennent pas de données numériques
+    valid = (activities.notna() & values.notna()).to_numpy()
 
-            if header_row is None:
-                raise ValueError(f"En-tête de colonne Activity non trouvé dans {sheet_name}")
+    return {
+        'activity': activities.to_numpy()[valid].tolist(),
+        'values': values.to_numpy()[valid].tolist()
+    }
 
-            # Extraire les données à partir de la ligne après les en-têtes
-            data_start_row = header_row + 1
 
-            # Extraire l'activité et les valeurs (4ème colonne = écart type)
-            activities = []
-            values = []
+def parseBlankSection(df, sheet_name):
+    """
+    Extrait les valeurs des blancs non exclus du tableau WellBlankResult d'une feuille de résultats de puits.
 
-            for idx in range(data_start_row, len(df)):
-                row = df.iloc[idx]
+    :param df: DataFrame de la feuille.
+    :param sheet_name: Nom de la feuille (pour les messages d'erreur).
+    :return: Liste des valeurs de dégradation des blancs non exclus.
+    """
+    section_row, header_row, data_start_row, data_end_row = findSectionRows(df, 'WellBlankResult', 'Well')
 
-                # Arrêter si on rencontre une ligne vide ou une autre section
-                if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                    break
+    if section_row is None:
+        raise ValueError(f"Section WellBlankResult non trouvée dans {sheet_name}")
 
-                # Vérifier si cela ressemble à une ligne de données (première colonne doit être une activité numérique)
-                try:
-                    activity = float(str(row.iloc[0]).replace(',', '.'))  # Gérer le séparateur décimal virgule
-                    if len(row) >= 4 and pd.notna(row.iloc[3]):  # 4ème colonne (index 3)
-                        value = float(str(row.iloc[3]).replace(',', '.'))  # Gérer le séparateur décimal virgule
-                        activities.append(activity)
-                        values.append(value)
-                except (ValueError, IndexError):
-                    # Ignorer les lignes qui ne contiennent pas de données numériques
-                    continue
-
-            return {
-                'activity': activities,
-                'values': values
-            }
+    if header_row is None:
+        raise ValueError(f"En-tête de colonne Well non trouvé dans {sheet_name}")
 
-    except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture de l'area {area_index} depuis {file_path}: {e}")
+    # Colonnes attendues : Well, Trouble, Zymunit, Exclusion, Exclusion comment
+    if df.shape[1] < 4:
+        return []
 
+    block = df.iloc[data_start_row:data_end_row]
+    zymunit = block.iloc[:, 2]
+    not_excluded = block.iloc[:, 3].astype(str).str.lower().eq('false')
+    zymunit_values = toNumeric(zymunit)
 
-def getBlankDataForAreaInWellResultFile(file_path, area_index):
+    # Garder les blancs non exclus dont la valeur Zymunit est renseignée et numérique
+    valid = (not_excluded & zymunit.notna() & zymunit_values.notna()).to_numpy()
+
+    return zymunit_values.to_numpy()[valid].tolist()
+
+
+class WellResultsWorkbook:
     """
-    Cette fonction récupère les données des blancs pour une area spécifique du tableau WellBlankResult.
+    Classeur WellResults.xlsx lu une seule fois.
+
+    Toutes les feuilles (une par area) sont lues à l'ouverture ; les sections
+    WellCalibrationResult (plage d'activité et valeurs) et WellBlankResult sont extraites
+    à la première demande puis conservées. Utiliser getWellResultsWorkbook pour partager
+    le même classeur entre les fonctions de ce module.
+
+    Un classeur rechargé depuis son fichier annexe (loadWellResultsSidecar) ne contient que
+    les sections extraites : sheets est alors vide.
+    """
+
+    SECTION_PARSERS = {
+        'calibration': parseCalibrationSection,
+        'blanks': parseBlankSection
+    }
+
+    def __init__(self, file_path):
+        """
+        :param file_path: Chemin vers le fichier de résultats de puits.
+        """
+        self.file_path = file_path
+        try:
+            with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
+                self.sheet_names = list(xls.sheet_names)
+                self.sheets = {sheet_name: pd.read_excel(xls, sheet_name=sheet_name)
+                               for sheet_name in self.sheet_names}
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+
+        # Par section et par feuille : données extraites, ou message d'erreur (ValueError)
+        self.sections = {section: {} for section in self.SECTION_PARSERS}
+
+    @classmethod
+    def from_sections(cls, file_path, sheet_names, sections):
+        """
+        Construit un classeur à partir de sections déjà extraites, sans relire le fichier Excel.
+
+        :param file_path: Chemin vers le fichier de résultats de puits.
+        :param sheet_names: Noms des feuilles, dans l'ordre des areas.
+        :param sections: Dictionnaire {section: {feuille: données ou ValueError}}.
+        :return: WellResultsWorkbook.
+        """
+        workbook = cls.__new__(cls)
+        workbook.file_path = file_path
+        workbook.sheet_names = list(sheet_names)
+        workbook.sheets = {}
+        workbook.sections = {section: dict(sections.get(section, {})) for section in cls.SECTION_PARSERS}
+        return workbook
+
+    @property
+    def number_of_areas(self):
+        return len(self.sheet_names)
+
+    def get_sheet_name(self, area_index):
+        """
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Nom de la feuille de l'area.
+        """
+        if area_index >= len(self.sheet_names):
+            raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {len(self.sheet_names)}")
+        return self.sheet_names[area_index]
+
+    def get_sheet(self, sheet_name):
+        """
+        Feuille brute du classeur. Un classeur rechargé depuis son fichier annexe n'a pas
+        ses feuilles : elles sont alors toutes relues en une fois depuis le fichier Excel.
+
+        :param sheet_name: Nom de la feuille.
+        :return: DataFrame de la feuille (lu comme pd.read_excel(file_path, sheet_name=sheet_name)).
+        """
+        if not self.sheets:
+            try:
+                self.sheets = pd.read_excel(self.file_path, sheet_name=None)
+            except Exception as e:
+                raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+        if sheet_name not in self.sheets:
+            raise ValueError(f"Feuille {sheet_name} non trouvée dans {self.file_path}")
+        return self.sheets[sheet_name]
+
+    def _get_section(self, section, sheet_name):
+        extracted = self.sections[section]
+        if sheet_name not in extracted:
+            try:
+                extracted[sheet_name] = self.SECTION_PARSERS[section](self.sheets[sheet_name], sheet_name)
+            except ValueError as e:
+                extracted[sheet_name] = e
+        data = extracted[sheet_name]
+        if isinstance(data, ValueError):
+            raise ValueError(str(data))
+        return data
+
+    def parse_all_sections(self):
+        """
+        Extrait toutes les sections de toutes les feuilles (les sections absentes sont
+        conservées sous forme d'erreur, levée lors de l'accès).
+        """
+        for sheet_name in self.sheet_names:
+            for section in self.SECTION_PARSERS:
+                try:
+                    self._get_section(section, sheet_name)
+                except ValueError:
+                    pass
+
+    def get_calibration(self, area_index):
+        """
+        Données du tableau WellCalibrationResult d'une area.
+
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Dictionnaire avec les listes 'activity' et 'values'.
+        """
+        calibration = self._get_section('calibration', self.get_sheet_name(area_index))
+        return {
+            'activity': list(calibration['activity']),
+            'values': list(calibration['values'])
+        }
+
+    def get_activity_range(self, area_index):
+        """
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Liste des valeurs d'activité de l'area.
+        """
+        return self.get_calibration(area_index)['activity']
+
+    def get_blanks(self, area_index):
+        """
+        Valeurs des blancs non exclus du tableau WellBlankResult d'une area.
+
+        :param area_index: Index de l'area (basé sur 0).
+        :return: Liste des valeurs de dégradation des blancs non exclus.
+        """
+        return list(self._get_section('blanks', self.get_sheet_name(area_index)))
 
+
+def getWellResultsSidecarPath(file_path):
+    """
     :param file_path: Chemin vers le fichier de résultats de puits.
-    :param area_index: Index de l'area (basé sur 0).
-    :return: Liste des valeurs de dégradation des blancs non exclus.
+    :return: Chemin du fichier annexe des sections extraites (à côté du classeur).
     """
+    return file_path + WELL_RESULTS_SIDECAR_SUFFIX
+
+
+def _computeFileHash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def saveWellResultsSidecar(workbook, sidecar_path=None):
+    """
+    Enregistre les sections extraites d'un classeur dans un fichier annexe NumPy (.npz),
+    avec la taille, la date de modification et l'empreinte du classeur source.
+
+    :param workbook: WellResultsWorkbook dont toutes les sections ont été extraites.
+    :param sidecar_path: Chemin du fichier annexe (par défaut à côté du classeur).
+    :return: True si l'enregistrement a réussi.
+    """
+    sidecar_path = sidecar_path or getWellResultsSidecarPath(workbook.file_path)
+    temp_path = sidecar_path + ".tmp"
     try:
-        with pd.ExcelFile(file_path) as xls:  # Utilisation du gestionnaire de contexte
-            sheet_names = xls.sheet_names
+        workbook.parse_all_sections()
+        stat = os.stat(workbook.file_path)
+        metadata = {
+            "version": WELL_RESULTS_SIDECAR_VERSION,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_hash": _computeFileHash(workbook.file_path),
+            "sheet_names": workbook.sheet_names,
+            "errors": {}
+        }
+        arrays = {}
+        for area_index, sheet_name in enumerate(workbook.sheet_names):
+            for section, extracted in workbook.sections.items():
+                data = extracted[sheet_name]
+                if isinstance(data, ValueError):
+                    metadata["errors"].setdefault(section, {})[sheet_name] = str(data)
+                elif section == 'calibration':
+                    arrays[f"calibration_activity_{area_index}"] = np.asarray(data['activity'], dtype=float)
+                    arrays[f"calibration_values_{area_index}"] = np.asarray(data['values'], dtype=float)
+                else:
+                    arrays[f"{section}_{area_index}"] = np.asarray(data, dtype=float)
+        arrays["metadata"] = np.array(json.dumps(metadata, ensure_ascii=False))
+
+        with open(temp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, sidecar_path)
+        return True
+    except Exception as e:
+        logger.warning(f"Impossible d'enregistrer les sections WellResults {sidecar_path}: {e}")
+        return False
 
-            if area_index >= len(sheet_names):
-                raise IndexError(f"L'index d'area {area_index} est hors limites. Areas disponibles: {len(sheet_names)}")
 
-            # Lire la feuille spécifique
-            sheet_name = sheet_names[area_index]
-            df = pd.read_excel(xls, sheet_name=sheet_name)
+def loadWellResultsSidecar(file_path, sidecar_path=None):
+    """
+    Charge les sections d'un classeur depuis son fichier annexe, s'il correspond toujours au
+    classeur source : même taille et même date de modification, ou même empreinte si le
+    fichier a été copié.
 
-            # Trouver la section WellBlankResult
-            blank_start_row = None
-            for idx, row in df.iterrows():
-                if any(str(cell).startswith('WellBlankResult') for cell in row if pd.notna(cell)):
-                    blank_start_row = idx
-                    break
+    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param sidecar_path: Chemin du fichier annexe (par défaut à côté du classeur).
+    :return: WellResultsWorkbook, ou None si le fichier annexe est absent, illisible ou obsolète.
+    """
+    sidecar_path = sidecar_path or getWellResultsSidecarPath(file_path)
+    if not os.path.exists(sidecar_path):
+        return None
 
-            if blank_start_row is None:
-                raise ValueError(f"Section WellBlankResult non trouvée dans {sheet_name}")
+    try:
+        with np.load(sidecar_path, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            if metadata.get("version") != WELL_RESULTS_SIDECAR_VERSION:
+                return None
+
+            stat = os.stat(file_path)
+            if stat.st_size != metadata["source_size"]:
+                return None
+            if (stat.st_mtime_ns != metadata["source_mtime_ns"]
+                    and _computeFileHash(file_path) != metadata["source_hash"]):
+                return None
+
+            errors = metadata["errors"]
+            sections = {section: {} for section in WellResultsWorkbook.SECTION_PARSERS}
+            for area_index, sheet_name in enumerate(metadata["sheet_names"]):
+                for section in sections:
+                    if sheet_name in errors.get(section, {}):
+                        sections[section][sheet_name] = ValueError(errors[section][sheet_name])
+                    elif section == 'calibration':
+                        sections[section][sheet_name] = {
+                            'activity': data[f"calibration_activity_{area_index}"].tolist(),
+                            'values': data[f"calibration_values_{area_index}"].tolist()
+                        }
+                    else:
+                        sections[section][sheet_name] = data[f"{section}_{area_index}"].tolist()
+    except Exception as e:
+        logger.warning(f"Fichier annexe WellResults illisible, il sera reconstruit: {sidecar_path} ({e})")
+        return None
 
-            # Chercher la ligne avec les en-têtes de colonnes
-            header_row = None
-            for idx in range(blank_start_row + 1, len(df)):
-                row = df.iloc[idx]
-                if 'Well' in str(row.iloc[0]) or any('Well' in str(cell) for cell in row if pd.notna(cell)):
-                    header_row = idx
-                    break
+    return WellResultsWorkbook.from_sections(file_path, metadata["sheet_names"], sections)
 
-            if header_row is None:
-                raise ValueError(f"En-tête de colonne Well non trouvé dans {sheet_name}")
 
-            # Extraire les données à partir de la ligne après les en-têtes
-            data_start_row = header_row + 1
+def getWellResultsWorkbook(file_path, use_sidecar=True):
+    """
+    Retourne le classeur WellResults d'un fichier, lu une seule fois tant que le fichier
+    n'est pas modifié (cache par chemin, date de modification et taille).
 
-            blank_values = []
+    Si use_sidecar est vrai, les sections extraites sont aussi conservées dans un fichier
+    annexe à côté du classeur : les analyses suivantes (même dans un autre processus) le
+    rechargent sans relire le fichier Excel.
 
-            for idx in range(data_start_row, len(df)):
-                row = df.iloc[idx]
+    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param use_sidecar: Utiliser (et créer si besoin) le fichier annexe des sections.
+    :return: WellResultsWorkbook partagé.
+    """
+    if isinstance(file_path, WellResultsWorkbook):
+        return file_path
 
-                # Arrêter si on rencontre une ligne vide ou une autre section
-                if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                    break
+    try:
+        stat = os.stat(file_path)
+    except OSError as e:
+        raise ValueError(f"Erreur lors de la lecture du fichier de résultats de puits: {e}")
+    key = os.path.abspath(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _well_results_cache_lock:
+        cached = _well_results_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _well_results_cache.move_to_end(key)
+            return cached[1]
+
+    workbook = loadWellResultsSidecar(file_path) if use_sidecar else None
+    if workbook is None:
+        workbook = WellResultsWorkbook(file_path)
+        if use_sidecar:
+            saveWellResultsSidecar(workbook)
+
+    with _well_results_cache_lock:
+        _well_results_cache[key] = (signature, workbook)
+        _well_results_cache.move_to_end(key)
+        while len(_well_results_cache) > WELL_RESULTS_CACHE_SIZE:
+            _well_results_cache.popitem(last=False)
+    return workbook
+
+
+def clearWellResultsCache():
+    """
+    Vide le cache des classeurs WellResults.
+    """
+    with _well_results_cache_lock:
+        _well_results_cache.clear()
 
-                # Vérifier si la ligne contient des données de blancs
-                try:
-                    # Colonnes attendues : Well, Trouble, Zymunit, Exclusion, Exclusion comment
-                    well = str(row.iloc[0]).strip()
-                    if len(row) >= 4:
-                        zymunit_value = row.iloc[2]  # Colonne Zymunit (index 2)
-                        exclusion = row.iloc[3]  # Colonne Exclusion (index 3)
 
-                        # Vérifier que l'exclusion est False et que la valeur Zymunit est valide
-                        if (str(exclusion).lower() == 'false' and
-                                pd.notna(zymunit_value) and
-                                str(zymunit_value).strip() != ''):
-                            zymunit_float = float(str(zymunit_value).replace(',', '.'))
-                            blank_values.append(zymunit_float)
+def getDataForAreaInWellResultFile(file_path, area_index):
+    """
+    Cette fonction récupère les données pour une area spécifique du tableau WellCalibrationResult.
+
+    :param file_path: Chemin vers le fichier de résultats de puits (ou WellResultsWorkbook).
+    :param area_index: Index de l'area (basé sur 0).
+    :return: Dictionnaire avec les listes 'activity' et 'values'.
+    """
+    try:
+        return getWellResultsWorkbook(file_path).get_calibration(area_index)
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la lecture de l'area {area_index} depuis {_describeSource(file_path)}: {e}")
 
-                except (ValueError, IndexError):
-                    # Ignorer les lignes qui ne contiennent pas de données numériques valides
-                    continue
 
-            return blank_values
+def getBlankDataForAreaInWellResultFile(file_path, area_index):
+    """
+    Cette fonction récupère les données des blancs pour une area spécifique du tableau WellBlankResult.
 
+    :param file_path: Chemin vers le fichier de résultats de puits (ou WellResultsWorkbook).
+    :param area_index: Index de l'area (basé sur 0).
+    :return: Liste des valeurs de dégradation des blancs non exclus.
+    """
+    try:
+        return getWellResultsWorkbook(file_path).get_blanks(area_index)
     except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture des blancs pour l'area {area_index} depuis {file_path}: {e}")
+        raise ValueError(f"Erreur lors de la lecture des blancs pour l'area {area_index} depuis {_describeSource(file_path)}: {e}")
+
+
+def _describeSource(file_path):
+    return file_path.file_path if isinstance(file_path, WellResultsWorkbook) else file_path
 
 
 def calculateLODLOQ(file_path, area_index):
     """
     Calcule la LOD et LOQ pour une area spécifique.
 
-    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param file_path: Chemin vers le fichier de résultats de puits (ou WellResultsWorkbook).
     :param area_index: Index de l'area (basé sur 0).
     :return: Dictionnaire avec les valeurs LOD et LOQ.
     """
@@ -243,9 +538,13 @@ def calculateLODLOQComparison(acquisition_folder, reference_folder):
     if not acquisition_file_path or not reference_file_path:
         raise FileNotFoundError("Fichiers de résultats de puits non trouvés dans les dossiers spécifiés.")
 
+    # Lire chaque classeur une seule fois pour toutes les areas
+    acquisition_workbook = getWellResultsWorkbook(acquisition_file_path)
+    reference_workbook = getWellResultsWorkbook(reference_file_path)
+
     # Obtenir le nombre d'areas
-    acquisition_number_of_areas = getNumberOfAreasInWellResultFile(acquisition_file_path)
-    reference_number_of_areas = getNumberOfAreasInWellResultFile(reference_file_path)
+    acquisition_number_of_areas = getNumberOfAreasInWellResultFile(acquisition_workbook)
+    reference_number_of_areas = getNumberOfAreasInWellResultFile(reference_workbook)
 
     if acquisition_number_of_areas != reference_number_of_areas:
         raise ValueError(
@@ -258,10 +557,10 @@ def calculateLODLOQComparison(acquisition_folder, reference_folder):
     for area_index in range(acquisition_number_of_areas):
         try:
             # Calculer LOD/LOQ pour l'acquisition
-            acq_results = calculateLODLOQ(acquisition_file_path, area_index)
+            acq_results = calculateLODLOQ(acquisition_workbook, area_index)
 
             # Calculer LOD/LOQ pour la référence
-            ref_results = calculateLODLOQ(reference_file_path, area_index)
+            ref_results = calculateLODLOQ(reference_workbook, area_index)
 
             # Calculer les différences
             diff_lod = acq_results['lod'] - ref_results['lod']
@@ -317,7 +616,7 @@ def getActivityRangeFromAreaInWellResultFile(file_path, area_index):
     """
     Cette fonction récupère la plage d'activité pour une area spécifique dans un fichier de résultats de puits.
 
-    :param file_path: Chemin vers le fichier de résultats de puits.
+    :param file_path: Chemin vers le fichier de résultats de puits (ou WellResultsWorkbook).
     :param area_index: Index de l'area (basé sur 0).
     :return: Liste des valeurs d'activité.
     """
@@ -410,9 +709,13 @@ def processWellResults(acquisition_folder, reference_folder):
     if not acquisition_file_path or not reference_file_path:
         raise FileNotFoundError("Fichiers de résultats de puits non trouvés dans les dossiers spécifiés.")
 
+    # Lire chaque classeur une seule fois pour toutes les areas
+    acquisition_workbook = getWellResultsWorkbook(acquisition_file_path)
+    reference_workbook = getWellResultsWorkbook(reference_file_path)
+
     # Obtenir le nombre d'areas
-    acquisition_number_of_areas = getNumberOfAreasInWellResultFile(acquisition_file_path)
-    reference_number_of_areas = getNumberOfAreasInWellResultFile(reference_file_path)
+    acquisition_number_of_areas = getNumberOfAreasInWellResultFile(acquisition_workbook)
+    reference_number_of_areas = getNumberOfAreasInWellResultFile(reference_workbook)
 
     if acquisition_number_of_areas != reference_number_of_areas:
         raise ValueError(
@@ -424,16 +727,16 @@ def processWellResults(acquisition_folder, reference_folder):
     # Traiter chaque area
     for area_index in range(acquisition_number_of_areas):
         # Obtenir les plages d'activité
-        acquisition_activities = getActivityRangeFromAreaInWellResultFile(acquisition_file_path, area_index)
-        reference_activities = getActivityRangeFromAreaInWellResultFile(reference_file_path, area_index)
+        acquisition_activities = getActivityRangeFromAreaInWellResultFile(acquisition_workbook, area_index)
+        reference_activities = getActivityRangeFromAreaInWellResultFile(reference_workbook, area_index)
 
         # Vérifier que les activités correspondent
         if not compareActivityRanges(acquisition_activities, reference_activities):
             raise ValueError(f"Les plages d'activité ne correspondent pas pour l'area {area_index + 1}")
 
         # Obtenir les données pour les deux fichiers
-        acquisition_data = getDataForAreaInWellResultFile(acquisition_file_path, area_index)
-        reference_data = getDataForAreaInWellResultFile(reference_file_path, area_index)
+        acquisition_data = getDataForAreaInWellResultFile(acquisition_workbook, area_index)
+        reference_data = getDataForAreaInWellResultFile(reference_workbook, area_index)
 
         # Créer les lignes pour cette area
         for i, activity in enumerate(acquisition_data['activity']):
@@ -16,6 +16,8 @@ import string
 import time
 import matplotlib.colors as colors
 import os
+import threading
+from collections import OrderedDict
 
 alphabet_majuscule = string.ascii_uppercase
 
@@ -204,75 +206,218 @@ def toc():
         print("Toc: start time not set")
 
 
-def import_data_from_csv_synthese_zymintern(file):
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
-    nb_puits = 96
+# Format de plaque (nombre de puits) -> (nombre de lignes, nombre de colonnes)
+PLATE_GEOMETRIES = {96: (8, 12), 384: (16, 24)}
 
-#    pandas.read_csv(file,sep=';',error_bad_lines=False,index_col=False)
-#    une colonne sans nom met le bordel
-    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=[0,1,2,3,4,5,6,7,8,9,10])
+# (nom court, colonne du fichier synthese_interferometric_data.csv)
+SYNTHESE_ZYMINTERN_COLUMNS = (
+    ('volume', 'volume_after_statiscal_filter'),
+    ('volume_std', 'volume_std_after_statiscal_filter'),
+    ('diametre', 'diameter_mean_after_statiscal_filter'),
+    ('diametre_std', 'diameter_std_after_statiscal_filter'),
+    ('N_dot_detected', 'number_of_dot_BEFORE_statiscal_filter'),
+    ('N_dot_keep', 'number_of_dot_after_statiscal_filter'),
+    ('N_cycle', 'Ncycles_mean_after_statiscal_filter'),
+)
+SYNTHESE_NANOFILM_COLUMNS = (
+    ('thickness', 'thickness_after_statiscal_filter'),
+    ('thickness_std', 'thickness_std_after_statiscal_filter'),
+    ('intensity_455', '455_intensity'),
+    ('intensity_730', '730_intensity'),
+    ('N_area_before', 'number_of_area_BEFORE_statiscal_filter'),
+    ('N_area_after', 'number_of_area_after_statiscal_filter'),
+)
 
-    volume_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    volume_std_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    diametre_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    diametre_std_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    N_dot_detected_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    N_dot_keep_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    N_cycle_raw = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    porcent_dot_keep  = np.zeros((number_of_letters_max,number_of_colonne_number_max))
 
-    j_scan = 0
-    while j_scan<nb_puits:
-        name_position = df_file['Position_plaque'][j_scan]
-        letter_now = name_position[0]
-        j_col = int(name_position[1:])-1 # -1 pour bien commencer avec un indice nul
-        j_letter = int(alphabet_majuscule.find(letter_now))
-        volume_raw[j_letter,j_col] = df_file['volume_after_statiscal_filter'][j_scan]
-        volume_std_raw[j_letter,j_col] = df_file['volume_std_after_statiscal_filter'][j_scan]
-        diametre_raw[j_letter,j_col] = df_file['diameter_mean_after_statiscal_filter'][j_scan]
-        diametre_std_raw[j_letter,j_col] = df_file['diameter_std_after_statiscal_filter'][j_scan]
-        N_dot_detected_raw[j_letter,j_col] = df_file['number_of_dot_BEFORE_statiscal_filter'][j_scan]
-        N_dot_keep_raw[j_letter,j_col] = df_file['number_of_dot_after_statiscal_filter'][j_scan]
-        N_cycle_raw[j_letter,j_col] = df_file['Ncycles_mean_after_statiscal_filter'][j_scan]
-        porcent_dot_keep[j_letter,j_col] = N_dot_keep_raw[j_letter,j_col]/ N_dot_detected_raw[j_letter,j_col] *100
-        j_scan += 1
+def plate_geometry(plate_format=96):
+    """Retourne (nombre de lignes, nombre de colonnes) pour une plaque de 96 ou 384 puits."""
+    if plate_format not in PLATE_GEOMETRIES:
+        raise ValueError(f"Format de plaque non supporté: {plate_format} (formats disponibles: {sorted(PLATE_GEOMETRIES)})")
+    return PLATE_GEOMETRIES[plate_format]
 
-    return volume_raw, volume_std_raw, diametre_raw, diametre_std_raw, N_dot_detected_raw, N_dot_keep_raw, N_cycle_raw, porcent_dot_keep
 
-def import_data_from_csv_synthese_zymintern_nanofilm(file): # nouveau (v3 19/02/2025)
-    number_of_letters_max = 8
-    number_of_colonne_number_max = 12
-    nb_puits = 96
+def plate_position_to_indices(positions, plate_format=96):
+    """
+    Convertit des positions de puits ('A1', 'H12', 'P24'...) en indices (ligne, colonne) commençant à 0.
 
-#    pandas.read_csv(file,sep=';',error_bad_lines=False,index_col=False)
-#    une colonne sans nom met le bordel
-    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=[0,1,2,3,4,5,6,7,8,9])
+    positions : séquence de noms de puits
+    Retourne deux tableaux d'entiers (lignes, colonnes).
+    """
+    number_of_letters_max, number_of_colonne_number_max = plate_geometry(plate_format)
+    names = pandas.Series(positions, dtype=str).str.strip().str.upper()
 
-    thickness_after_statiscal_filter = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    thickness_std_after_statiscal_filter = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    intensity_455 = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    intensity_730 = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    number_of_area_BEFORE_statiscal_filter = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    number_of_area_after_statiscal_filter  = np.zeros((number_of_letters_max,number_of_colonne_number_max))
-    pourcentage_zones_gardees = np.zeros((number_of_letters_max,number_of_colonne_number_max))
+    j_letter = np.array(names.str[0].tolist(), dtype='U1').view(np.int32) - ord('A')
+    j_col = pandas.to_numeric(names.str[1:], errors='coerce').to_numpy() - 1 # -1 pour bien commencer avec un indice nul
+
+    outside = (j_letter < 0) | (j_letter >= number_of_letters_max) | ~(j_col >= 0) | (j_col >= number_of_colonne_number_max)
+    if outside.any():
+        raise ValueError(f"Position(s) hors d'une plaque de {plate_format} puits: {list(names[outside])}")
+    return j_letter.astype(np.intp), j_col.astype(np.intp)
 
-    j_scan = 0
-    while j_scan<nb_puits:
-        name_position = df_file['Position_plaque'][j_scan]
-        letter_now = name_position[0]
-        j_col = int(name_position[1:])-1 # -1 pour bien commencer avec un indice nul
-        j_letter = int(alphabet_majuscule.find(letter_now))
-        thickness_after_statiscal_filter[j_letter,j_col] = df_file['thickness_after_statiscal_filter'][j_scan]
-        thickness_std_after_statiscal_filter[j_letter,j_col] = df_file['thickness_std_after_statiscal_filter'][j_scan]
-        intensity_455[j_letter,j_col] = df_file['455_intensity'][j_scan]
-        intensity_730[j_letter,j_col] = df_file['730_intensity'][j_scan]
-        number_of_area_BEFORE_statiscal_filter[j_letter,j_col] = df_file['number_of_area_BEFORE_statiscal_filter'][j_scan]
-        number_of_area_after_statiscal_filter[j_letter,j_col] = df_file['number_of_area_after_statiscal_filter'][j_scan]
-        pourcentage_zones_gardees[j_letter,j_col] = number_of_area_after_statiscal_filter[j_letter,j_col]*100/number_of_area_BEFORE_statiscal_filter[j_letter,j_col]
-        j_scan += 1
 
-    return thickness_after_statiscal_filter, thickness_std_after_statiscal_filter, intensity_455, intensity_730, number_of_area_BEFORE_statiscal_filter, number_of_area_after_statiscal_filter, pourcentage_zones_gardees
+class PlateMetrics:
+    """
+    Métriques d'une plaque empilées dans un seul tableau values de forme (n_metrics, lignes, colonnes).
+
+    Accès par nom (plate['volume']) ou par dépaquetage dans l'ordre des métriques
+    (volume, volume_std, ... = plate).
+    """
+
+    def __init__(self, names, values):
+        self.names = tuple(names)
+        self.values = values
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    def __getitem__(self, name):
+        return self.values[self._index[name]]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.names)
+
+    def as_dict(self):
+        return {name: self.values[i] for i, name in enumerate(self.names)}
+
+
+def scatter_plate_metrics(positions, data, names, plate_format=96):
+    """
+    Place les valeurs de chaque puits dans un tableau (n_metrics, lignes, colonnes).
+
+    positions : noms des puits (un par ligne de data)
+    data : tableau (n_puits, n_metrics)
+    Les puits absents restent à 0.
+    """
+    number_of_letters_max, number_of_colonne_number_max = plate_geometry(plate_format)
+    j_letter, j_col = plate_position_to_indices(positions, plate_format)
+    values = np.zeros((len(names), number_of_letters_max, number_of_colonne_number_max))
+    values[:, j_letter, j_col] = np.asarray(data, dtype=float).T
+    return PlateMetrics(names, values)
+
+
+def load_plate_synthese_csv(file, columns, usecols, plate_format=96):
+    """
+    Lit un fichier de synthèse (séparateur ';') et retourne les colonnes demandées par puits.
+
+    columns : séquence de (nom court, colonne du fichier)
+    Retourne (positions, tableau (n_puits, n_metrics)).
+    """
+    nb_puits = int(np.prod(plate_geometry(plate_format)))
+#    une colonne sans nom met le bordel
+    df_file = pandas.read_csv(file,sep=';',index_col=False,usecols=usecols).iloc[:nb_puits]
+    data = df_file[[column for _, column in columns]].to_numpy(dtype=float)
+    return df_file['Position_plaque'].to_numpy(), data
+
+
+def import_plate_synthese_zymintern(file, plate_format=96):
+    """
+    Version vectorisée de import_data_from_csv_synthese_zymintern : retourne un PlateMetrics
+    (volume, volume_std, diametre, diametre_std, N_dot_detected, N_dot_keep, N_cycle, porcent_dot_keep).
+    """
+    positions, data = load_plate_synthese_csv(file, SYNTHESE_ZYMINTERN_COLUMNS, [0,1,2,3,4,5,6,7,8,9,10], plate_format)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        porcent_dot_keep = data[:, 5] / data[:, 4] * 100
+    names = [name for name, _ in SYNTHESE_ZYMINTERN_COLUMNS] + ['porcent_dot_keep']
+    return scatter_plate_metrics(positions, np.column_stack([data, porcent_dot_keep]), names, plate_format)
+
+
+def import_plate_synthese_zymintern_nanofilm(file, plate_format=96):
+    """
+    Version vectorisée de import_data_from_csv_synthese_zymintern_nanofilm : retourne un PlateMetrics
+    (thickness, thickness_std, intensity_455, intensity_730, N_area_before, N_area_after, pourcentage_zones_gardees).
+    """
+    positions, data = load_plate_synthese_csv(file, SYNTHESE_NANOFILM_COLUMNS, [0,1,2,3,4,5,6,7,8,9], plate_format)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pourcentage_zones_gardees = data[:, 5] * 100 / data[:, 4]
+    names = [name for name, _ in SYNTHESE_NANOFILM_COLUMNS] + ['pourcentage_zones_gardees']
+    return scatter_plate_metrics(positions, np.column_stack([data, pourcentage_zones_gardees]), names, plate_format)
+
+
+SYNTHESE_LOADERS = {
+    'zymintern': import_plate_synthese_zymintern,
+    'nanofilm': import_plate_synthese_zymintern_nanofilm,
+}
+
+# Cache mémoire des fichiers de synthèse déjà lus : une même référence comparée plusieurs fois
+# dans une session n'est lue qu'une fois. Les entrées les plus anciennes sont évincées au-delà du budget.
+SYNTHESE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_synthese_cache = OrderedDict()
+_synthese_cache_lock = threading.Lock()
+_synthese_cache_stats = {'hits': 0, 'misses': 0, 'bytes': 0}
+
+
+def read_plate_synthese_cached(file, kind='zymintern', plate_format=96):
+    """
+    Lit un fichier synthese_interferometric_data.csv en passant par un cache LRU.
+
+    La clé est le chemin du fichier (avec le type et le format de plaque), validée par sa date de
+    modification et sa taille : un fichier réécrit est relu. Les tableaux retournés sont partagés
+    entre les appels et donc en lecture seule (utiliser np.copy pour les modifier).
+
+    kind : 'zymintern' ou 'nanofilm'
+    Retourne un PlateMetrics.
+    """
+    if kind not in SYNTHESE_LOADERS:
+        raise ValueError(f"Type de fichier de synthèse inconnu: {kind} (types disponibles: {list(SYNTHESE_LOADERS)})")
+    stat = os.stat(file)
+    key = (os.path.abspath(file), kind, plate_format)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _synthese_cache_lock:
+        cached = _synthese_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _synthese_cache.move_to_end(key)
+            _synthese_cache_stats['hits'] += 1
+            return cached[1]
+
+    plate = SYNTHESE_LOADERS[kind](file, plate_format)
+    plate.values.setflags(write=False)
+
+    with _synthese_cache_lock:
+        _synthese_cache_stats['misses'] += 1
+        previous = _synthese_cache.pop(key, None)
+        if previous is not None:
+            _synthese_cache_stats['bytes'] -= previous[1].values.nbytes
+        _synthese_cache[key] = (signature, plate)
+        _synthese_cache_stats['bytes'] += plate.values.nbytes
+        while _synthese_cache_stats['bytes'] > SYNTHESE_CACHE_MAX_BYTES and len(_synthese_cache) > 1:
+            _, (_, evicted) = _synthese_cache.popitem(last=False)
+            _synthese_cache_stats['bytes'] -= evicted.values.nbytes
+    return plate
+
+
+def clear_synthese_cache():
+    """Vide le cache des fichiers de synthèse."""
+    with _synthese_cache_lock:
+        _synthese_cache.clear()
+        _synthese_cache_stats.update(hits=0, misses=0, bytes=0)
+
+
+def synthese_cache_info():
+    """Retourne le nombre d'entrées, la mémoire utilisée et les hits/misses du cache des fichiers de synthèse."""
+    with _synthese_cache_lock:
+        return dict(_synthese_cache_stats, entries=len(_synthese_cache))
+
+
+def import_data_from_csv_synthese_zymintern(file, plate_format=96, use_cache=True):
+    # volume_raw, volume_std_raw, diametre_raw, diametre_std_raw, N_dot_detected_raw, N_dot_keep_raw, N_cycle_raw, porcent_dot_keep
+    # avec use_cache (par défaut) les tableaux sont partagés et en lecture seule
+    if use_cache:
+        return tuple(read_plate_synthese_cached(file, 'zymintern', plate_format))
+    return tuple(import_plate_synthese_zymintern(file, plate_format))
+
+def import_data_from_csv_synthese_zymintern_nanofilm(file, plate_format=96, use_cache=True): # nouveau (v3 19/02/2025)
+    # thickness_after_statiscal_filter, thickness_std_after_statiscal_filter, intensity_455, intensity_730,
+    # number_of_area_BEFORE_statiscal_filter, number_of_area_after_statiscal_filter, pourcentage_zones_gardees
+    # avec use_cache (par défaut) les tableaux sont partagés et en lecture seule
+    if use_cache:
+        return tuple(read_plate_synthese_cached(file, 'nanofilm', plate_format))
+    return tuple(import_plate_synthese_zymintern_nanofilm(file, plate_format))
 
 def import_data_from_xlsx_synthese_zymintern(file): # pas utilisé
     number_of_letters_max = 8
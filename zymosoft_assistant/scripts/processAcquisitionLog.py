@@ -1,9 +1,21 @@
+import io
 import os
 import re
+import sys
+import time
+import argparse
+import copy
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 def getLogFile(folder_path: str) -> str:
     """
@@ -22,6 +34,199 @@ def getLogFile(folder_path: str) -> str:
     raise FileNotFoundError(f"Aucun fichier de log trouvé dans {folder_path}")
 
 
+ACQUISITION_START_MARKERS = ("Starting", "acquisition")
+DRIFT_FIX_MARKER = "DRIFT FIX:"
+
+TIMESTAMP_RE = re.compile(r'\[(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})\]')
+WELL_NAME_RE = re.compile(r'Going to well\s+"([^"]+)"')
+
+# Classification des lignes utiles aux métriques d'autofocus : une seule expression régulière
+# dont le groupe nommé qui correspond donne le type d'événement (voir classifyLogLine)
+LINE_EVENT_RE = re.compile(
+    r'Going to well\s+"(?P<well>[^"]+)"'
+    r'|\[AUTOFOCUS\]\[FOCUS\]\s+(?:'
+    r'Done after\s+(?P<done>\d+)\s+loop\(s\)'
+    r'|Time out after\s+(?P<timeout>\d+)\s+loop\(s\)'
+    r'|(?P<still_not>Still not)'
+    r'|Focus not reached after\s+(?P<max_retry>\d+)\s+moves\.\s+Trying alternate commands'
+    r'|Adjusting.*move:\s+(?P<move>\d+))'
+    r'|\[AUTOFOCUS\]\[OFF\]\s+(?P<autofocus_done>Done)'
+    r'|(?P<reference_aligned>Reference wells\s+.*\s+re-aligned)'
+    r'|(?P<auto_position>Starting auto-position of wells:)'
+)
+# Sous-chaînes dont l'une au moins est présente dans toute ligne reconnue par LINE_EVENT_RE
+LINE_EVENT_PREFILTER = ("[AUTOFOCUS]", "Going to well", "Reference wells", "auto-position")
+
+# Colonnes du rapport d'analyse par lot (analyzeLogFilesBatch)
+BATCH_REPORT_COLUMNS = [
+    "Fichier", "Succès", "Erreur", "Temps d'analyse (s)",
+    "Type d'acquisition", "Durée d'acquisition (minutes)", "Nombre moyen de loops/moves",
+    "Nombre total de mesures", "Nombre total de puits", "Mesures 'Done'", "Mesures 'Timeout'",
+    "Nombre de Drift Fix",
+]
+
+# Taille des blocs lus depuis la fin du fichier pour localiser la dernière acquisition
+REVERSE_BLOCK_SIZE = 64 * 1024
+
+
+def iterLogLines(log_file_path: str, start_offset: int = 0) -> Iterator[str]:
+    """
+    Lit le fichier de log ligne par ligne, sans jamais le charger entièrement en mémoire.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param start_offset: Position (en octets) du début de ligne à partir duquel lire.
+    :return: Générateur sur les lignes du fichier.
+    """
+    if not start_offset:
+        with open(log_file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                yield line
+        return
+
+    with open(log_file_path, 'rb') as raw_file:
+        raw_file.seek(start_offset)
+        with io.TextIOWrapper(raw_file, encoding='utf-8') as file:
+            for line in file:
+                yield line
+
+
+def iterLinesReversed(handle, block_size: int = REVERSE_BLOCK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """
+    Parcourt un fichier ouvert en binaire de la fin vers le début, par blocs de taille fixe.
+
+    :param handle: Fichier ouvert en mode 'rb'.
+    :param block_size: Taille des blocs lus à chaque déplacement.
+    :return: Générateur de tuples (position en octets du début de ligne, contenu brut de la ligne).
+    """
+    handle.seek(0, os.SEEK_END)
+    position = handle.tell()
+    remainder = b''
+
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        handle.seek(position)
+        block = handle.read(read_size) + remainder
+        lines = block.split(b'\n')
+
+        # La première ligne du bloc peut être incomplète : elle est complétée au bloc suivant
+        line_start = position + len(block)
+        for line in reversed(lines[1:]):
+            line_start -= len(line)
+            yield line_start, line
+            line_start -= 1
+        remainder = lines[0]
+
+    yield 0, remainder
+
+
+def countLinesBetween(handle, start_offset: int, end_offset: int, block_size: int = 1024 * 1024) -> int:
+    """
+    Compte les fins de ligne d'un fichier binaire entre deux positions.
+
+    :param handle: Fichier ouvert en mode 'rb'.
+    :param start_offset: Position (en octets) de début du comptage.
+    :param end_offset: Position (en octets) de fin du comptage (exclue).
+    :param block_size: Taille des blocs lus.
+    :return: Nombre de lignes terminées entre les deux positions.
+    """
+    handle.seek(start_offset)
+    count = 0
+    remaining = end_offset - start_offset
+    while remaining > 0:
+        block = handle.read(min(block_size, remaining))
+        if not block:
+            break
+        count += block.count(b'\n')
+        remaining -= len(block)
+    return count
+
+
+def locateLastAcquisition(log_file_path: str, block_size: int = REVERSE_BLOCK_SIZE,
+                          count_lines: bool = True) -> Dict[str, any]:
+    """
+    Localise la dernière acquisition en lisant le fichier de log à rebours depuis la fin.
+
+    Recherche la dernière ligne "Starting ... acquisition", le dernier "Starting acquisition"
+    horodaté et le dernier "Stopping" horodaté qui le suit, sans lire l'historique antérieur.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param block_size: Taille des blocs lus à rebours.
+    :param count_lines: Si True, calcule aussi les numéros de ligne (comptage des fins de ligne
+                        avant la position, sans décodage du texte).
+    :return: Dictionnaire avec les lignes trouvées, leurs positions en octets et numéros de ligne,
+             ainsi que "read_offset" / "read_line_number", début de la zone à analyser.
+    """
+    try:
+        location = {
+            "last_acquisition": None,
+            "last_acquisition_offset": None,
+            "last_acquisition_line_number": None,
+            "start_time": None,
+            "start_offset": None,
+            "start_line": None,
+            "end_time": None,
+            "end_offset": None,
+            "end_line": None,
+            "read_offset": 0,
+            "read_line_number": 0
+        }
+
+        with open(log_file_path, 'rb') as handle:
+            for offset, raw_line in iterLinesReversed(handle, block_size):
+                if b'Starting' in raw_line and b'acquisition' in raw_line:
+                    line = raw_line.decode('utf-8')
+                    if location["last_acquisition_offset"] is None:
+                        location["last_acquisition"] = line.strip()
+                        location["last_acquisition_offset"] = offset
+                    if "Starting acquisition" in line and location["start_offset"] is None:
+                        timestamp = extractTimestamp(line)
+                        if timestamp:
+                            location["start_time"] = timestamp
+                            location["start_offset"] = offset
+                            break
+                elif b'Stopping' in raw_line and location["end_offset"] is None:
+                    timestamp = extractTimestamp(raw_line.decode('utf-8'))
+                    if timestamp:
+                        location["end_time"] = timestamp
+                        location["end_offset"] = offset
+
+            if location["start_offset"] is None:
+                location["end_time"] = None
+                location["end_offset"] = None
+
+            if location["last_acquisition_offset"] is not None:
+                location["read_offset"] = min(offset for offset in (location["last_acquisition_offset"],
+                                                                    location["start_offset"])
+                                              if offset is not None)
+
+            if count_lines:
+                # Seul le préfixe avant la zone lue est compté en entier, les autres positions
+                # sont comptées relativement à celle-ci
+                read_offset = location["read_offset"]
+                location["read_line_number"] = countLinesBetween(handle, 0, read_offset)
+                for offset_key, line_key in (("last_acquisition_offset", "last_acquisition_line_number"),
+                                             ("start_offset", "start_line"),
+                                             ("end_offset", "end_line")):
+                    if location[offset_key] is not None:
+                        location[line_key] = location["read_line_number"] + countLinesBetween(
+                            handle, read_offset, location[offset_key])
+
+        return location
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la localisation de la dernière acquisition: {e}")
+
+
+def isAcquisitionStart(line: str) -> bool:
+    """
+    Indique si la ligne marque le début d'une acquisition ("Starting ... acquisition").
+
+    :param line: Ligne de log à analyser.
+    :return: True si la ligne démarre une acquisition.
+    """
+    return ACQUISITION_START_MARKERS[0] in line and ACQUISITION_START_MARKERS[1] in line
+
+
 def identifyAcquisitionType(log_file_path: str) -> str:
     """
     Identifie le type d'acquisition (prior ou custom focus) en analysant le contenu du log.
@@ -30,10 +235,9 @@ def identifyAcquisitionType(log_file_path: str) -> str:
     :return: "prior" si le log contient "loop", "custom_focus" sinon.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        if "loop" in content.lower():
-            return "prior"
+        for line in iterLogLines(log_file_path):
+            if "loop" in line.lower():
+                return "prior"
         return "custom_focus"
     except Exception as e:
         raise ValueError(f"Erreur lors de la lecture du fichier de log: {e}")
@@ -48,14 +252,11 @@ def findLastAcquisition(log_file_path: str) -> Tuple[Optional[str], Optional[int
     :return: Tuple contenant la ligne de la dernière acquisition et son numéro de ligne, ou (None, None) si aucune trouvée.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
         last_acquisition_line = None
         last_acquisition_line_number = None
 
-        for i, line in enumerate(lines):
-            if "Starting" in line and "acquisition" in line:
+        for i, line in enumerate(iterLogLines(log_file_path)):
+            if isAcquisitionStart(line):
                 last_acquisition_line = line.strip()
                 last_acquisition_line_number = i
 
@@ -64,6 +265,30 @@ def findLastAcquisition(log_file_path: str) -> Tuple[Optional[str], Optional[int
         raise ValueError(f"Erreur lors de la recherche de la dernière acquisition: {e}")
 
 
+def classifyLogLine(line: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Classe une ligne de log selon l'événement d'autofocus qu'elle décrit.
+    Un filtre par sous-chaînes écarte d'abord les lignes sans intérêt (trames [SERIAL], moteurs...)
+    avant l'unique recherche par expression régulière.
+
+    :param line: Ligne de log à analyser.
+    :return: Tuple (type, valeur) avec type parmi "well", "done", "timeout", "still_not",
+             "max_retry", "move", "autofocus_done", "reference_aligned", "auto_position",
+             ou (None, None) si la ligne n'est pas reconnue.
+    """
+    for marker in LINE_EVENT_PREFILTER:
+        if marker in line:
+            break
+    else:
+        return None, None
+
+    match = LINE_EVENT_RE.search(line)
+    if not match:
+        return None, None
+    kind = match.lastgroup
+    return kind, match.group(kind)
+
+
 def extractWellName(line: str) -> Optional[str]:
     """
     Extrait le nom du puits d'une ligne contenant 'Going to well'.
@@ -71,10 +296,10 @@ def extractWellName(line: str) -> Optional[str]:
     :param line: Ligne de log à analyser.
     :return: Nom du puits ou None si non trouvé.
     """
-    match = re.search(r'Going to well\s+"([^"]+)"', line)
+    match = WELL_NAME_RE.search(line)
     if match:
         well_name = match.group(1)
-        print(f"[DEBUG] Well name extracted: {well_name}")
+        logger.debug(f"Well name extracted: {well_name}")
         return well_name
     return None
 
@@ -86,8 +311,7 @@ def extractTimestamp(line: str) -> Optional[datetime]:
     :param line: Ligne de log à analyser.
     :return: Objet datetime ou None si non trouvé.
     """
-    timestamp_pattern = r'\[(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})\]'
-    match = re.search(timestamp_pattern, line)
+    match = TIMESTAMP_RE.search(line)
     if match:
         try:
             return datetime.strptime(match.group(1), '%d/%m/%Y %H:%M:%S')
@@ -96,6 +320,70 @@ def extractTimestamp(line: str) -> Optional[datetime]:
     return None
 
 
+def _buildDurationResult(start_time: Optional[datetime], end_time: Optional[datetime],
+                         start_line: Optional[int], end_line: Optional[int]) -> Dict[str, any]:
+    """
+    Construit le dictionnaire de durée d'acquisition à partir des bornes trouvées.
+    """
+    if start_time and end_time:
+        duration = end_time - start_time
+        duration_seconds = duration.total_seconds()
+        duration_minutes = duration_seconds / 60
+        return {
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration_seconds": round(duration_seconds, 2),
+            "duration_minutes": round(duration_minutes, 2),
+            "duration_formatted": str(duration),
+            "start_line": start_line,
+            "end_line": end_line,
+            "success": True
+        }
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration_seconds": 0,
+        "duration_minutes": 0,
+        "duration_formatted": "N/A",
+        "start_line": start_line,
+        "end_line": end_line,
+        "success": False,
+        "error": "Unable to find both start and end timestamps"
+    }
+
+
+class AcquisitionDurationTracker:
+    """
+    Suivi incrémental de la durée de la dernière acquisition : dernier "Starting acquisition"
+    horodaté, puis dernier "Stopping" horodaté qui le suit.
+    """
+
+    def __init__(self):
+        self.start_time = None
+        self.end_time = None
+        self.start_line = None
+        self.end_line = None
+
+    def feed(self, line: str, line_number: int) -> None:
+        if "Starting acquisition" in line:
+            timestamp = extractTimestamp(line)
+            if timestamp:
+                self.start_time = timestamp
+                self.start_line = line_number
+                self.end_time = None
+                self.end_line = None
+            return
+
+        if self.start_time and "Stopping" in line:
+            timestamp = extractTimestamp(line)
+            if timestamp:
+                self.end_time = timestamp
+                self.end_line = line_number
+
+    def result(self) -> Dict[str, any]:
+        return _buildDurationResult(self.start_time, self.end_time, self.start_line, self.end_line)
+
+
 def calculateAcquisitionDuration(log_file_path: str) -> Dict[str, any]:
     """
     Calcule la durée d'acquisition entre "Starting acquisition..." et "Stopping".
@@ -104,58 +392,9 @@ def calculateAcquisitionDuration(log_file_path: str) -> Dict[str, any]:
     :return: Dictionnaire avec les informations de durée.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        start_acquisition_time = None
-        end_acquisition_time = None
-        start_line = None
-        end_line = None
-
-        for i in range(len(lines) - 1, -1, -1):
-            line = lines[i]
-            if "Starting acquisition" in line:
-                timestamp = extractTimestamp(line)
-                if timestamp:
-                    start_acquisition_time = timestamp
-                    start_line = i
-                    break
-
-        if start_acquisition_time:
-            for i in range(len(lines) - 1, start_line, -1):
-                line = lines[i]
-                if "Stopping" in line:
-                    timestamp = extractTimestamp(line)
-                    if timestamp:
-                        end_acquisition_time = timestamp
-                        end_line = i
-                        break
-
-        if start_acquisition_time and end_acquisition_time:
-            duration = end_acquisition_time - start_acquisition_time
-            duration_seconds = duration.total_seconds()
-            duration_minutes = duration_seconds / 60
-            return {
-                "start_time": start_acquisition_time,
-                "end_time": end_acquisition_time,
-                "duration_seconds": round(duration_seconds, 2),
-                "duration_minutes": round(duration_minutes, 2),
-                "duration_formatted": str(duration),
-                "start_line": start_line,
-                "end_line": end_line,
-                "success": True
-            }
-        return {
-            "start_time": start_acquisition_time,
-            "end_time": end_acquisition_time,
-            "duration_seconds": 0,
-            "duration_minutes": 0,
-            "duration_formatted": "N/A",
-            "start_line": start_line,
-            "end_line": end_line,
-            "success": False,
-            "error": "Unable to find both start and end timestamps"
-        }
+        location = locateLastAcquisition(log_file_path)
+        return _buildDurationResult(location["start_time"], location["end_time"],
+                                    location["start_line"], location["end_line"])
     except Exception as e:
         return {
             "start_time": None,
@@ -170,23 +409,25 @@ def calculateAcquisitionDuration(log_file_path: str) -> Dict[str, any]:
         }
 
 
-def countNumberOfDriftFix(log_file_path: str, last_acquisition_line_number: Optional[int] = None) -> int:
+def countNumberOfDriftFix(log_file_path: str, last_acquisition_line_number: Optional[int] = None,
+                          last_acquisition_offset: Optional[int] = None) -> int:
     """
     Compte le nombre de fois où le drift fix est appliqué dans le fichier de log.
 
     :param log_file_path: Chemin vers le fichier de log.
     :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
+    :param last_acquisition_offset: Position (en octets) de la dernière acquisition ; si fournie,
+                                    la lecture commence directement à cette position.
     :return: Nombre de drift fixes appliqués.
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
         drift_fix_count = 0
         start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
+        if last_acquisition_offset is not None:
+            start_line = 0
 
-        for line in lines[start_line:]:
-            if "DRIFT FIX:" in line:
+        for i, line in enumerate(iterLogLines(log_file_path, last_acquisition_offset or 0)):
+            if i >= start_line and DRIFT_FIX_MARKER in line:
                 drift_fix_count += 1
 
         return drift_fix_count
@@ -194,340 +435,313 @@ def countNumberOfDriftFix(log_file_path: str, last_acquisition_line_number: Opti
         raise ValueError(f"Erreur lors du comptage des drift fixes: {e}")
 
 
-def calculateAverageLoopsPrior(log_file_path: str, last_acquisition_line_number: Optional[int] = None) -> Dict[
-    str, any]:
+class PriorFocusTracker:
     """
-    Calcule le nombre moyen de loops pour un système prior.
-    Détecte automatiquement le nombre de cycles par puits.
-    Exclut les mesures des puits de référence utilisés pour l'alignement.
-    Inclut SEULEMENT les "Done after X loop(s)" dans la moyenne.
-    Les "Time out after X loop(s)" sont comptés comme "Mesures 'Timeout'".
-
-    :param log_file_path: Chemin vers le fichier de log.
-    :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
-    :return: Dictionnaire avec la moyenne des loops et les données des puits.
+    Automate de comptage des loops d'autofocus (système prior) pour une acquisition.
+    Les lignes sont fournies une à une via feed() (ou déjà classées via feed_event()),
+    à partir de la ligne qui suit le début de l'acquisition. Seules les mesures postérieures à la première ligne
+    "Reference wells ... re-aligned" sont prises en compte.
     """
-    try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        done_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Done after\s+(\d+)\s+loop\(s\)'
-        timeout_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Time out after\s+(\d+)\s+loop\(s\)'
-        reference_pattern = r'Reference wells\s+.*\s+re-aligned'
-
-        wells_data = {}
-        current_well = "Unknown"
-        all_loops_values = []
-        all_measurements_count = 0
-        timeout_count = 0
-        debug_log = []
-
-        # Variables pour gérer les phases d'alignement
-        alignment_phases = []
-        in_alignment_phase = False
-
-        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
-
-        # Première passe : identifier les phases d'alignement
-        auto_position_start_line = None
-        reference_aligned_line = None
-
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
-
-            if "Starting auto-position of wells:" in line:
-                auto_position_start_line = i
-                debug_log.append(f"[DEBUG] Début alignement détecté à la ligne {i + 1}")
-
-            if re.search(reference_pattern, line):
-                reference_aligned_line = i
-                debug_log.append(f"[DEBUG] Fin alignement détectée à la ligne {i + 1}")
-                break  # On prend seulement le premier après "Starting acquisition"
-
-        # Deuxième passe : analyser les mesures APRÈS la fin d'alignement
-        acquisition_started = False
-        if reference_aligned_line is not None:
-            acquisition_started = True
-            debug_log.append(f"[DEBUG] Comptage des mesures commence après la ligne {reference_aligned_line + 1}")
-
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
-
-            # Ignorer tout ce qui est avant la fin de l'alignement
-            if not acquisition_started or i <= reference_aligned_line:
-                continue
-
-            well_name = extractWellName(line)
-            if well_name:
-                current_well = well_name
-                if current_well not in wells_data:
-                    wells_data[current_well] = {
-                        "loops": [],
-                        "timeouts": [],
-                        "done_count": 0,
-                        "timeout_count": 0,
-                        "measurements": 0
-                    }
-                continue
-
-            done_match = re.search(done_pattern, line)
-            if done_match:
-                loop_count = int(done_match.group(1))
-                all_measurements_count += 1
-                all_loops_values.append(loop_count)
-                wells_data[current_well]["loops"].append(loop_count)
-                wells_data[current_well]["done_count"] += 1
-                wells_data[current_well]["measurements"] += 1
-                debug_log.append(
-                    f"Puits {current_well}: Done après {loop_count} loop(s), mesure {wells_data[current_well]['measurements']}")
-                continue
-
-            timeout_match = re.search(timeout_pattern, line)
-            if timeout_match:
-                loop_count = int(timeout_match.group(1))
-                all_measurements_count += 1
-                wells_data[current_well]["timeouts"].append(loop_count)
-                wells_data[current_well]["timeout_count"] += 1
-                wells_data[current_well]["measurements"] += 1
-                timeout_count += 1
-                debug_log.append(
-                    f"Puits {current_well}: Timeout après {loop_count} loop(s), mesure {wells_data[current_well]['measurements']}")
-                continue
 
+    def __init__(self):
+        self.reference_aligned = False
+        self.wells_data = {}
+        self.current_well = "Unknown"
+        self.all_loops_values = []
+        self.all_measurements_count = 0
+        self.timeout_count = 0
+
+    def feed(self, line: str) -> None:
+        self.feed_event(*classifyLogLine(line))
+
+    def feed_event(self, kind: Optional[str], value: Optional[str]) -> None:
+        # Ignorer tout ce qui est avant la fin de l'alignement
+        if not self.reference_aligned:
+            if kind == "reference_aligned":
+                self.reference_aligned = True
+            return
+
+        if kind == "well":
+            self.current_well = value
+            if self.current_well not in self.wells_data:
+                self.wells_data[self.current_well] = {
+                    "loops": [],
+                    "timeouts": [],
+                    "done_count": 0,
+                    "timeout_count": 0,
+                    "measurements": 0
+                }
+        elif kind == "done":
+            loop_count = int(value)
+            well = self.wells_data[self.current_well]
+            self.all_measurements_count += 1
+            self.all_loops_values.append(loop_count)
+            well["loops"].append(loop_count)
+            well["done_count"] += 1
+            well["measurements"] += 1
+        elif kind == "timeout":
+            loop_count = int(value)
+            well = self.wells_data[self.current_well]
+            self.all_measurements_count += 1
+            well["timeouts"].append(loop_count)
+            well["timeout_count"] += 1
+            well["measurements"] += 1
+            self.timeout_count += 1
+
+    def result(self) -> Dict[str, any]:
         # Filtrer les puits sans mesures valides
-        wells_data = {k: v for k, v in wells_data.items() if v["loops"] or v["timeouts"]}
+        wells_data = {k: v for k, v in self.wells_data.items() if v["loops"] or v["timeouts"]}
 
-        # Détection automatique du nombre de cycles
+        # Détection automatique du nombre de cycles : nombre de mesures le plus fréquent par puits
         cycles_detected = 0
         if wells_data:
-            # Prendre le nombre de mesures du premier puits complet (qui a des mesures)
-            first_well_measurements = max([v["measurements"] for v in wells_data.values()]) if wells_data else 0
-            cycles_detected = first_well_measurements
-
-            # Validation : vérifier que la plupart des puits ont le même nombre de mesures
             measurement_counts = [v["measurements"] for v in wells_data.values()]
-            most_common_count = max(set(measurement_counts), key=measurement_counts.count)
-            cycles_detected = most_common_count
-
-            debug_log.append(f"[DEBUG] Cycles détectés automatiquement : {cycles_detected}")
-            debug_log.append(f"[DEBUG] Distribution des mesures par puits : {sorted(set(measurement_counts))}")
+            cycles_detected = max(set(measurement_counts), key=measurement_counts.count)
+            logger.debug(f"Cycles détectés automatiquement : {cycles_detected}, "
+                         f"distribution des mesures par puits : {sorted(set(measurement_counts))}")
 
-        average_loops = 0 if not all_loops_values else sum(all_loops_values) / len(all_loops_values)
-
-        print("\n=== Journal de débogage ===")
-        for entry in debug_log:
-            print(entry)
-        print(f"[DEBUG] Nombre de cycles détectés : {cycles_detected}")
-        print(f"[DEBUG] Puits analysés : {len(wells_data)}")
-        print(
-            f"[DEBUG] Mesures totales théoriques : {len(wells_data)} puits × {cycles_detected} cycles = {len(wells_data) * cycles_detected}")
-        print(f"[DEBUG] Mesures totales réelles : {all_measurements_count}")
+        average_loops = 0 if not self.all_loops_values else sum(self.all_loops_values) / len(self.all_loops_values)
 
         return {
             "average_loops": round(average_loops, 2),
-            "total_measurements": all_measurements_count,
-            "done_measurements": len(all_loops_values),
-            "timeout_measurements": timeout_count,
+            "total_measurements": self.all_measurements_count,
+            "done_measurements": len(self.all_loops_values),
+            "timeout_measurements": self.timeout_count,
             "total_wells": len(wells_data),
             "cycles_detected": cycles_detected,
-            "loops_values": all_loops_values,
+            "loops_values": list(self.all_loops_values),
             "wells_data": wells_data
         }
-    except Exception as e:
-        raise ValueError(f"Erreur lors du calcul des loops moyens (prior): {e}")
 
 
-def calculateAverageMovesCustomFocus(log_file_path: str, last_acquisition_line_number: Optional[int] = None) -> Dict[
-    str, float]:
+class CustomFocusTracker:
     """
-    Calcule le nombre moyen de moves pour un système custom focus.
-    Inclut uniquement les moves menant à une réussite ou à un timeout.
-    Compte les "Still not" comme "Mesures 'Timeout'".
-    IGNORE les mesures faites pendant la phase d'auto-positionnement/alignement.
-
-    :param log_file_path: Chemin vers le fichier de log.
-    :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
-    :return: Dictionnaire avec la moyenne des moves et les données des puits.
+    Automate de comptage des moves d'autofocus (système custom focus) pour une acquisition.
+    Les lignes sont fournies une à une via feed() (ou déjà classées via feed_event()),
+    à partir de la ligne qui suit le début de l'acquisition. Les lignes d'une phase d'auto-positionnement refermée par
+    "Reference wells ... re-aligned" sont ignorées : l'état est capturé à l'ouverture de
+    la phase et restauré à sa fermeture. Une phase jamais refermée est conservée.
     """
-    try:
-        with open(log_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        move_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Adjusting.*move:\s+(\d+)'
-        max_retry_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Focus not reached after\s+(\d+)\s+moves\.\s+Trying alternate commands'
-        still_not_pattern = r'\[AUTOFOCUS\]\[FOCUS\]\s+Still not'
-        autofocus_done_pattern = r'\[AUTOFOCUS\]\[OFF\]\s+Done'
-
-        # Patterns pour détecter la phase d'alignement
-        auto_position_start_pattern = r'Starting auto-position of wells:'
-        reference_aligned_pattern = r'Reference wells\s+.*\s+re-aligned'
-
-        wells_data = {}
-        current_well = "Unknown"
-        current_well_moves = []
-        last_processed_well = None  # Pour éviter les doublons
-        all_moves_values = []
-        timeout_count = 0
-        debug_log = []
-
-        # Variables pour gérer la phase d'alignement
-        in_alignment_phase = False
-        alignment_start_line = None
-        alignment_end_line = None
-
-        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
-
-        # Première passe : identifier les phases d'alignement
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
-
-            if re.search(auto_position_start_pattern, line):
-                in_alignment_phase = True
-                alignment_start_line = i
-                debug_log.append(f"[DEBUG] Début de la phase d'alignement à la ligne {i + 1}")
-                continue
-
-            if re.search(reference_aligned_pattern, line):
-                if in_alignment_phase:
-                    in_alignment_phase = False
-                    alignment_end_line = i
-                    debug_log.append(f"[DEBUG] Fin de la phase d'alignement à la ligne {i + 1}")
-                continue
-
-        # Deuxième passe : analyser les moves en ignorant la phase d'alignement
-        in_alignment_phase = False
-        for i, line in enumerate(lines):
-            if i <= start_line:
-                continue
-
-            # Vérifier si on est dans une phase d'alignement
-            if alignment_start_line and alignment_end_line and alignment_start_line <= i <= alignment_end_line:
-                if not in_alignment_phase:
-                    in_alignment_phase = True
-                    debug_log.append(
-                        f"[DEBUG] Ignorage des mesures d'alignement de la ligne {alignment_start_line + 1} à {alignment_end_line + 1}")
-                continue
-            else:
-                in_alignment_phase = False
 
-            well_name = extractWellName(line)
-            if well_name and well_name != current_well:
+    _STATE_FIELDS = ("wells_data", "current_well", "current_well_moves", "last_processed_well",
+                     "all_moves_values", "timeout_count")
+
+    def __init__(self):
+        self.wells_data = {}
+        self.current_well = "Unknown"
+        self.current_well_moves = []
+        self.last_processed_well = None  # Pour éviter les doublons
+        self.all_moves_values = []
+        self.timeout_count = 0
+        self._alignment_snapshot = None
+        # Vrai si la dernière ligne reçue referme une phase d'alignement
+        self._ended_in_alignment = False
+
+    def _record(self, final_move: int, timeout: bool = False) -> None:
+        if self.current_well not in self.wells_data:
+            self.wells_data[self.current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
+        well = self.wells_data[self.current_well]
+        well["moves"].append(final_move)
+        if timeout:
+            well["timeouts"] += 1
+            self.timeout_count += 1
+        else:
+            well["done_count"] += 1
+        self.all_moves_values.append(final_move)
+
+    def feed(self, line: str) -> None:
+        self.feed_event(*classifyLogLine(line))
+
+    def feed_event(self, kind: Optional[str], value: Optional[str]) -> None:
+        if kind == "auto_position":
+            self._alignment_snapshot = copy.deepcopy({f: getattr(self, f) for f in self._STATE_FIELDS})
+            self._ended_in_alignment = False
+            return
+
+        if kind == "reference_aligned" and self._alignment_snapshot is not None:
+            for field, snapshot_value in self._alignment_snapshot.items():
+                setattr(self, field, snapshot_value)
+            self._alignment_snapshot = None
+            self._ended_in_alignment = True
+            return
+
+        self._ended_in_alignment = False
+
+        if kind == "well":
+            if value != self.current_well:
                 # Finaliser le puits précédent
-                if current_well_moves and current_well != "Unknown" and not in_alignment_phase:
-                    final_move = max(current_well_moves) if current_well_moves else 0
-                    if current_well not in wells_data:
-                        wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-                    wells_data[current_well]["moves"].append(final_move)
-                    wells_data[current_well]["done_count"] += 1
-                    all_moves_values.append(final_move)
-                    debug_log.append(
-                        f"Puits {current_well}: {len(current_well_moves)} tentatives, move final = {final_move} (Done)")
-
-                current_well = well_name
-                current_well_moves = []
-                continue
-
-            # Ignorer les mesures pendant l'alignement
-            if in_alignment_phase:
-                continue
-
-            if re.search(autofocus_done_pattern, line):
-                if current_well != "Unknown" and current_well != last_processed_well:
-                    # Si pas de moves détectés, c'est move = 0 (pas d'ajustement nécessaire)
-                    final_move = max(current_well_moves) if current_well_moves else 0
-                    if current_well not in wells_data:
-                        wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-                    wells_data[current_well]["moves"].append(final_move)
-                    wells_data[current_well]["done_count"] += 1
-                    all_moves_values.append(final_move)
-
-                    move_info = f"{len(current_well_moves)} tentatives" if current_well_moves else "0 moves (pas d'ajustement)"
-                    debug_log.append(f"Puits {current_well}: {move_info}, move final = {final_move} (fin autofocus)")
-
-                    last_processed_well = current_well
-                elif current_well == last_processed_well:
-                    debug_log.append(f"[DEBUG] Mesure ignorée pour {current_well} (déjà traitée)")
-
-                current_well_moves = []
-                continue
-
-            if re.search(still_not_pattern, line):
-                if current_well_moves and current_well != "Unknown":
-                    final_move = max(current_well_moves) if current_well_moves else 0
-                    if current_well not in wells_data:
-                        wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-                    wells_data[current_well]["moves"].append(final_move)
-                    wells_data[current_well]["timeouts"] += 1
-                    all_moves_values.append(final_move)
-                    timeout_count += 1
-                    debug_log.append(
-                        f"Puits {current_well}: {len(current_well_moves)} tentatives, move final = {final_move} (Timeout)")
-                current_well_moves = []
-                continue
-
-            max_retry_match = re.search(max_retry_pattern, line)
-            if max_retry_match:
-                current_well_moves = []
-                debug_log.append(f"Puits {current_well}: max retry détecté, moves réinitialisés")
-                continue
-
-            move_match = re.search(move_pattern, line)
-            if move_match:
-                move_count = int(move_match.group(1))
-                current_well_moves.append(move_count)
-                debug_log.append(f"Puits {current_well}: move détecté, {move_count} moves")
-
-        # Finaliser le dernier puits
-        if current_well_moves and current_well != "Unknown" and not in_alignment_phase:
-            final_move = max(current_well_moves) if current_well_moves else 0
-            if current_well not in wells_data:
-                wells_data[current_well] = {"moves": [], "timeouts": 0, "done_count": 0}
-            wells_data[current_well]["moves"].append(final_move)
-            wells_data[current_well]["done_count"] += 1
+                if self.current_well_moves and self.current_well != "Unknown":
+                    self._record(max(self.current_well_moves))
+                self.current_well = value
+                self.current_well_moves = []
+        elif kind == "autofocus_done":
+            if self.current_well != "Unknown" and self.current_well != self.last_processed_well:
+                # Si pas de moves détectés, c'est move = 0 (pas d'ajustement nécessaire)
+                self._record(max(self.current_well_moves) if self.current_well_moves else 0)
+                self.last_processed_well = self.current_well
+            self.current_well_moves = []
+        elif kind == "still_not":
+            if self.current_well_moves and self.current_well != "Unknown":
+                self._record(max(self.current_well_moves), timeout=True)
+            self.current_well_moves = []
+        elif kind == "max_retry":
+            self.current_well_moves = []
+        elif kind == "move":
+            self.current_well_moves.append(int(value))
+
+    def result(self) -> Dict[str, any]:
+        wells_data = copy.deepcopy(self.wells_data)
+        all_moves_values = list(self.all_moves_values)
+
+        # Finaliser le dernier puits sans modifier l'état de l'automate
+        if self.current_well_moves and self.current_well != "Unknown" and not self._ended_in_alignment:
+            final_move = max(self.current_well_moves)
+            well = wells_data.setdefault(self.current_well, {"moves": [], "timeouts": 0, "done_count": 0})
+            well["moves"].append(final_move)
+            well["done_count"] += 1
             all_moves_values.append(final_move)
-            debug_log.append(
-                f"Puits {current_well}: {len(current_well_moves)} tentatives, move final = {final_move} (dernier puits)")
 
         wells_data = {k: v for k, v in wells_data.items() if v["moves"]}
         average_moves = 0 if not all_moves_values else sum(all_moves_values) / len(all_moves_values)
 
-        print("\n=== Journal de débogage ===")
-        for entry in debug_log:
-            print(entry)
-
         return {
             "average_moves": round(average_moves, 2),
             "total_measurements": len(all_moves_values),
-            "done_measurements": len(all_moves_values) - timeout_count,
-            "timeout_measurements": timeout_count,
+            "done_measurements": len(all_moves_values) - self.timeout_count,
+            "timeout_measurements": self.timeout_count,
             "total_wells": len(wells_data),
             "moves_values": all_moves_values,
             "wells_data": wells_data
         }
+
+
+def calculateAverageLoopsPrior(log_file_path: str, last_acquisition_line_number: Optional[int] = None,
+                               last_acquisition_offset: Optional[int] = None) -> Dict[
+    str, any]:
+    """
+    Calcule le nombre moyen de loops pour un système prior.
+    Détecte automatiquement le nombre de cycles par puits.
+    Exclut les mesures des puits de référence utilisés pour l'alignement.
+    Inclut SEULEMENT les "Done after X loop(s)" dans la moyenne.
+    Les "Time out after X loop(s)" sont comptés comme "Mesures 'Timeout'".
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
+    :param last_acquisition_offset: Position (en octets) de la dernière acquisition ; si fournie,
+                                    la lecture commence directement à cette position.
+    :return: Dictionnaire avec la moyenne des loops et les données des puits.
+    """
+    try:
+        tracker = PriorFocusTracker()
+        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
+        if last_acquisition_offset is not None:
+            start_line = 0
+
+        for i, line in enumerate(iterLogLines(log_file_path, last_acquisition_offset or 0)):
+            if i > start_line:
+                tracker.feed(line)
+
+        return tracker.result()
     except Exception as e:
-        raise ValueError(f"Erreur lors du calcul des moves moyens (custom focus): {e}")
+        raise ValueError(f"Erreur lors du calcul des loops moyens (prior): {e}")
+
 
-def analyzeLogFile(log_file_path: str) -> Dict[str, any]:
+def calculateAverageMovesCustomFocus(log_file_path: str, last_acquisition_line_number: Optional[int] = None,
+                                     last_acquisition_offset: Optional[int] = None) -> Dict[
+    str, float]:
     """
-    Analyse complète d'un fichier de log.
+    Calcule le nombre moyen de moves pour un système custom focus.
+    Inclut uniquement les moves menant à une réussite ou à un timeout.
+    Compte les "Still not" comme "Mesures 'Timeout'".
+    IGNORE les mesures faites pendant la phase d'auto-positionnement/alignement.
 
     :param log_file_path: Chemin vers le fichier de log.
-    :return: Dictionnaire avec toutes les informations d'analyse.
+    :param last_acquisition_line_number: Numéro de ligne de la dernière acquisition.
+    :param last_acquisition_offset: Position (en octets) de la dernière acquisition ; si fournie,
+                                    la lecture commence directement à cette position.
+    :return: Dictionnaire avec la moyenne des moves et les données des puits.
     """
     try:
-        acquisition_type = identifyAcquisitionType(log_file_path)
-        last_acquisition, last_acquisition_line_number = findLastAcquisition(log_file_path)
-        acquisition_duration = calculateAcquisitionDuration(log_file_path)
-        drift_fix_count = countNumberOfDriftFix(log_file_path, last_acquisition_line_number)
+        tracker = CustomFocusTracker()
+        start_line = 0 if last_acquisition_line_number is None else last_acquisition_line_number
+        if last_acquisition_offset is not None:
+            start_line = 0
+
+        for i, line in enumerate(iterLogLines(log_file_path, last_acquisition_offset or 0)):
+            if i > start_line:
+                tracker.feed(line)
+
+        return tracker.result()
+    except Exception as e:
+        raise ValueError(f"Erreur lors du calcul des moves moyens (custom focus): {e}")
+
+
+class LogStreamAnalyzer:
+    """
+    Analyse d'un fichier de log en une seule passe.
+
+    Chaque ligne est fournie via feed() ; l'analyseur maintient le type d'acquisition,
+    la durée et, pour l'acquisition en cours (réinitialisés à chaque "Starting ... acquisition"),
+    le nombre de drift fixes et les automates prior / custom focus. La mémoire utilisée
+    ne dépend que de la dernière acquisition, pas de la taille du fichier.
+
+    :param first_line_number: Numéro de la première ligne fournie, lorsque la lecture
+                              commence en cours de fichier.
+    """
+
+    def __init__(self, first_line_number: int = 0):
+        self.line_number = first_line_number - 1
+        self.has_loop = False
+        self.last_acquisition = None
+        self.last_acquisition_line_number = None
+        self.duration_tracker = AcquisitionDurationTracker()
+        self._reset_acquisition()
+
+    def _reset_acquisition(self) -> None:
+        self.drift_fix_count = 0
+        self.prior_tracker = PriorFocusTracker()
+        self.custom_tracker = CustomFocusTracker()
+
+    def feed(self, line: str) -> None:
+        self.line_number += 1
+
+        if not self.has_loop and "loop" in line.lower():
+            self.has_loop = True
+
+        self.duration_tracker.feed(line, self.line_number)
+
+        if isAcquisitionStart(line):
+            self.last_acquisition = line.strip()
+            self.last_acquisition_line_number = self.line_number
+            self._reset_acquisition()
+
+        # La ligne de début d'acquisition compte pour les drift fixes mais pas pour les mesures
+        if DRIFT_FIX_MARKER in line:
+            self.drift_fix_count += 1
+
+        if self.last_acquisition_line_number == self.line_number:
+            return
+
+        # Sans acquisition identifiée, l'analyse des mesures commence après la première ligne
+        if self.line_number == 0:
+            return
+
+        # La ligne n'est classée qu'une fois pour les deux automates
+        kind, value = classifyLogLine(line)
+        self.prior_tracker.feed_event(kind, value)
+        # Dès qu'un "loop" est vu, le log est de type prior : inutile de suivre les moves
+        if not self.has_loop:
+            self.custom_tracker.feed_event(kind, value)
+
+    def result(self) -> Dict[str, any]:
+        acquisition_type = "prior" if self.has_loop else "custom_focus"
+        acquisition_duration = self.duration_tracker.result()
 
         if acquisition_type == "prior":
-            stats = calculateAverageLoopsPrior(log_file_path, last_acquisition_line_number)
+            stats = self.prior_tracker.result()
             analysis_results = {
                 "acquisition_type": acquisition_type,
-                "last_acquisition": last_acquisition,
+                "last_acquisition": self.last_acquisition,
                 "average_value": stats["average_loops"],
                 "total_measurements": stats["total_measurements"],
                 "done_measurements": stats["done_measurements"],
@@ -539,10 +753,10 @@ def analyzeLogFile(log_file_path: str) -> Dict[str, any]:
                 "acquisition_duration": acquisition_duration
             }
         else:  # custom_focus
-            stats = calculateAverageMovesCustomFocus(log_file_path, last_acquisition_line_number)
+            stats = self.custom_tracker.result()
             analysis_results = {
                 "acquisition_type": acquisition_type,
-                "last_acquisition": last_acquisition,
+                "last_acquisition": self.last_acquisition,
                 "average_value": stats["average_moves"],
                 "total_measurements": stats["total_measurements"],
                 "done_measurements": stats["done_measurements"],
@@ -553,12 +767,415 @@ def analyzeLogFile(log_file_path: str) -> Dict[str, any]:
                 "acquisition_duration": acquisition_duration
             }
 
-        analysis_results["drift_fix_count"] = drift_fix_count
+        analysis_results["drift_fix_count"] = self.drift_fix_count
         return analysis_results
+
+
+LOG_INDEX_SUFFIX = ".index.json"
+LOG_INDEX_VERSION = 1
+# Taille des zones (début et fin de la partie indexée) utilisées pour l'empreinte du contenu
+LOG_INDEX_HASH_WINDOW = 64 * 1024
+
+
+def getLogIndexPath(log_file_path: str) -> str:
+    """
+    Retourne le chemin du fichier d'index associé à un fichier de log.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :return: Chemin vers le fichier d'index (à côté du log).
+    """
+    return log_file_path + LOG_INDEX_SUFFIX
+
+
+def _computeIndexedContentHash(handle, indexed_size: int) -> str:
+    """
+    Calcule l'empreinte de la partie déjà indexée : début et fin de la zone indexée.
+    Permet de détecter un log remplacé ou réécrit sans relire tout le fichier.
+    """
+    digest = hashlib.sha256()
+    handle.seek(0)
+    digest.update(handle.read(min(LOG_INDEX_HASH_WINDOW, indexed_size)))
+    tail_start = max(0, indexed_size - LOG_INDEX_HASH_WINDOW)
+    handle.seek(tail_start)
+    digest.update(handle.read(indexed_size - tail_start))
+    return digest.hexdigest()
+
+
+def _emptyLogIndex(log_file_path: str) -> Dict[str, any]:
+    return {
+        "version": LOG_INDEX_VERSION,
+        "log_file": os.path.basename(log_file_path),
+        "indexed_size": 0,
+        "line_count": 0,
+        "content_hash": None,
+        "acquisitions": []
+    }
+
+
+def loadLogIndex(log_file_path: str, index_path: Optional[str] = None) -> Optional[Dict[str, any]]:
+    """
+    Charge l'index d'un fichier de log s'il existe et correspond toujours au contenu du log.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param index_path: Chemin du fichier d'index (par défaut à côté du log).
+    :return: Index chargé, ou None s'il est absent, illisible ou obsolète.
+    """
+    index_path = index_path or getLogIndexPath(log_file_path)
+    if not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except Exception as e:
+        logger.warning(f"Index de log illisible, il sera reconstruit: {index_path} ({e})")
+        return None
+
+    if index.get("version") != LOG_INDEX_VERSION:
+        return None
+
+    indexed_size = index.get("indexed_size", 0)
+    if os.path.getsize(log_file_path) < indexed_size:
+        logger.info(f"Fichier de log plus court que son index, reconstruction: {log_file_path}")
+        return None
+
+    with open(log_file_path, 'rb') as handle:
+        if _computeIndexedContentHash(handle, indexed_size) != index.get("content_hash"):
+            logger.info(f"Contenu du log modifié depuis l'indexation, reconstruction: {log_file_path}")
+            return None
+
+    return index
+
+
+def saveLogIndex(index: Dict[str, any], index_path: str) -> bool:
+    """
+    Enregistre l'index de log de manière atomique.
+
+    :param index: Index à enregistrer.
+    :param index_path: Chemin du fichier d'index.
+    :return: True si l'enregistrement a réussi.
+    """
+    temp_path = index_path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(temp_path, index_path)
+        return True
+    except Exception as e:
+        logger.warning(f"Impossible d'enregistrer l'index de log {index_path}: {e}")
+        return False
+
+
+def updateLogIndex(log_file_path: str, index_path: Optional[str] = None, save: bool = True) -> Dict[str, any]:
+    """
+    Met à jour l'index d'un fichier de log en ne lisant que les octets ajoutés depuis la
+    dernière indexation. L'index contient, pour chaque acquisition, sa position (octets et
+    ligne), ses horodatages de début et de fin ainsi que la position de chaque puits visité.
+
+    Seules les lignes complètes sont indexées : une ligne en cours d'écriture le sera
+    lors de la prochaine mise à jour.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param index_path: Chemin du fichier d'index (par défaut à côté du log).
+    :param save: Si True, l'index mis à jour est enregistré sur disque.
+    :return: Index à jour.
+    """
+    try:
+        index_path = index_path or getLogIndexPath(log_file_path)
+        index = loadLogIndex(log_file_path, index_path) or _emptyLogIndex(log_file_path)
+
+        offset = index["indexed_size"]
+        line_number = index["line_count"]
+        acquisitions = index["acquisitions"]
+        current = acquisitions[-1] if acquisitions else None
+
+        with open(log_file_path, 'rb') as handle:
+            handle.seek(offset)
+            for raw_line in handle:
+                if not raw_line.endswith(b'\n'):
+                    break
+
+                if b'Starting' in raw_line and b'acquisition' in raw_line:
+                    line = raw_line.decode('utf-8')
+                    start_time = extractTimestamp(line) if "Starting acquisition" in line else None
+                    current = {
+                        "offset": offset,
+                        "line_number": line_number,
+                        "line": line.strip(),
+                        "start_time": start_time.isoformat() if start_time else None,
+                        "end_offset": None,
+                        "end_line": None,
+                        "end_time": None,
+                        "wells": []
+                    }
+                    acquisitions.append(current)
+                elif current is not None and b'Stopping' in raw_line:
+                    end_time = extractTimestamp(raw_line.decode('utf-8'))
+                    if end_time:
+                        current["end_offset"] = offset
+                        current["end_line"] = line_number
+                        current["end_time"] = end_time.isoformat()
+                elif current is not None and b'Going to well' in raw_line:
+                    match = WELL_NAME_RE.search(raw_line.decode('utf-8'))
+                    if match:
+                        current["wells"].append([match.group(1), offset, line_number])
+
+                offset += len(raw_line)
+                line_number += 1
+
+            if offset != index["indexed_size"]:
+                index["indexed_size"] = offset
+                index["line_count"] = line_number
+                index["content_hash"] = _computeIndexedContentHash(handle, offset)
+                if save:
+                    saveLogIndex(index, index_path)
+
+        return index
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'indexation du fichier de log: {e}")
+
+
+def locateLastAcquisitionFromIndex(index: Dict[str, any]) -> Dict[str, any]:
+    """
+    Construit, à partir d'un index de log, la même localisation que locateLastAcquisition.
+
+    :param index: Index retourné par updateLogIndex.
+    :return: Dictionnaire de localisation de la dernière acquisition.
+    """
+    location = {
+        "last_acquisition": None,
+        "last_acquisition_offset": None,
+        "last_acquisition_line_number": None,
+        "start_time": None,
+        "start_offset": None,
+        "start_line": None,
+        "end_time": None,
+        "end_offset": None,
+        "end_line": None,
+        "read_offset": 0,
+        "read_line_number": 0
+    }
+    acquisitions = index["acquisitions"]
+    if not acquisitions:
+        return location
+
+    last = acquisitions[-1]
+    location["last_acquisition"] = last["line"]
+    location["last_acquisition_offset"] = last["offset"]
+    location["last_acquisition_line_number"] = last["line_number"]
+    location["read_offset"] = last["offset"]
+    location["read_line_number"] = last["line_number"]
+
+    # Début horodaté le plus récent, puis dernier "Stopping" horodaté qui le suit
+    for position in range(len(acquisitions) - 1, -1, -1):
+        entry = acquisitions[position]
+        if entry["start_time"]:
+            location["start_time"] = datetime.fromisoformat(entry["start_time"])
+            location["start_offset"] = entry["offset"]
+            location["start_line"] = entry["line_number"]
+            location["read_offset"] = entry["offset"]
+            location["read_line_number"] = entry["line_number"]
+            for following in reversed(acquisitions[position:]):
+                if following["end_time"]:
+                    location["end_time"] = datetime.fromisoformat(following["end_time"])
+                    location["end_offset"] = following["end_offset"]
+                    location["end_line"] = following["end_line"]
+                    break
+            break
+
+    return location
+
+
+def analyzeLogFile(log_file_path: str, use_index: bool = False) -> Dict[str, any]:
+    """
+    Analyse complète de la dernière acquisition d'un fichier de log.
+    La dernière acquisition est localisée à rebours depuis la fin du fichier (ou via l'index
+    du log), puis seule cette partie du log est lue, en une seule passe. Le type
+    d'acquisition est donc déterminé sur la dernière acquisition.
+
+    :param log_file_path: Chemin vers le fichier de log.
+    :param use_index: Si True, la dernière acquisition est localisée grâce à l'index du log,
+                      mis à jour avec les seules lignes ajoutées depuis l'analyse précédente.
+    :return: Dictionnaire avec toutes les informations d'analyse.
+    """
+    try:
+        if use_index:
+            location = locateLastAcquisitionFromIndex(updateLogIndex(log_file_path))
+        else:
+            location = locateLastAcquisition(log_file_path)
+        analyzer = LogStreamAnalyzer(first_line_number=location["read_line_number"])
+        for line in iterLogLines(log_file_path, location["read_offset"]):
+            analyzer.feed(line)
+        return analyzer.result()
     except Exception as e:
         raise ValueError(f"Erreur lors de l'analyse du fichier de log: {e}")
 
 
+class LogFollower:
+    """
+    Suivi en direct (mode "tail") d'un fichier de log pendant une acquisition.
+
+    Les lignes ajoutées au log sont lues au fur et à mesure et fournies à un
+    LogStreamAnalyzer. Chaque lecture produit des événements (dictionnaires avec une clé
+    "event") transmis au callback on_event :
+        - "acquisition_started" : nouvelle ligne "Starting ... acquisition"
+        - "drift_fix" : drift fix appliqué, avec le nombre cumulé pour l'acquisition
+        - "acquisition_stopped" : ligne "Stopping" horodatée
+        - "metrics" : état courant de l'analyse (mêmes clés que analyzeLogFile)
+        - "log_reset" : log tronqué ou remplacé, l'analyse repart du début du fichier
+
+    Le callback est appelé depuis le thread de suivi : une interface graphique doit
+    relayer les événements vers son propre thread (signal Qt par exemple).
+    """
+
+    def __init__(self, log_file_path: str, on_event: Optional[Callable[[Dict[str, any]], None]] = None,
+                 poll_interval: float = 1.0, from_last_acquisition: bool = True):
+        """
+        :param log_file_path: Chemin vers le fichier de log à suivre.
+        :param on_event: Fonction appelée pour chaque événement émis.
+        :param poll_interval: Intervalle (en secondes) entre deux lectures du log.
+        :param from_last_acquisition: Si True, le suivi commence à la dernière acquisition
+                                      déjà présente dans le log ; sinon à la fin du fichier.
+        """
+        self.log_file_path = log_file_path
+        self.on_event = on_event
+        self.poll_interval = poll_interval
+        self.from_last_acquisition = from_last_acquisition
+
+        self.analyzer = None
+        self.position = 0
+        self._pending = b''
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _start_at(self, offset: int, line_number: int) -> None:
+        self.analyzer = LogStreamAnalyzer(first_line_number=line_number)
+        self.position = offset
+        self._pending = b''
+
+    def _initialize(self) -> None:
+        if self.from_last_acquisition:
+            location = locateLastAcquisition(self.log_file_path)
+            self._start_at(location["read_offset"], location["read_line_number"])
+        else:
+            with open(self.log_file_path, 'rb') as handle:
+                # Repartir du début de la dernière ligne, éventuellement en cours d'écriture
+                offset, _ = next(iterLinesReversed(handle))
+                self._start_at(offset, countLinesBetween(handle, 0, offset))
+
+    def poll(self) -> List[Dict[str, any]]:
+        """
+        Lit les lignes complètes ajoutées depuis la lecture précédente.
+
+        :return: Liste des événements émis par cette lecture.
+        """
+        events = []
+        if self.analyzer is None:
+            self._initialize()
+
+        size = os.path.getsize(self.log_file_path)
+        if size < self.position:
+            logger.info(f"Fichier de log tronqué, reprise du suivi au début: {self.log_file_path}")
+            self._start_at(0, 0)
+            events.append({"event": "log_reset"})
+
+        if size > self.position:
+            with open(self.log_file_path, 'rb') as handle:
+                handle.seek(self.position)
+                data = handle.read(size - self.position)
+            self.position += len(data)
+
+            data = self._pending + data
+            complete_end = data.rfind(b'\n') + 1
+            self._pending = data[complete_end:]
+
+            if complete_end:
+                for line in io.StringIO(data[:complete_end].decode('utf-8', errors='replace'), newline=None):
+                    events.extend(self._feed(line))
+                events.append({"event": "metrics", "analysis": self.analyzer.result()})
+
+        if self.on_event:
+            for event in events:
+                self.on_event(event)
+        return events
+
+    def _feed(self, line: str) -> List[Dict[str, any]]:
+        analyzer = self.analyzer
+        events = []
+        analyzer.feed(line)
+
+        if analyzer.last_acquisition_line_number == analyzer.line_number:
+            events.append({"event": "acquisition_started", "line": analyzer.last_acquisition,
+                           "line_number": analyzer.line_number})
+        if DRIFT_FIX_MARKER in line:
+            events.append({"event": "drift_fix", "drift_fix_count": analyzer.drift_fix_count,
+                           "line_number": analyzer.line_number})
+        if analyzer.duration_tracker.end_line == analyzer.line_number:
+            events.append({"event": "acquisition_stopped", "end_time": analyzer.duration_tracker.end_time,
+                           "line_number": analyzer.line_number})
+        return events
+
+    def follow(self, stop_on_acquisition_end: bool = False) -> Dict[str, any]:
+        """
+        Suit le log jusqu'à l'appel de stop() (ou jusqu'à la fin de l'acquisition).
+
+        :param stop_on_acquisition_end: Si True, le suivi s'arrête au premier "Stopping" horodaté.
+        :return: Dernier état de l'analyse.
+        """
+        # Une dernière lecture est toujours faite après la demande d'arrêt
+        while True:
+            stop_requested = self._stop_event.is_set()
+            events = self.poll()
+            if stop_requested:
+                break
+            if stop_on_acquisition_end and any(e["event"] == "acquisition_stopped" for e in events):
+                break
+            self._stop_event.wait(self.poll_interval)
+        return self.analyzer.result() if self.analyzer else {}
+
+    def start(self, stop_on_acquisition_end: bool = False) -> None:
+        """
+        Lance le suivi du log dans un thread dédié.
+        """
+        self._stop_event.clear()
+
+        def follow_task():
+            try:
+                self.follow(stop_on_acquisition_end)
+            except Exception as e:
+                logger.error(f"Erreur lors du suivi du fichier de log: {e}", exc_info=True)
+                if self.on_event:
+                    self.on_event({"event": "error", "error": str(e)})
+
+        self._thread = threading.Thread(target=follow_task, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Arrête le suivi du log.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def _buildReportRow(analysis: Dict[str, any]) -> Dict[str, any]:
+    """
+    Construit une ligne de rapport (colonnes du rapport d'analyse) à partir d'une analyse de log.
+    """
+    return {
+        "Type d'acquisition": analysis["acquisition_type"],
+        "Durée d'acquisition (minutes)": analysis["acquisition_duration"]["duration_minutes"],
+        "Nombre moyen de loops/moves": analysis["average_value"],
+        "Nombre total de mesures": analysis["total_measurements"],
+        "Nombre total de puits": analysis["total_wells"],
+        "Mesures 'Done'": analysis["done_measurements"],
+        "Mesures 'Timeout'": analysis["timeout_measurements"],
+        "Nombre de Drift Fix": analysis["drift_fix_count"],
+    }
+
+
 def generateLogAnalysisReport(folder_path: str) -> pd.DataFrame:
     """
     Génère un rapport d'analyse pour un dossier contenant un fichier de log.
@@ -570,18 +1187,7 @@ def generateLogAnalysisReport(folder_path: str) -> pd.DataFrame:
         log_file_path = getLogFile(folder_path)
         analysis = analyzeLogFile(log_file_path)
 
-        report_data = {
-            "Type d'acquisition": [analysis["acquisition_type"]],
-            "Durée d'acquisition (minutes)": [analysis["acquisition_duration"]["duration_minutes"]],
-            "Nombre moyen de loops/moves": [analysis["average_value"]],
-            "Nombre total de mesures": [analysis["total_measurements"]],
-            "Nombre total de puits": [analysis["total_wells"]],
-            "Mesures 'Done'": [analysis["done_measurements"]],
-            "Mesures 'Timeout'": [analysis["timeout_measurements"]],
-            "Nombre de Drift Fix": [analysis["drift_fix_count"]],
-        }
-
-        return pd.DataFrame(report_data)
+        return pd.DataFrame([_buildReportRow(analysis)])
     except Exception as e:
         raise ValueError(f"Erreur lors de la génération du rapport d'analyse: {e}")
 
@@ -610,20 +1216,133 @@ def generateSummaryReport(folder_path: str) -> Dict[str, any]:
         raise ValueError(f"Erreur lors de la génération du résumé: {e}")
 
 
-if __name__ == "__main__":
+def findLogFiles(paths: List[str], recursive: bool = True) -> List[str]:
+    """
+    Recherche les fichiers de log à analyser à partir d'une liste de fichiers et/ou de dossiers.
+
+    :param paths: Fichiers .log ou dossiers à parcourir.
+    :param recursive: Si True, les sous-dossiers sont aussi parcourus.
+    :return: Liste triée et sans doublons des chemins de fichiers de log.
+    """
+    log_files = []
+    for path in paths:
+        if os.path.isfile(path):
+            log_files.append(path)
+        elif os.path.isdir(path):
+            if recursive:
+                for root, _, file_names in os.walk(path):
+                    log_files.extend(os.path.join(root, name) for name in file_names if name.endswith('.log'))
+            else:
+                log_files.extend(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.log'))
+        else:
+            raise FileNotFoundError(f"Le chemin {path} n'existe pas.")
+    return sorted(set(log_files))
+
+
+def _analyzeLogFileForBatch(log_file_path: str) -> Dict[str, any]:
+    """
+    Analyse un fichier de log pour le traitement par lot : ne lève jamais d'exception,
+    l'erreur éventuelle et le temps d'analyse sont retournés dans la ligne de rapport.
+    """
+    start = time.perf_counter()
+    row = {"Fichier": log_file_path, "Succès": True, "Erreur": None}
     try:
-        folder_path = "C:/Users/PCP-Zymoptiq/Desktop/routine deploiement/log/nouveau_focus"
-        print("=== Résumé de l'analyse ===")
-        summary = generateSummaryReport(folder_path)
-        for key, value in summary.items():
-            print(f"{key}: {value}")
-
-        print("\n=== Analyse du fichier de log ===")
-        report = generateLogAnalysisReport(folder_path)
-        print("Rapport d'analyse:")
-        print(report.to_string(index=False))
-
-        report.to_csv("analyse_log.csv", index=False)
-        print(f"\nRapport sauvegardé: analyse_log.csv")
+        row.update(_buildReportRow(analyzeLogFile(log_file_path)))
     except Exception as e:
-        print(f"Erreur: {e}")
\ No newline at end of file
+        row["Succès"] = False
+        row["Erreur"] = str(e)
+    row["Temps d'analyse (s)"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def analyzeLogFilesBatch(log_file_paths: List[str], max_workers: Optional[int] = None,
+                         progress_callback: Optional[Callable[[int, int, Dict[str, any]], None]] = None
+                         ) -> pd.DataFrame:
+    """
+    Analyse un lot de fichiers de log en parallèle (un processus par cœur par défaut).
+    Un log illisible ou invalide n'interrompt pas le traitement : il apparaît dans le
+    rapport avec "Succès" à False et le message d'erreur.
+
+    :param log_file_paths: Chemins des fichiers de log à analyser.
+    :param max_workers: Nombre de processus (1 pour une analyse séquentielle dans le processus courant).
+    :param progress_callback: Fonction appelée après chaque fichier avec (nombre traité, total, ligne).
+    :return: DataFrame avec une ligne par fichier, dans l'ordre des chemins fournis.
+    """
+    total = len(log_file_paths)
+    rows = [None] * total
+
+    if max_workers == 1:
+        for position, log_file_path in enumerate(log_file_paths):
+            rows[position] = _analyzeLogFileForBatch(log_file_path)
+            if progress_callback:
+                progress_callback(position + 1, total, rows[position])
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_analyzeLogFileForBatch, path): position
+                       for position, path in enumerate(log_file_paths)}
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                position = futures[future]
+                try:
+                    rows[position] = future.result()
+                except Exception as e:
+                    # Processus de travail interrompu (mémoire, arrêt brutal...)
+                    rows[position] = {"Fichier": log_file_paths[position], "Succès": False, "Erreur": str(e),
+                                      "Temps d'analyse (s)": None}
+                if progress_callback:
+                    progress_callback(done_count, total, rows[position])
+
+    failures = sum(1 for row in rows if not row["Succès"])
+    logger.info(f"Analyse par lot terminée: {total - failures}/{total} fichier(s) analysé(s), {failures} échec(s)")
+    return pd.DataFrame(rows, columns=BATCH_REPORT_COLUMNS)
+
+
+def main():
+    """Point d'entrée en ligne de commande pour l'analyse par lot de fichiers de log"""
+    parser = argparse.ArgumentParser(
+        description="Analyse des fichiers de log d'acquisition ZymoCubeCtrl (un ou plusieurs dossiers / fichiers)")
+    parser.add_argument("paths", nargs="+", help="Fichiers .log ou dossiers contenant des fichiers .log")
+    parser.add_argument("-o", "--output", default="analyse_logs.csv", help="Fichier CSV du rapport consolidé")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Nombre de processus (par défaut: nombre de cœurs)")
+    parser.add_argument("--no-recursive", action="store_true", help="Ne pas parcourir les sous-dossiers")
+    args = parser.parse_args()
+
+    log_files = findLogFiles(args.paths, recursive=not args.no_recursive)
+    if not log_files:
+        print("Aucun fichier de log trouvé.")
+        sys.exit(1)
+
+    def print_progress(done, total, row):
+        status = "OK" if row["Succès"] else f"ÉCHEC ({row['Erreur']})"
+        elapsed = row["Temps d'analyse (s)"]
+        print(f"[{done}/{total}] {row['Fichier']}: {status} en {elapsed} s")
+
+    report = analyzeLogFilesBatch(log_files, max_workers=args.workers, progress_callback=print_progress)
+    report.to_csv(args.output, index=False)
+
+    failures = int((~report["Succès"]).sum())
+    print(f"\n{len(report) - failures}/{len(report)} fichier(s) analysé(s), {failures} échec(s)")
+    print(f"Rapport sauvegardé: {args.output}")
+
+
+if __name__ == "__main__":
+    # Si exécuté avec des arguments, analyse par lot en ligne de commande
+    if len(sys.argv) > 1:
+        main()
+    else:
+        try:
+            folder_path = "C:/Users/PCP-Zymoptiq/Desktop/routine deploiement/log/nouveau_focus"
+            print("=== Résumé de l'analyse ===")
+            summary = generateSummaryReport(folder_path)
+            for key, value in summary.items():
+                print(f"{key}: {value}")
+
+            print("\n=== Analyse du fichier de log ===")
+            report = generateLogAnalysisReport(folder_path)
+            print("Rapport d'analyse:")
+            print(report.to_string(index=False))
+
+            report.to_csv("analyse_log.csv", index=False)
+            print(f"\nRapport sauvegardé: analyse_log.csv")
+        except Exception as e:
+            print(f"Erreur: {e}")
\ No newline at end of file